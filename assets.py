@@ -1,9 +1,21 @@
 import os
+from collections import OrderedDict
+
 import pygame
 
 ASSET_DIR = os.path.join(os.path.dirname(__file__), 'assets')
 
+SCALED_CACHE_BUDGET_BYTES = 32 * 1024 * 1024
+ROTATION_STEPS = 64
+TEXT_CACHE_SIZE = 512
+
 _raw = {}
+_scaled = OrderedDict()
+_rotated = {}
+_fonts = {}
+_text = OrderedDict()
+_text_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+_scaled_stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'bytes': 0, 'budget': SCALED_CACHE_BUDGET_BYTES}
 
 _FALLBACK_NAMES = {
     'tower_physical': 'physical_tower',
@@ -60,6 +72,7 @@ def _load_raw(name):
         return _raw[name]
 
     candidates = _try_candidates(name)
+    failed = False
     for cand in candidates:
         for ext in _EXTS:
             path = os.path.join(ASSET_DIR, f"{cand}{ext}")
@@ -69,12 +82,42 @@ def _load_raw(name):
                     _raw[name] = img
                     return img
                 except Exception:
+                    failed = True
                     continue
 
-    _raw[name] = None
+    if not failed:
+        _raw[name] = None
     return None
 
 
+def _surface_bytes(surface):
+    width, height = surface.get_size()
+    return width * height * surface.get_bytesize()
+
+
+def _evict_scaled():
+    while _scaled and _scaled_stats['bytes'] > _scaled_stats['budget']:
+        _, evicted = _scaled.popitem(last=False)
+        _scaled_stats['bytes'] -= _surface_bytes(evicted)
+        _scaled_stats['evictions'] += 1
+
+
+def set_cache_budget(budget_bytes):
+    _scaled_stats['budget'] = max(0, int(budget_bytes))
+    _evict_scaled()
+
+
+def clear_cache():
+    _scaled.clear()
+    _rotated.clear()
+    _text.clear()
+    _scaled_stats['bytes'] = 0
+
+
+def cache_stats():
+    return dict(_scaled_stats, entries=len(_scaled))
+
+
 def get(name, size=None):
     raw = _load_raw(name)
     if raw is None:
@@ -83,7 +126,68 @@ def get(name, size=None):
         return raw.copy()
     if isinstance(size, int):
         size = (size, size)
+    size = (max(1, int(size[0])), max(1, int(size[1])))
+
+    key = (name, size)
+    cached = _scaled.get(key)
+    if cached is not None:
+        _scaled.move_to_end(key)
+        _scaled_stats['hits'] += 1
+        return cached
+
+    _scaled_stats['misses'] += 1
     try:
-        return pygame.transform.smoothscale(raw, size)
+        scaled = pygame.transform.smoothscale(raw, size)
     except Exception:
-        return raw.copy()
+        scaled = raw.copy()
+    _scaled[key] = scaled
+    _scaled_stats['bytes'] += _surface_bytes(scaled)
+    _evict_scaled()
+    return scaled
+
+
+def rotations(name, size=None, steps=ROTATION_STEPS):
+    key = (name, size, steps)
+    if key in _rotated:
+        return _rotated[key]
+    sprite = get(name, size)
+    if sprite is None:
+        return None
+    frames = tuple(pygame.transform.rotate(sprite, -idx * 360.0 / steps) for idx in range(steps))
+    _rotated[key] = frames
+    return frames
+
+
+def get_font(face="arial", size=16, bold=False, italic=False):
+    key = (face, int(size), bool(bold), bool(italic))
+    font = _fonts.get(key)
+    if font is None:
+        font = pygame.font.SysFont(face, int(size), bold=bold, italic=italic)
+        _fonts[key] = font
+    return font
+
+
+def render_text(font, text, color, antialias=True):
+    key = (font, text, tuple(color), antialias)
+    surface = _text.get(key)
+    if surface is not None:
+        _text.move_to_end(key)
+        _text_stats['hits'] += 1
+        return surface
+
+    _text_stats['misses'] += 1
+    surface = font.render(text, antialias, color)
+    _text[key] = surface
+    if len(_text) > TEXT_CACHE_SIZE:
+        _text.popitem(last=False)
+        _text_stats['evictions'] += 1
+    return surface
+
+
+def text_cache_stats():
+    return dict(_text_stats, entries=len(_text), fonts=len(_fonts))
+
+
+def warm(requests):
+    for name, size in requests:
+        get(name, size)
@@ -0,0 +1,428 @@
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+import pygame
+
+from constants import ENEMY_STATS, FPS, GRID_H, GRID_W, HEIGHT, TILE, WIDTH
+from drawing import draw_grid, invalidate_map_layer
+from enemy import Enemy, invalidate_path_cache
+from enemy_store import EnemyStore, store_available
+from maze import MAX_TOTAL_LANES, expand_paths
+from projectiles import Projectile
+from simulation import FIXED_DT, TOWER_TYPES, TRAP_TYPES, Simulation
+from tower import Tower
+from traps import Trap
+
+UPDATE_PHASES = ('enemy_logic', 'spatial_rebuild', 'tower_update', 'projectile_update', 'trap_update')
+DRAW_PHASES = ('draw_grid', 'draw_towers', 'draw_projectiles', 'draw_traps', 'draw_enemies')
+UPGRADE_CONFIGS = ((), (1,), (1, 1), (2,), (2, 2))
+DEFAULT_ENEMY_COUNTS = (1, 4, 8, 16, 32)
+MEMORY_ENTITY_COUNT = 1000
+HEALTH_THRESHOLDS = {'fighter': 0.5, 'tank': 0.3, 'assassin': 0.3, 'minotaur_boss': 0.3}
+THRESHOLD_OFFSETS = (0.01, 0.05, 0.2, 0.6)
+
+
+def _expand_to_max_lanes(sim):
+    while len(sim.spawn_points) < MAX_TOTAL_LANES:
+        _, _, spawn_point = expand_paths(sim.grid, sim.towers, sim.spawn_points, rng=sim.rng['maze'])
+        if not spawn_point or spawn_point in sim.spawn_points:
+            break
+        sim.spawn_points.append(spawn_point)
+    invalidate_path_cache()
+
+
+def _path_tiles(sim):
+    return [
+        (x, y) for y in range(GRID_H) for x in range(GRID_W)
+        if sim.grid[y][x] == 2 and (x, y) != sim.goal and (x, y) not in sim.spawn_points
+    ]
+
+
+def _tower_tiles(sim):
+    tiles = []
+    for y in range(GRID_H):
+        for x in range(GRID_W):
+            if sim.grid[y][x] != 0:
+                continue
+            path_neighbors = sum(
+                1 for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                if 0 <= x + dx < GRID_W and 0 <= y + dy < GRID_H and sim.grid[y + dy][x + dx] == 2
+            )
+            tiles.append((-path_neighbors, x, y))
+    tiles.sort()
+    return [(x, y) for _, x, y in tiles]
+
+
+def build_scenario(enemies_per_type, towers_per_config=1, traps=True, seed=0, array_store=False, batch_targeting=False, schedule_towers=True):
+    sim = Simulation(target_wave=50, seed=seed, array_store=array_store, batch_targeting=batch_targeting, schedule_towers=schedule_towers)
+    _expand_to_max_lanes(sim)
+    invalidate_map_layer()
+    path_tiles = _path_tiles(sim)
+    rng = sim.rng['spawns']
+
+    for tower_type in TOWER_TYPES:
+        for config in UPGRADE_CONFIGS:
+            for _ in range(towers_per_config):
+                tiles = _tower_tiles(sim)
+                occupied = {sim.structure_tile(t) for t in sim.towers}
+                free = [tile for tile in tiles if tile not in occupied]
+                if not free:
+                    break
+                gx, gy = free[0]
+                tower = Tower(pygame.Vector2(gx * TILE + TILE // 2, gy * TILE + TILE // 2), tower_type)
+                for path in config:
+                    tower.upgrade(path)
+                sim.add_tower(tower)
+
+    if traps:
+        for idx, (gx, gy) in enumerate(path_tiles):
+            trap = Trap((gx, gy), TRAP_TYPES[idx % len(TRAP_TYPES)])
+            for path in UPGRADE_CONFIGS[idx % len(UPGRADE_CONFIGS)]:
+                trap.upgrade(path)
+            sim.add_trap(trap)
+
+    roster = []
+    for enemy_type in ENEMY_STATS:
+        for _ in range(enemies_per_type):
+            tile = rng.choice(path_tiles)
+            enemy = Enemy(sim.grid, tile, sim.goal, enemy_type, rng=sim.rng['enemies'])
+            sim.enemies.append(enemy)
+            roster.append((enemy, tile))
+    return sim, roster
+
+
+def _restore_roster(sim, roster):
+    for enemy, tile in roster:
+        if enemy.hp < enemy.max_hp:
+            enemy.hp = enemy.max_hp
+        if enemy.grid_pos() == sim.goal:
+            enemy.pos = pygame.Vector2(tile[0] * TILE + TILE // 2, tile[1] * TILE + TILE // 2)
+            enemy.repath()
+    if len(sim.enemies) != len(roster):
+        sim.enemies[:] = [enemy for enemy, _ in roster]
+
+
+def _timed(samples, name, func, *args):
+    started = time.perf_counter_ns()
+    func(*args)
+    samples[name].append(time.perf_counter_ns() - started)
+
+
+def _draw_all(screen, items):
+    for item in items:
+        item.draw(screen)
+
+
+def _draw_towers(screen, towers):
+    for tower in towers:
+        tower.draw(screen, False)
+
+
+def run_scenario(enemies_per_type, towers_per_config=1, traps=True, frames=240, warmup=30, draw=True, seed=0, array_store=False, batch_targeting=False, schedule_towers=True):
+    sim, roster = build_scenario(
+        enemies_per_type, towers_per_config=towers_per_config, traps=traps, seed=seed,
+        array_store=array_store, batch_targeting=batch_targeting, schedule_towers=schedule_towers,
+    )
+    phases = UPDATE_PHASES + (DRAW_PHASES if draw else ())
+    samples = {name: [] for name in phases}
+    screen = pygame.Surface((WIDTH, HEIGHT)) if draw else None
+    dt = FIXED_DT
+
+    for frame in range(warmup + frames):
+        _timed(samples, 'enemy_logic', sim._update_enemies, dt)
+        _timed(samples, 'spatial_rebuild', sim._rebuild_spatial_index)
+        _timed(samples, 'tower_update', sim._update_towers, dt)
+        _timed(samples, 'projectile_update', sim._update_projectiles, dt)
+        _timed(samples, 'trap_update', sim._update_traps, dt)
+        if draw:
+            _timed(samples, 'draw_grid', draw_grid, screen, sim.grid, sim.goal)
+            _timed(samples, 'draw_towers', _draw_towers, screen, sim.towers)
+            _timed(samples, 'draw_projectiles', _draw_all, screen, sim.projectiles)
+            _timed(samples, 'draw_traps', _draw_all, screen, sim.traps)
+            _timed(samples, 'draw_enemies', _draw_all, screen, sim.enemies)
+        _restore_roster(sim, roster)
+        if frame < warmup:
+            for name in phases:
+                samples[name].clear()
+
+    result = {
+        'enemies_per_type': enemies_per_type,
+        'enemies': len(roster),
+        'towers': len(sim.towers),
+        'traps': len(sim.traps),
+        'projectiles': len(sim.projectiles),
+        'pool': sim.projectile_pool.stats(),
+        'frames': frames,
+        'phases': {},
+    }
+    for name in phases:
+        values = samples[name]
+        result['phases'][name] = {
+            'mean_us': statistics.fmean(values) / 1000.0,
+            'median_us': statistics.median(values) / 1000.0,
+            'max_us': max(values) / 1000.0,
+        }
+    result['total_us'] = sum(phase['mean_us'] for phase in result['phases'].values())
+    return result
+
+
+def run_suite(enemy_counts=DEFAULT_ENEMY_COUNTS, towers_per_config=1, traps=True, frames=240, warmup=30, draw=True, seed=0, array_store=False, batch_targeting=False, schedule_towers=True):
+    if draw:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        pygame.display.init()
+        if pygame.display.get_surface() is None:
+            pygame.display.set_mode((WIDTH, HEIGHT))
+    return [
+        run_scenario(
+            count, towers_per_config=towers_per_config, traps=traps, frames=frames, warmup=warmup, draw=draw, seed=seed,
+            array_store=array_store, batch_targeting=batch_targeting, schedule_towers=schedule_towers,
+        )
+        for count in enemy_counts
+    ]
+
+
+def _traced_bytes(build):
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        kept = build()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return allocated, kept
+
+
+def _unslotted(cls):
+    slots = set(getattr(cls, '__slots__', ()))
+    namespace = {
+        key: value for key, value in vars(cls).items()
+        if key not in slots and key not in ('__slots__', '__dict__', '__weakref__')
+    }
+    return type(f"Unslotted{cls.__name__}", cls.__bases__, namespace)
+
+
+def measure_memory(count=MEMORY_ENTITY_COUNT, seed=0):
+    sim = Simulation(target_wave=50, seed=seed)
+    _expand_to_max_lanes(sim)
+    path_tiles = _path_tiles(sim)
+    rng = sim.rng['spawns']
+    enemy_types = list(ENEMY_STATS)
+    tiles = [rng.choice(path_tiles) for _ in range(count)]
+
+    def build_enemies(enemy_cls):
+        enemies = []
+        for idx, tile in enumerate(tiles):
+            enemy = enemy_cls(sim.grid, tile, sim.goal, enemy_types[idx % len(enemy_types)], rng=sim.rng['enemies'])
+            enemy.add_slow(2)
+            enemies.append(enemy)
+        return enemies
+
+    def build_projectiles(projectile_cls, enemies):
+        origin = pygame.Vector2(0, 0)
+        return [projectile_cls(origin, enemies[idx], 20, 'physical', 'physical') for idx in range(count)]
+
+    enemy_bytes, enemies = _traced_bytes(lambda: build_enemies(Enemy))
+    projectile_bytes, _ = _traced_bytes(lambda: build_projectiles(Projectile, enemies))
+    dict_enemy_bytes, _ = _traced_bytes(lambda: build_enemies(_unslotted(Enemy)))
+    dict_projectile_bytes, _ = _traced_bytes(lambda: build_projectiles(_unslotted(Projectile), enemies))
+    return {
+        'count': count,
+        'enemy_bytes': enemy_bytes,
+        'bytes_per_enemy': enemy_bytes / count,
+        'unslotted_bytes_per_enemy': dict_enemy_bytes / count,
+        'projectile_bytes': projectile_bytes,
+        'bytes_per_projectile': projectile_bytes / count,
+        'unslotted_bytes_per_projectile': dict_projectile_bytes / count,
+    }
+
+
+def _store_case(sim, tiles, enemy_types, seed, dot_threshold):
+    rng = random.Random(seed)
+    enemies = []
+    for idx, tile in enumerate(tiles):
+        enemy_type = enemy_types[idx % len(enemy_types)]
+        enemy = Enemy(sim.grid, tile, sim.goal, enemy_type, rng=rng)
+        if dot_threshold:
+            threshold = HEALTH_THRESHOLDS.get(enemy_type, 0.5)
+            enemy.hp = enemy.max_hp * threshold + THRESHOLD_OFFSETS[idx % len(THRESHOLD_OFFSETS)]
+            enemy.apply_burn(2.0)
+            enemy.apply_bleed(2.0, 2.0)
+        elif idx % 3 == 0:
+            enemy.apply_burn(1.5)
+        enemies.append(enemy)
+    return enemies
+
+
+def _enemy_state(enemies):
+    return [
+        (
+            enemy.hp, enemy.shield_hp, enemy.pos.x, enemy.pos.y, enemy.path_idx,
+            enemy.fighter_shield_used, enemy.tank_bulwark_active, enemy.assassin_emergency_used, enemy.minotaur_phase2,
+        )
+        for enemy in enemies
+    ]
+
+
+def check_store(count=64, ticks=240, seed=0):
+    sim = Simulation(target_wave=50, seed=seed)
+    path_tiles = _path_tiles(sim)
+    rng = random.Random(seed)
+    tiles = [rng.choice(path_tiles) for _ in range(count)]
+    cases = (
+        ('dot_threshold', tuple(HEALTH_THRESHOLDS), True),
+        ('roster', tuple(ENEMY_STATS), False),
+    )
+    report = {}
+    for name, enemy_types, dot_threshold in cases:
+        plain = _store_case(sim, tiles, enemy_types, seed, dot_threshold)
+        batched = _store_case(sim, tiles, enemy_types, seed, dot_threshold)
+        store = EnemyStore(min_batch=1)
+        mismatch = None
+        for tick in range(1, ticks + 1):
+            for enemy in plain:
+                enemy.logic(plain, FIXED_DT, spawn_points=sim.spawn_points, goal_grid=sim.goal)
+            store.update(batched, FIXED_DT, spawn_points=sim.spawn_points, goal_grid=sim.goal)
+            if _enemy_state(plain) != _enemy_state(batched):
+                mismatch = tick
+                break
+        report[name] = {'enemies': len(plain), 'ticks': ticks, 'first_mismatch': mismatch}
+    return report
+
+
+def format_report(results):
+    phases = list(results[0]['phases'].keys())
+    header = f"{'enemies':>8} {'proj':>6} " + " ".join(f"{name:>17}" for name in phases) + f" {'total':>10}"
+    lines = ["mean us/frame", header]
+    for result in results:
+        row = f"{result['enemies']:>8} {result['projectiles']:>6} "
+        row += " ".join(f"{result['phases'][name]['mean_us']:>17.1f}" for name in phases)
+        row += f" {result['total_us']:>10.1f}"
+        lines.append(row)
+
+    first, last = results[0], results[-1]
+    if len(results) > 1 and last['enemies'] > first['enemies']:
+        growth = last['enemies'] / first['enemies']
+        lines.append("")
+        lines.append(f"scaling {first['enemies']} -> {last['enemies']} enemies (x{growth:.0f})")
+        for name in phases:
+            before = first['phases'][name]['mean_us']
+            after = last['phases'][name]['mean_us']
+            ratio = after / before if before > 0 else float('inf')
+            lines.append(f"  {name:<18} x{ratio:.1f}")
+    pools = [result for result in results if result.get('pool')]
+    if pools:
+        lines.append("")
+        lines.append("projectile pool")
+        for result in pools:
+            pool = result['pool']
+            lines.append(
+                f"  {result['enemies']:>6} enemies: hit rate {pool['hit_rate']:.1%}, "
+                f"peak free {pool['peak_size']}, peak in flight {pool['peak_in_use']}"
+            )
+    budget_us = 1_000_000.0 / FPS
+    lines.append("")
+    lines.append(f"frame budget at {FPS} FPS: {budget_us:.0f} us")
+    return "\n".join(lines)
+
+
+def compare_to_baseline(results, baseline, tolerance=0.25):
+    regressions = []
+    by_count = {entry['enemies_per_type']: entry for entry in baseline}
+    for result in results:
+        previous = by_count.get(result['enemies_per_type'])
+        if not previous:
+            continue
+        for name, timing in result['phases'].items():
+            old = previous['phases'].get(name)
+            if not old or old['mean_us'] <= 0:
+                continue
+            ratio = timing['mean_us'] / old['mean_us']
+            if ratio > 1.0 + tolerance:
+                regressions.append((result['enemies'], name, old['mean_us'], timing['mean_us'], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the simulation and draw phases under late-wave entity loads.")
+    parser.add_argument('--enemies', type=int, nargs='+', default=list(DEFAULT_ENEMY_COUNTS), help="enemies per ENEMY_STATS type, one scenario each")
+    parser.add_argument('--towers', type=int, default=1, help="towers per tower type and upgrade config")
+    parser.add_argument('--no-traps', action='store_true')
+    parser.add_argument('--no-draw', action='store_true')
+    parser.add_argument('--frames', type=int, default=240)
+    parser.add_argument('--warmup', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--array-store', action='store_true', help="run enemy logic through the numpy EnemyStore")
+    parser.add_argument('--batch-targeting', action='store_true', help="pick tower targets with the numpy targeting stage")
+    parser.add_argument('--no-tower-scheduler', action='store_true', help="update every tower every frame")
+    parser.add_argument('--json', default=None, help="write results to this file")
+    parser.add_argument('--baseline', default=None, help="compare against a previous --json file")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed slowdown per phase before failing")
+    parser.add_argument('--memory', action='store_true', help="report traced bytes per live enemy and projectile instead of timings")
+    parser.add_argument('--memory-count', type=int, default=MEMORY_ENTITY_COUNT)
+    parser.add_argument('--check-store', action='store_true', help="compare EnemyStore against plain Enemy.logic tick by tick instead of timing")
+    args = parser.parse_args(argv)
+
+    if args.check_store:
+        if not store_available():
+            print("numpy is not installed; EnemyStore is unavailable")
+            return 1
+        report = check_store(seed=args.seed)
+        for name, result in report.items():
+            status = "match" if result['first_mismatch'] is None else f"mismatch at tick {result['first_mismatch']}"
+            print(f"{name:<14} {result['enemies']:>4} enemies, {result['ticks']} ticks: {status}")
+        return 0 if all(result['first_mismatch'] is None for result in report.values()) else 1
+
+    if args.memory:
+        report = measure_memory(count=args.memory_count, seed=args.seed)
+        for label, kind in (('enemies', 'enemy'), ('projectiles', 'projectile')):
+            slotted = report[f'bytes_per_{kind}']
+            unslotted = report[f'unslotted_bytes_per_{kind}']
+            saving = 1.0 - slotted / unslotted if unslotted else 0.0
+            print(
+                f"{report['count']} live {label + ':':<13} {slotted:8.0f} bytes each with __slots__, "
+                f"{unslotted:8.0f} with __dict__ ({saving:.0%} saved)"
+            )
+        return 0
+
+    results = run_suite(
+        enemy_counts=args.enemies,
+        towers_per_config=args.towers,
+        traps=not args.no_traps,
+        frames=args.frames,
+        warmup=args.warmup,
+        draw=not args.no_draw,
+        seed=args.seed,
+        array_store=args.array_store,
+        batch_targeting=args.batch_targeting,
+        schedule_towers=not args.no_tower_scheduler,
+    )
+    print(format_report(results))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as out:
+            json.dump(results, out, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare_to_baseline(results, baseline, tolerance=args.tolerance)
+        if regressions:
+            print("")
+            print("regressions:")
+            for enemies, name, old, new, ratio in regressions:
+                print(f"  {enemies:>5} enemies {name:<18} {old:9.1f} -> {new:9.1f} us (x{ratio:.2f})")
+            return 1
+        print("")
+        print(f"no phase slower than baseline by more than {args.tolerance:.0%}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,83 +1,165 @@
 import pygame
 from constants import WIDTH, HEIGHT, TILE, GRID_W, GRID_H, GAME_HEIGHT
-from colors import BLACK, WHITE, LIGHT_GREEN, DARK_GREEN, GOLD
-from assets import get as get_asset
+from colors import BLACK, WHITE, LIGHT_GREEN, DARK_GREEN, GOLD, DARK_GRAY
+from assets import get as get_asset, get_font, render_text
 
-def draw_grid(screen, grid, goal_grid):
-    tile_path = get_asset('tile_path', TILE)
-    tile_grass = get_asset('tile_grass', TILE)
+_map_layer = {'surface': None, 'grid': None, 'goal': None, 'tiles': None, 'dirty': set()}
+_profiler_overlay = {'summary': None, 'surface': None, 'counts_y': 0}
+_retained_layers = {}
+_placement_preview = {}
+
+
+def _load_map_tiles():
     tile_wall = get_asset('tile_wall', TILE)
-    wall_left = get_asset('wall_left', TILE)
-    wall_right = get_asset('wall_right', TILE)
-    for y in range(GRID_H):
-        for x in range(GRID_W):
-            pos = (x * TILE, y * TILE)
-            if grid[y][x] == 1:
-                if x == 0 and wall_left:
-                    screen.blit(wall_left, pos)
-                elif x == GRID_W - 1 and wall_right:
-                    screen.blit(wall_right, pos)
-                elif tile_wall:
-                    if x == 0:
-                        screen.blit(pygame.transform.rotate(tile_wall, 90), pos)
-                    elif x == GRID_W - 1:
-                        screen.blit(pygame.transform.rotate(tile_wall, -90), pos)
-                    else:
-                        screen.blit(tile_wall, pos)
-                else:
-                    pygame.draw.rect(screen, BLACK, (pos[0], pos[1], TILE, TILE))
-            elif grid[y][x] == 2:
-                if tile_path:
-                    screen.blit(tile_path, pos)
-                else:
-                    pygame.draw.rect(screen, WHITE, (pos[0], pos[1], TILE, TILE))
-                    pygame.draw.rect(screen, (200, 200, 200), (pos[0], pos[1], TILE, TILE), 1)
+    return {
+        'path': get_asset('tile_path', TILE),
+        'grass': get_asset('tile_grass', TILE),
+        'wall': tile_wall,
+        'wall_left': get_asset('wall_left', TILE),
+        'wall_right': get_asset('wall_right', TILE),
+        'wall_rotated_left': pygame.transform.rotate(tile_wall, 90) if tile_wall else None,
+        'wall_rotated_right': pygame.transform.rotate(tile_wall, -90) if tile_wall else None,
+        'gem': get_asset('goal_gem', TILE),
+    }
+
+
+def _draw_map_tile(surface, grid, x, y, tiles):
+    pos = (x * TILE, y * TILE)
+    pygame.draw.rect(surface, DARK_GRAY, (pos[0], pos[1], TILE, TILE))
+    if grid[y][x] == 1:
+        if x == 0 and tiles['wall_left']:
+            surface.blit(tiles['wall_left'], pos)
+        elif x == GRID_W - 1 and tiles['wall_right']:
+            surface.blit(tiles['wall_right'], pos)
+        elif tiles['wall']:
+            if x == 0:
+                surface.blit(tiles['wall_rotated_left'], pos)
+            elif x == GRID_W - 1:
+                surface.blit(tiles['wall_rotated_right'], pos)
             else:
-                if tile_grass:
-                    screen.blit(tile_grass, pos)
-                else:
-                    pygame.draw.rect(screen, LIGHT_GREEN, (pos[0], pos[1], TILE, TILE))
-                    pygame.draw.rect(screen, DARK_GREEN, (pos[0], pos[1], TILE, TILE), 1)
-    
+                surface.blit(tiles['wall'], pos)
+        else:
+            pygame.draw.rect(surface, BLACK, (pos[0], pos[1], TILE, TILE))
+    elif grid[y][x] == 2:
+        if tiles['path']:
+            surface.blit(tiles['path'], pos)
+        else:
+            pygame.draw.rect(surface, WHITE, (pos[0], pos[1], TILE, TILE))
+            pygame.draw.rect(surface, (200, 200, 200), (pos[0], pos[1], TILE, TILE), 1)
+    else:
+        if tiles['grass']:
+            surface.blit(tiles['grass'], pos)
+        else:
+            pygame.draw.rect(surface, LIGHT_GREEN, (pos[0], pos[1], TILE, TILE))
+            pygame.draw.rect(surface, DARK_GREEN, (pos[0], pos[1], TILE, TILE), 1)
+
+
+def _draw_goal(surface, goal_grid, tiles):
     tx = goal_grid[0] * TILE + TILE // 2
     ty = goal_grid[1] * TILE + TILE // 2
-    gem = get_asset('goal_gem', TILE)
-    if gem:
-        screen.blit(gem, (tx - TILE // 2, ty - TILE // 2))
+    if tiles['gem']:
+        surface.blit(tiles['gem'], (tx - TILE // 2, ty - TILE // 2))
     else:
-        pygame.draw.circle(screen, GOLD, (tx, ty), TILE)
-        pygame.draw.circle(screen, BLACK, (tx, ty), TILE, 2)
+        pygame.draw.circle(surface, GOLD, (tx, ty), TILE)
+        pygame.draw.circle(surface, BLACK, (tx, ty), TILE, 2)
+
+
+def _build_map_layer(grid, goal_grid):
+    surface = pygame.Surface((GRID_W * TILE, GRID_H * TILE))
+    try:
+        surface = surface.convert()
+    except pygame.error:
+        pass
+    tiles = _load_map_tiles()
+    for y in range(GRID_H):
+        for x in range(GRID_W):
+            _draw_map_tile(surface, grid, x, y, tiles)
+    _draw_goal(surface, goal_grid, tiles)
+    _map_layer.update(surface=surface, grid=grid, goal=tuple(goal_grid), tiles=tiles)
+    _map_layer['dirty'].clear()
+
+
+def invalidate_map_layer(tiles=None):
+    if tiles is None:
+        _map_layer['surface'] = None
+        _map_layer['grid'] = None
+        _map_layer['dirty'].clear()
+        return
+    _map_layer['dirty'].update((int(x), int(y)) for x, y in tiles)
+
+
+def draw_grid(screen, grid, goal_grid):
+    if _map_layer['surface'] is None or _map_layer['grid'] is not grid or _map_layer['goal'] != tuple(goal_grid):
+        _build_map_layer(grid, goal_grid)
+    elif _map_layer['dirty']:
+        surface = _map_layer['surface']
+        gx, gy = goal_grid
+        _map_layer['dirty'].update((gx + dx, gy + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+        for x, y in _map_layer['dirty']:
+            if 0 <= x < GRID_W and 0 <= y < GRID_H:
+                _draw_map_tile(surface, grid, x, y, _map_layer['tiles'])
+        _draw_goal(surface, goal_grid, _map_layer['tiles'])
+        _map_layer['dirty'].clear()
+    screen.blit(_map_layer['surface'], (0, 0))
+
+def draw_placement_preview(screen, gx, gy, valid):
+    tile = _placement_preview.get(valid)
+    if tile is None:
+        color = (80, 220, 120) if valid else (230, 70, 70)
+        tile = pygame.Surface((TILE, TILE), pygame.SRCALPHA)
+        pygame.draw.rect(tile, color + (70,), (0, 0, TILE, TILE))
+        pygame.draw.rect(tile, color + (200,), (0, 0, TILE, TILE), 2)
+        _placement_preview[valid] = tile
+    screen.blit(tile, (gx * TILE, gy * TILE))
+
+
+def _retained(name, key, build):
+    layer = _retained_layers.get(name)
+    if layer is None or layer[0] != key:
+        layer = (key, build())
+        _retained_layers[name] = layer
+    return layer[1]
+
 
 def draw_ui(screen, font, money, lives, wave, wave_enemies_left, placing_tower_type, tower_costs=None, game_speed=1, selected_structure=None):
     if tower_costs is None:
         tower_costs = {}
-    
+
+    targeting_mode = getattr(selected_structure, 'targeting_mode', None) if selected_structure else None
+    costs = tuple(tower_costs.get(name) for name in ('physical', 'magic', 'ice', 'executioner', 'fire', 'spikes'))
+    key = (font, money, lives, wave, wave_enemies_left, placing_tower_type, game_speed, targeting_mode, costs)
+    layer = _retained('ui', key, lambda: _build_ui_layer(
+        font, money, lives, wave, wave_enemies_left, placing_tower_type, tower_costs, game_speed, targeting_mode
+    ))
+    screen.blits(layer, doreturn=False)
+
+
+def _build_ui_layer(font, money, lives, wave, wave_enemies_left, placing_tower_type, tower_costs, game_speed, targeting_mode):
     box_height = HEIGHT - GAME_HEIGHT
     box_y = GAME_HEIGHT
-    box_x = 0
     box_width = WIDTH
-    
+
     ui_surface = pygame.Surface((box_width, box_height), pygame.SRCALPHA)
     pygame.draw.rect(ui_surface, (0, 0, 0, 200), (0, 0, box_width, box_height))
     pygame.draw.rect(ui_surface, (255, 255, 255, 150), (0, 0, box_width, box_height), 2)
-    screen.blit(ui_surface, (box_x, box_y))
-    
+    layer = [(ui_surface, (0, box_y))]
+
     boss_indicator = "BOSS" if wave % 5 == 0 else ""
     stats_text = f"Money: ${money}  |  Lives: {lives}  |  Wave: {wave}  |  Enemies: {wave_enemies_left}  |  Speed: {game_speed}x  |  {boss_indicator}"
-    stats_surf = font.render(stats_text, True, WHITE)
-    screen.blit(stats_surf, (20, box_y + 10))
-    
-    towers_header = font.render("TOWERS:", True, (255, 255, 100))
-    screen.blit(towers_header, (20, box_y + 35))
-    
+    stats_surf = render_text(font, stats_text, WHITE)
+    layer.append((stats_surf, (20, box_y + 10)))
+
+    towers_header = render_text(font, "TOWERS:", (255, 255, 100))
+    layer.append((towers_header, (20, box_y + 35)))
+
     physical_cost = tower_costs.get('physical', 50)
     magic_cost = tower_costs.get('magic', 60)
     ice_cost = tower_costs.get('ice', 70)
     executioner_cost = tower_costs.get('executioner', 140)
     tower_types_line = f"Archer ${physical_cost}  |  Magic ${magic_cost}  |  Ice ${ice_cost}  |  Exec ${executioner_cost}"
-    towers_surf = font.render(tower_types_line, True, WHITE)
-    screen.blit(towers_surf, (20, box_y + 55))
-    
+    towers_surf = render_text(font, tower_types_line, WHITE)
+    layer.append((towers_surf, (20, box_y + 55)))
+
     selected_labels = {
         'physical': 'ARCHER TOWER',
         'magic': 'MAGIC',
@@ -87,21 +169,21 @@ def draw_ui(screen, font, money, lives, wave, wave_enemies_left, placing_tower_t
         'spikes': 'SPIKES',
     }
     selected_text = f"Selected: {selected_labels.get(placing_tower_type, placing_tower_type.upper())}"
-    selected_surf = font.render(selected_text, True, (100, 200, 255))
-    screen.blit(selected_surf, (20, box_y + 75))
+    selected_surf = render_text(font, selected_text, (100, 200, 255))
+    layer.append((selected_surf, (20, box_y + 75)))
 
-    traps_header = font.render("TRAPS:", True, (255, 200, 100))
-    screen.blit(traps_header, (520, box_y + 35))
+    traps_header = render_text(font, "TRAPS:", (255, 200, 100))
+    layer.append((traps_header, (520, box_y + 35)))
     fire_cost = tower_costs.get('fire', None)
     spikes_cost = tower_costs.get('spikes', None)
     trap_info = f"Fire ${fire_cost if fire_cost is not None else 40}  |  Spikes ${spikes_cost if spikes_cost is not None else 30}"
-    trap_surf = font.render(trap_info, True, WHITE)
-    screen.blit(trap_surf, (520, box_y + 55))
-    
-    upgrade_hint = font.render("Select structure to upgrade or sell, click targeting mode, adjust speed", True, (180, 180, 180))
-    screen.blit(upgrade_hint, (20, box_y + 100))
+    trap_surf = render_text(font, trap_info, WHITE)
+    layer.append((trap_surf, (520, box_y + 55)))
+
+    upgrade_hint = render_text(font, "Select structure to upgrade or sell, click targeting mode, adjust speed", (180, 180, 180))
+    layer.append((upgrade_hint, (20, box_y + 100)))
 
-    if selected_structure and hasattr(selected_structure, 'targeting_mode'):
+    if targeting_mode is not None:
         label_map = {
             'first': 'First',
             'last': 'Last',
@@ -109,27 +191,28 @@ def draw_ui(screen, font, money, lives, wave, wave_enemies_left, placing_tower_t
             'weakest': 'Weakest',
             'closest_goal': 'Closest Goal',
         }
-        mode_text = font.render(f"Targeting: {label_map.get(selected_structure.targeting_mode, selected_structure.targeting_mode)}", True, (150, 220, 255))
-        screen.blit(mode_text, (520, box_y + 75))
+        mode_text = render_text(font, f"Targeting: {label_map.get(targeting_mode, targeting_mode)}", (150, 220, 255))
+        layer.append((mode_text, (520, box_y + 75)))
+    return layer
 
 def draw_game_over(screen, font):
     screen.fill((100, 0, 0))
 
-    game_over_text = font.render("GAME OVER", True, (255, 80, 80))
+    game_over_text = render_text(font, "GAME OVER", (255, 80, 80))
     game_over_rect = game_over_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 80))
     screen.blit(game_over_text, game_over_rect)
 
-    play_again_text = font.render("Play Again", True, WHITE)
+    play_again_text = render_text(font, "Play Again", WHITE)
     play_again_rect = play_again_text.get_rect(center=(WIDTH // 2 - 180, HEIGHT // 2 + 50))
     pygame.draw.rect(screen, (180, 80, 80), play_again_rect.inflate(20, 10), 2)
     screen.blit(play_again_text, play_again_rect)
 
-    menu_text = font.render("Main Menu", True, WHITE)
+    menu_text = render_text(font, "Main Menu", WHITE)
     menu_rect = menu_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 50))
     pygame.draw.rect(screen, (120, 120, 160), menu_rect.inflate(20, 10), 2)
     screen.blit(menu_text, menu_rect)
 
-    exit_text = font.render("Exit", True, WHITE)
+    exit_text = render_text(font, "Exit", WHITE)
     exit_rect = exit_text.get_rect(center=(WIDTH // 2 + 180, HEIGHT // 2 + 50))
     pygame.draw.rect(screen, (150, 0, 0), exit_rect.inflate(20, 10), 2)
     screen.blit(exit_text, exit_rect)
@@ -147,9 +230,9 @@ def draw_end_progress_bar(screen, font, level, xp, xp_next, shown_gain, total_ga
     pygame.draw.rect(panel, (10, 16, 28, 210), (0, 0, panel_w, panel_h), border_radius=8)
     pygame.draw.rect(panel, (120, 170, 240, 220), (0, 0, panel_w, panel_h), 2, border_radius=8)
 
-    title = font.render(f"Progression  •  Level {level}", True, (235, 242, 255))
-    xp_text = font.render(f"XP {xp}/{xp_next}", True, (210, 228, 250))
-    gain_text = font.render(f"Run XP +{shown_gain}/{total_gain}", True, (130, 220, 160))
+    title = render_text(font, f"Progression  •  Level {level}", (235, 242, 255))
+    xp_text = render_text(font, f"XP {xp}/{xp_next}", (210, 228, 250))
+    gain_text = render_text(font, f"Run XP +{shown_gain}/{total_gain}", (130, 220, 160))
     panel.blit(title, (14, 10))
     panel.blit(xp_text, (panel_w - xp_text.get_width() - 14, 10))
     panel.blit(gain_text, (14, 52))
@@ -177,12 +260,52 @@ def draw_boss_spawn_popup(screen, font, boss_type):
     pygame.draw.rect(popup_surface, (0, 0, 0, 200), (0, 0, popup_width, popup_height))
     pygame.draw.rect(popup_surface, (255, 0, 0, 255), (0, 0, popup_width, popup_height), 3)
     
-    text = font.render(f"{boss_type.upper()} HAS SPAWNED!", True, (255, 0, 0))
+    text = render_text(font, f"{boss_type.upper()} HAS SPAWNED!", (255, 0, 0))
     text_rect = text.get_rect(center=(popup_width // 2, popup_height // 2))
     popup_surface.blit(text, (text_rect.x, text_rect.y + 15))
     
     screen.blit(popup_surface, (popup_x, popup_y))
 
+def draw_profiler_overlay(screen, font, summary, counts):
+    if _profiler_overlay['summary'] is not summary or _profiler_overlay['surface'] is None:
+        line_height = font.get_linesize() + 1
+        columns = (118, 160, 202)
+        panel_width = 216
+        rows = [(name, values) for name, values in summary.items()]
+        panel_height = (len(rows) + 3) * line_height + 12
+        panel = pygame.Surface((panel_width, panel_height), pygame.SRCALPHA)
+        pygame.draw.rect(panel, (10, 20, 35, 200), (0, 0, panel_width, panel_height), border_radius=4)
+
+        y = 6
+        panel.blit(font.render("ms", True, (150, 180, 210)), (8, y))
+        for x, label in zip(columns, ("p50", "p95", "p99")):
+            text = font.render(label, True, (150, 180, 210))
+            panel.blit(text, (x - text.get_width(), y))
+        y += line_height
+        for name, values in rows:
+            color = (255, 235, 140) if name == 'frame' else (220, 245, 255)
+            panel.blit(font.render(name.replace('_', ' '), True, color), (8, y))
+            for x, value in zip(columns, values):
+                text = font.render(f"{value:.2f}", True, color)
+                panel.blit(text, (x - text.get_width(), y))
+            y += line_height
+        y += line_height // 2
+        _profiler_overlay['summary'] = summary
+        _profiler_overlay['surface'] = panel
+        _profiler_overlay['counts_y'] = y
+
+    panel = _profiler_overlay['surface']
+    panel_x = WIDTH - panel.get_width() - 10
+    screen.blit(panel, (panel_x, 10))
+
+    line_height = font.get_linesize() + 1
+    y = 10 + _profiler_overlay['counts_y']
+    words = [f"{key.replace('_', ' ')}: {value}" for key, value in counts.items()]
+    half = (len(words) + 1) // 2
+    for chunk in ("  ".join(words[:half]), "  ".join(words[half:])):
+        screen.blit(render_text(font, chunk, (180, 230, 180)), (panel_x + 8, y))
+        y += line_height
+
 def draw_wave_selection_popup(screen, font, input_text):
     popup_width = 400
     popup_height = 150
@@ -193,15 +316,15 @@ def draw_wave_selection_popup(screen, font, input_text):
     pygame.draw.rect(popup_surface, (0, 0, 0, 200), (0, 0, popup_width, popup_height))
     pygame.draw.rect(popup_surface, (255, 255, 255, 150), (0, 0, popup_width, popup_height), 2)
     
-    title = font.render("Select Target Wave", True, WHITE)
+    title = render_text(font, "Select Target Wave", WHITE)
     title_rect = title.get_rect(center=(popup_width // 2, 20))
     popup_surface.blit(title, title_rect)
     
-    instruction = font.render("Enter wave number and press ENTER", True, (200, 200, 200))
+    instruction = render_text(font, "Enter wave number and press ENTER", (200, 200, 200))
     inst_rect = instruction.get_rect(center=(popup_width // 2, 50))
     popup_surface.blit(instruction, inst_rect)
     
-    input_display = font.render(f"Wave: {input_text}_", True, (100, 200, 255))
+    input_display = render_text(font, f"Wave: {input_text}_", (100, 200, 255))
     input_rect = input_display.get_rect(center=(popup_width // 2, 90))
     popup_surface.blit(input_display, input_rect)
     
@@ -217,7 +340,7 @@ def draw_main_menu(screen, font):
     start_y = HEIGHT // 2 - (button_height * total_buttons + button_gap * (total_buttons - 1)) // 2 + 30
 
     screen.fill((20, 24, 36))
-    title = pygame.font.SysFont("arial", 34).render("Maze Treasure Defense", True, (240, 245, 255))
+    title = render_text(get_font("arial", 34), "Maze Treasure Defense", (240, 245, 255))
     screen.blit(title, title.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 150)))
 
     buttons = {}
@@ -225,7 +348,7 @@ def draw_main_menu(screen, font):
         rect = pygame.Rect((WIDTH - button_width) // 2, start_y + idx * (button_height + button_gap), button_width, button_height)
         pygame.draw.rect(screen, (35, 48, 72), rect, border_radius=8)
         pygame.draw.rect(screen, (120, 170, 240), rect, 2, border_radius=8)
-        text = font.render(label, True, (235, 242, 255))
+        text = render_text(font, label, (235, 242, 255))
         screen.blit(text, text.get_rect(center=rect.center))
         buttons[key] = rect
     return buttons
@@ -238,8 +361,8 @@ def draw_modifier_draft(screen, font, modifier_cards):
     pygame.draw.rect(screen, (28, 34, 54), panel, border_radius=10)
     pygame.draw.rect(screen, (120, 170, 240), panel, 2, border_radius=10)
 
-    title = pygame.font.SysFont("arial", 26).render("Choose One Modifier", True, (245, 245, 255))
-    subtitle = font.render("Pick exactly one. Effect lasts for this run.", True, (185, 205, 235))
+    title = render_text(get_font("arial", 26), "Choose One Modifier", (245, 245, 255))
+    subtitle = render_text(font, "Pick exactly one. Effect lasts for this run.", (185, 205, 235))
     screen.blit(title, (panel.x + 20, panel.y + 18))
     screen.blit(subtitle, (panel.x + 22, panel.y + 56))
 
@@ -253,10 +376,10 @@ def draw_modifier_draft(screen, font, modifier_cards):
         pygame.draw.rect(screen, (36, 44, 70), card_rect, border_radius=8)
         pygame.draw.rect(screen, tier_color, card_rect, 2, border_radius=8)
 
-        name = font.render(modifier.get('name', 'Modifier'), True, (255, 255, 255))
+        name = render_text(font, modifier.get('name', 'Modifier'), (255, 255, 255))
         screen.blit(name, (card_rect.x + 12, card_rect.y + 14))
 
-        desc_font = pygame.font.SysFont("arial", 14)
+        desc_font = get_font("arial", 14)
         description = modifier.get('description', '')
         wrapped = []
         words = description.split()
@@ -272,14 +395,14 @@ def draw_modifier_draft(screen, font, modifier_cards):
             wrapped.append(line)
         y = card_rect.y + 52
         for item in wrapped:
-            surf = desc_font.render(item, True, (215, 225, 240))
+            surf = render_text(desc_font, item, (215, 225, 240))
             screen.blit(surf, (card_rect.x + 12, y))
             y += 20
 
         select_rect = pygame.Rect(card_rect.x + 12, card_rect.bottom - 44, card_width - 24, 30)
         pygame.draw.rect(screen, (70, 125, 92), select_rect, border_radius=6)
         pygame.draw.rect(screen, (130, 205, 155), select_rect, 1, border_radius=6)
-        select_text = font.render("Select", True, (255, 255, 255))
+        select_text = render_text(font, "Select", (255, 255, 255))
         screen.blit(select_text, select_text.get_rect(center=select_rect.center))
         select_buttons[modifier.get('id')] = select_rect
 
@@ -298,13 +421,13 @@ def draw_progression_screen(screen, font, progression_data, modifiers, scroll_of
     level = int(progression_data.get('level', 1))
     xp = int(progression_data.get('xp', 0))
     xp_next = max(1, int(100 * (level ** 1.35)))
-    header = font.render(f"Progression  |  Level {level}  |  XP {xp}/{xp_next}", True, (245, 245, 255))
+    header = render_text(font, f"Progression  |  Level {level}  |  XP {xp}/{xp_next}", (245, 245, 255))
     screen.blit(header, (panel.x + 18, panel.y + 16))
 
     back_rect = pygame.Rect(panel.right - 140, panel.y + 10, 120, 30)
     pygame.draw.rect(screen, (50, 68, 104), back_rect, border_radius=6)
     pygame.draw.rect(screen, (130, 180, 245), back_rect, 1, border_radius=6)
-    back_text = font.render("Back", True, (255, 255, 255))
+    back_text = render_text(font, "Back", (255, 255, 255))
     screen.blit(back_text, back_text.get_rect(center=back_rect.center))
 
     content_area = pygame.Rect(panel.x + 15, panel.y + 58, panel.width - 30, panel.height - 72)
@@ -327,8 +450,8 @@ def draw_progression_screen(screen, font, progression_data, modifiers, scroll_of
         text_color = (230, 235, 245) if is_unlocked else (145, 145, 145)
         pygame.draw.rect(screen, base, row, border_radius=6)
         pygame.draw.rect(screen, border, row, 1, border_radius=6)
-        name = font.render(f"{modifier_id}. {modifier.get('name', '')}", True, text_color)
-        desc = pygame.font.SysFont("arial", 13).render(modifier.get('description', ''), True, text_color)
+        name = render_text(font, f"{modifier_id}. {modifier.get('name', '')}", text_color)
+        desc = render_text(get_font("arial", 13), modifier.get('description', ''), text_color)
         screen.blit(name, (row.x + 10, row.y + 6))
         screen.blit(desc, (row.x + 10, row.y + 25))
         y += row_h
@@ -345,25 +468,31 @@ def draw_progression_screen(screen, font, progression_data, modifiers, scroll_of
     return {'back_rect': back_rect, 'max_scroll': max_scroll}
 
 def draw_pause(screen, font, guide_key='H', settings_key='O'):
+    layer = _retained('pause', (font, guide_key, settings_key), lambda: _build_pause_layer(font, guide_key, settings_key))
+    screen.blits(layer, doreturn=False)
+
+
+def _build_pause_layer(font, guide_key, settings_key):
     overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
     pygame.draw.rect(overlay, (0, 0, 0, 150), (0, 0, WIDTH, HEIGHT))
-    screen.blit(overlay, (0, 0))
-    
-    pause_text = font.render("PAUSED", True, (255, 255, 0))
+    layer = [(overlay, (0, 0))]
+
+    pause_text = render_text(font, "PAUSED", (255, 255, 0))
     pause_rect = pause_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 60))
-    screen.blit(pause_text, pause_rect)
-    
-    resume_text = font.render("Press ESC to Resume", True, WHITE)
+    layer.append((pause_text, pause_rect))
+
+    resume_text = render_text(font, "Press ESC to Resume", WHITE)
     resume_rect = resume_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 20))
-    screen.blit(resume_text, resume_rect)
-    
-    guide_text = font.render(f"Press [{guide_key}] for Game Guide", True, (100, 255, 100))
+    layer.append((resume_text, resume_rect))
+
+    guide_text = render_text(font, f"Press [{guide_key}] for Game Guide", (100, 255, 100))
     guide_rect = guide_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 20))
-    screen.blit(guide_text, guide_rect)
+    layer.append((guide_text, guide_rect))
 
-    settings_text = font.render(f"Press [{settings_key}] for Settings", True, (100, 200, 255))
+    settings_text = render_text(font, f"Press [{settings_key}] for Settings", (100, 200, 255))
     settings_rect = settings_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 60))
-    screen.blit(settings_text, settings_rect)
+    layer.append((settings_text, settings_rect))
+    return layer
 
 
 def draw_settings_popup(
@@ -389,10 +518,10 @@ def draw_settings_popup(
     pygame.draw.rect(popup_surface, (15, 20, 30, 245), (0, 0, popup_width, popup_height))
     pygame.draw.rect(popup_surface, (120, 180, 255, 220), (0, 0, popup_width, popup_height), 2)
 
-    title = font.render("SETTINGS", True, (255, 255, 120))
+    title = render_text(font, "SETTINGS", (255, 255, 120))
     popup_surface.blit(title, (popup_width // 2 - title.get_width() // 2, 20))
 
-    hint = font.render("[1] Resolution  |  [2] Keybinds  |  ESC closes settings", True, (190, 190, 190))
+    hint = render_text(font, "[1] Resolution  |  [2] Keybinds  |  ESC closes settings", (190, 190, 190))
     popup_surface.blit(hint, (popup_width // 2 - hint.get_width() // 2, 52))
 
     tab_defs = [
@@ -409,7 +538,7 @@ def draw_settings_popup(
         border_color = (130, 210, 255) if is_active else (95, 120, 165)
         pygame.draw.rect(popup_surface, fill_color, tab_rect)
         pygame.draw.rect(popup_surface, border_color, tab_rect, 2)
-        tab_text = font.render(tab_label, True, (220, 240, 255) if is_active else (180, 190, 210))
+        tab_text = render_text(font, tab_label, (220, 240, 255) if is_active else (180, 190, 210))
         popup_surface.blit(tab_text, (tab_rect.x + 14, tab_rect.y + 8))
         tab_rects.append((pygame.Rect(popup_x + tab_rect.x, popup_y + tab_rect.y, tab_rect.width, tab_rect.height), tab_key))
         tab_x += 230
@@ -422,7 +551,7 @@ def draw_settings_popup(
 
     content_total_height = 0
     if settings_tab == 'resolution':
-        tab_hint = font.render("Click a resolution option to apply", True, (185, 210, 235))
+        tab_hint = render_text(font, "Click a resolution option to apply", (185, 210, 235))
         popup_surface.blit(tab_hint, (popup_width // 2 - tab_hint.get_width() // 2, 132))
 
         row_height = 38
@@ -438,7 +567,7 @@ def draw_settings_popup(
             label = f"{idx + 1}. {res[0]} x {res[1]}"
             is_current = tuple(current_resolution) == tuple(res)
             text_color = (120, 255, 120) if is_current else (230, 230, 230)
-            text = font.render(label, True, text_color)
+            text = render_text(font, label, text_color)
 
             row_rect = pygame.Rect(60, y - 4 - scroll_offset, popup_width - 120, row_height)
             border = (80, 220, 120) if is_current else (90, 120, 170)
@@ -466,13 +595,14 @@ def draw_settings_popup(
             ('upgrade_path2', 'Upgrade Path 2'),
             ('sell_structure', 'Sell Structure'),
             ('cycle_speed', 'Cycle Game Speed'),
+            ('toggle_profiler', 'Toggle Profiler'),
         ]
 
         if waiting_action:
             waiting_name = next((label for action, label in action_rows if action == waiting_action), waiting_action)
-            tab_hint = font.render(f"Press a key for: {waiting_name} (ESC cancels)", True, (255, 220, 120))
+            tab_hint = render_text(font, f"Press a key for: {waiting_name} (ESC cancels)", (255, 220, 120))
         else:
-            tab_hint = font.render("Click action row to change keybind", True, (185, 210, 235))
+            tab_hint = render_text(font, "Click action row to change keybind", (185, 210, 235))
         popup_surface.blit(tab_hint, (popup_width // 2 - tab_hint.get_width() // 2, 132))
 
         row_height = 26
@@ -493,8 +623,8 @@ def draw_settings_popup(
             pygame.draw.rect(popup_surface, border, row_rect, 2)
 
             key_text_value = keybind_display.get(action, '-')
-            label_text = font.render(label, True, (230, 230, 230))
-            key_text = font.render(f"[{key_text_value}]", True, (120, 255, 120) if not is_waiting else (255, 220, 120))
+            label_text = render_text(font, label, (230, 230, 230))
+            key_text = render_text(font, f"[{key_text_value}]", (120, 255, 120) if not is_waiting else (255, 220, 120))
             popup_surface.blit(label_text, (row_rect.x + 10, row_rect.y + 4))
             popup_surface.blit(key_text, (row_rect.right - key_text.get_width() - 10, row_rect.y + 4))
 
@@ -524,21 +654,21 @@ def draw_settings_popup(
 def draw_victory(screen, font):
     screen.fill((0, 100, 0))
     
-    victory_text = font.render("VICTORY!", True, (0, 255, 0))
+    victory_text = render_text(font, "VICTORY!", (0, 255, 0))
     victory_rect = victory_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 80))
     screen.blit(victory_text, victory_rect)
     
-    play_again_text = font.render("Play Again", True, WHITE)
+    play_again_text = render_text(font, "Play Again", WHITE)
     play_again_rect = play_again_text.get_rect(center=(WIDTH // 2 - 180, HEIGHT // 2 + 50))
     pygame.draw.rect(screen, (0, 150, 0), play_again_rect.inflate(20, 10), 2)
     screen.blit(play_again_text, play_again_rect)
 
-    menu_text = font.render("Main Menu", True, WHITE)
+    menu_text = render_text(font, "Main Menu", WHITE)
     menu_rect = menu_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 50))
     pygame.draw.rect(screen, (120, 120, 160), menu_rect.inflate(20, 10), 2)
     screen.blit(menu_text, menu_rect)
     
-    exit_text = font.render("Exit", True, WHITE)
+    exit_text = render_text(font, "Exit", WHITE)
     exit_rect = exit_text.get_rect(center=(WIDTH // 2 + 180, HEIGHT // 2 + 50))
     pygame.draw.rect(screen, (150, 0, 0), exit_rect.inflate(20, 10), 2)
     screen.blit(exit_text, exit_rect)
@@ -558,7 +688,7 @@ def draw_guide(screen, font, page, scroll_offset=0):
     max_scroll = 0
 
     if page == 'menu':
-        title = font.render("GAME GUIDE", True, (255, 255, 100))
+        title = render_text(font, "GAME GUIDE", (255, 255, 100))
         guide_surf.blit(title, (guide_width // 2 - 50, 20))
 
         sections = [
@@ -573,7 +703,7 @@ def draw_guide(screen, font, page, scroll_offset=0):
 
         y_offset = 80
         for i, section in enumerate(sections):
-            text = font.render(section, True, (100, 255, 100))
+            text = render_text(font, section, (100, 255, 100))
             guide_surf.blit(text, (50, y_offset + i * 40))
     else:
         page_items = [
@@ -595,17 +725,17 @@ def draw_guide(screen, font, page, scroll_offset=0):
             'keybinds': "KEYBINDS",
             'modifiers': "MODIFIERS",
         }
-        title = font.render(page_titles.get(page, "GAME GUIDE"), True, (255, 255, 100))
+        title = render_text(font, page_titles.get(page, "GAME GUIDE"), (255, 255, 100))
         guide_surf.blit(title, (20, 40))
 
-        page_font = pygame.font.SysFont("arial", 11)
+        page_font = get_font("arial", 11)
         padding_x = 8
         item_height = 18
         spacing = 6
         current_x = 12
         bar_y = 10
         for key, label in page_items:
-            text_surf = page_font.render(label, True, WHITE)
+            text_surf = render_text(page_font, label, WHITE)
             item_width = text_surf.get_width() + padding_x * 2
             is_active = (page == key)
             if is_active:
@@ -619,13 +749,13 @@ def draw_guide(screen, font, page, scroll_offset=0):
 
             pygame.draw.rect(guide_surf, bg_color, (current_x, bar_y, item_width, item_height), border_radius=4)
             pygame.draw.rect(guide_surf, border_color, (current_x, bar_y, item_width, item_height), 1, border_radius=4)
-            label_surf = page_font.render(label, True, text_color)
+            label_surf = render_text(page_font, label, text_color)
             guide_surf.blit(label_surf, (current_x + padding_x, bar_y + 2))
             current_x += item_width + spacing
 
         content = []
         line_height = 26
-        content_font = pygame.font.SysFont("arial", 14)
+        content_font = get_font("arial", 14)
 
         if page == 'towers':
             content = [
@@ -756,6 +886,7 @@ def draw_guide(screen, font, page, scroll_offset=0):
                 "",
                 "GLOBAL CONTROLS:",
                 "  [C] Change game speed",
+                "  [F3] Toggle performance overlay",
                 "  [ESC] Pause / Resume",
                 "  [O] Open settings (while paused)",
                 "  (All keybinds can be remapped in Settings)",
@@ -830,7 +961,7 @@ def draw_guide(screen, font, page, scroll_offset=0):
                 else:
                     color = (255, 200, 100) if line.endswith(":") else WHITE
 
-                text = content_font.render(line, True, color)
+                text = render_text(content_font, line, color)
                 guide_surf.blit(text, (content_area.x, y_offset))
             y_offset += line_height
 
@@ -846,11 +977,11 @@ def draw_guide(screen, font, page, scroll_offset=0):
             thumb_rect = pygame.Rect(track_rect.x, thumb_y, track_rect.width, thumb_height)
             pygame.draw.rect(guide_surf, (150, 180, 255), thumb_rect, border_radius=2)
 
-    tiny_font = pygame.font.SysFont("arial", 12)
+    tiny_font = get_font("arial", 12)
     if page == 'menu':
-        nav_text = tiny_font.render("[1-7] Select  |  [BACKSPACE] Close  |  [ESC] Resume", True, (180, 180, 180))
+        nav_text = render_text(tiny_font, "[1-7] Select  |  [BACKSPACE] Close  |  [ESC] Resume", (180, 180, 180))
     else:
-        nav_text = tiny_font.render("[Wheel/UP/DOWN] Scroll  |  [BACKSPACE] Menu  |  [ESC] Resume", True, (180, 180, 180))
+        nav_text = render_text(tiny_font, "[Wheel/UP/DOWN] Scroll  |  [BACKSPACE] Menu  |  [ESC] Resume", (180, 180, 180))
     nav_rect = nav_text.get_rect(bottomright=(guide_width - 12, guide_height - 10))
     guide_surf.blit(nav_text, nav_rect)
 
@@ -872,34 +1003,56 @@ def draw_upgrade_ui(screen, font, selected_structure, money, refund_rate=0.70):
     if panel_y + panel_height > GAME_HEIGHT:
         panel_y = GAME_HEIGHT - panel_height
 
+    path1_level = getattr(selected_structure, 'path1_level', 0)
+    path2_level = getattr(selected_structure, 'path2_level', 0)
+    upgrades = []
+    for path_index in (1, 2):
+        upgrade_name, upgrade_cost = selected_structure.get_upgrade_info(path_index)
+        upgrades.append((upgrade_name, upgrade_cost, bool(upgrade_name) and money >= upgrade_cost))
+    targeting_mode = getattr(selected_structure, 'targeting_mode', None)
+    build_cost = getattr(selected_structure, 'build_cost', 0)
+    upgrade_spent = getattr(selected_structure, 'upgrade_spent', 0)
+    sell_value = int((build_cost + upgrade_spent) * max(0.0, float(refund_rate)))
+
+    key = (font, selected_structure.name, panel_height, path1_level, path2_level, tuple(upgrades), targeting_mode, sell_value)
+    panel_surface, mode_rects, sell_btn_rect = _retained('upgrade', key, lambda: _build_upgrade_panel(
+        font, selected_structure.name, panel_width, panel_height, path1_level, path2_level, upgrades, targeting_mode, sell_value
+    ))
+
+    screen.blit(panel_surface, (panel_x, panel_y))
+    return {
+        'targeting_modes': {
+            mode: pygame.Rect(panel_x + rect.x, panel_y + rect.y, rect.w, rect.h) for mode, rect in mode_rects.items()
+        },
+        'sell_rect': pygame.Rect(panel_x + sell_btn_rect.x, panel_y + sell_btn_rect.y, sell_btn_rect.w, sell_btn_rect.h),
+    }
+
+
+def _build_upgrade_panel(font, name, panel_width, panel_height, path1_level, path2_level, upgrades, targeting_mode, sell_value):
     panel_surface = pygame.Surface((panel_width, panel_height), pygame.SRCALPHA)
     pygame.draw.rect(panel_surface, (20, 20, 40, 230), (0, 0, panel_width, panel_height))
     pygame.draw.rect(panel_surface, (100, 150, 255, 255), (0, 0, panel_width, panel_height), 2)
 
-    name_text = font.render(selected_structure.name, True, (255, 255, 100))
+    name_text = render_text(font, name, (255, 255, 100))
     panel_surface.blit(name_text, (10, 10))
 
     y_offset = 40
 
     def draw_path(path_index, key_text, level):
         nonlocal y_offset
-        upgrade_name, upgrade_cost = selected_structure.get_upgrade_info(path_index)
+        upgrade_name, upgrade_cost, can_afford = upgrades[path_index - 1]
         if upgrade_name:
-            can_afford = money >= upgrade_cost
             color = (100, 255, 100) if can_afford else (150, 150, 150)
-            upgrade_text = font.render(f"[{key_text}] {upgrade_name} - ${upgrade_cost}", True, color)
+            upgrade_text = render_text(font, f"[{key_text}] {upgrade_name} - ${upgrade_cost}", color)
             panel_surface.blit(upgrade_text, (10, y_offset))
             if level > 0:
-                level_text = font.render(f"  Level: {level}/2", True, (200, 200, 200))
+                level_text = render_text(font, f"  Level: {level}/2", (200, 200, 200))
                 panel_surface.blit(level_text, (15, y_offset + 20))
             y_offset += 50
         elif level >= 2:
-            maxed_text = font.render(f"Path {path_index}: MAXED", True, (255, 215, 0))
+            maxed_text = render_text(font, f"Path {path_index}: MAXED", (255, 215, 0))
             panel_surface.blit(maxed_text, (10, y_offset))
 
-    path1_level = getattr(selected_structure, 'path1_level', 0)
-    path2_level = getattr(selected_structure, 'path2_level', 0)
-
     if path1_level > 0:
         draw_path(1, 'Q', path1_level)
     elif path2_level > 0:
@@ -909,7 +1062,7 @@ def draw_upgrade_ui(screen, font, selected_structure, money, refund_rate=0.70):
         draw_path(2, 'E', path2_level)
 
     targeting_mode_rects = {}
-    if hasattr(selected_structure, 'targeting_mode'):
+    if targeting_mode is not None:
         label_map = {
             'first': 'First',
             'last': 'Last',
@@ -918,7 +1071,7 @@ def draw_upgrade_ui(screen, font, selected_structure, money, refund_rate=0.70):
             'closest_goal': 'Goal',
         }
         modes = ['first', 'last', 'strongest', 'weakest', 'closest_goal']
-        title = font.render('Targeting:', True, (180, 220, 255))
+        title = render_text(font, 'Targeting:', (180, 220, 255))
         panel_surface.blit(title, (10, 150))
 
         btn_y = 172
@@ -928,28 +1081,20 @@ def draw_upgrade_ui(screen, font, selected_structure, money, refund_rate=0.70):
         for idx, mode in enumerate(modes):
             x = 10 + idx * (btn_w + spacing)
             rect = pygame.Rect(x, btn_y, btn_w, btn_h)
-            is_active = selected_structure.targeting_mode == mode
+            is_active = targeting_mode == mode
             bg = (90, 150, 240) if is_active else (50, 60, 90)
             border = (180, 220, 255) if is_active else (120, 130, 160)
             pygame.draw.rect(panel_surface, bg, rect, border_radius=4)
             pygame.draw.rect(panel_surface, border, rect, 1, border_radius=4)
 
-            label = font.render(label_map[mode], True, (255, 255, 255))
+            label = render_text(font, label_map[mode], (255, 255, 255))
             label_rect = label.get_rect(center=rect.center)
             panel_surface.blit(label, label_rect)
-            targeting_mode_rects[mode] = pygame.Rect(panel_x + rect.x, panel_y + rect.y, rect.w, rect.h)
+            targeting_mode_rects[mode] = rect
 
-    build_cost = getattr(selected_structure, 'build_cost', 0)
-    upgrade_spent = getattr(selected_structure, 'upgrade_spent', 0)
-    sell_value = int((build_cost + upgrade_spent) * max(0.0, float(refund_rate)))
     sell_btn_rect = pygame.Rect(10, panel_height - 34, panel_width - 20, 24)
     pygame.draw.rect(panel_surface, (70, 120, 80), sell_btn_rect, border_radius=4)
     pygame.draw.rect(panel_surface, (120, 190, 130), sell_btn_rect, 1, border_radius=4)
-    sell_text = font.render(f"Sell: ${sell_value}", True, (255, 255, 255))
+    sell_text = render_text(font, f"Sell: ${sell_value}", (255, 255, 255))
     panel_surface.blit(sell_text, sell_text.get_rect(center=sell_btn_rect.center))
-    
-    screen.blit(panel_surface, (panel_x, panel_y))
-    return {
-        'targeting_modes': targeting_mode_rects,
-        'sell_rect': pygame.Rect(panel_x + sell_btn_rect.x, panel_y + sell_btn_rect.y, sell_btn_rect.w, sell_btn_rect.h),
-    }
\ No newline at end of file
+    return panel_surface, targeting_mode_rects, sell_btn_rect
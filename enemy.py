@@ -3,12 +3,14 @@ import random
 import math
 from constants import TILE, ENEMY_STATS, FPS
 from colors import ENEMY_COLORS
-from pathfinding import astar
+from pathfinding import build_flow_field, field_distance, flow_path, update_flow_field
 from status_effects import StatusEffect
 try:
     from assets import get as get_asset
+    from assets import warm as warm_assets
 except Exception:
     get_asset = None
+    warm_assets = None
 
 ENEMY_SIZE_SCALE = {
     'tank': 6,
@@ -21,9 +23,12 @@ ENEMY_SIZE_SCALE = {
     'demon_boss': 12,
 }
 
-_PATH_CACHE = {}
-_PATH_CACHE_VERSION = 0
+_FLOW_FIELDS = {}
+_STATUS_LAYERS = {}
+SLOW_LAYER_LEVELS = 10
 NON_BOSS_SIZE_MULTIPLIER = 1.25
+DEMON_MINION_SCALE = 0.9
+ALWAYS_PREPARE_TYPES = ('healer', 'minotaur_boss', 'demon_boss')
 ENEMY_TYPE_SIZE_MULTIPLIER = {
     'swarm': 1.8,
     'assassin': 1.2,
@@ -32,14 +37,112 @@ ENEMY_TYPE_SIZE_MULTIPLIER = {
 }
 
 
-def invalidate_path_cache():
-    global _PATH_CACHE_VERSION
-    _PATH_CACHE_VERSION += 1
-    _PATH_CACHE.clear()
+def invalidate_path_cache(carved_tiles=None):
+    if carved_tiles is None:
+        _FLOW_FIELDS.clear()
+        return
+    for entry in _FLOW_FIELDS.values():
+        update_flow_field(entry['dist'], entry['grid'], carved_tiles)
+
+
+def get_flow_field(grid, goal):
+    key = (id(grid), tuple(goal))
+    entry = _FLOW_FIELDS.get(key)
+    if entry is None or entry['grid'] is not grid:
+        entry = {'grid': grid, 'dist': build_flow_field(grid, goal)}
+        _FLOW_FIELDS[key] = entry
+    return entry['dist']
+
+
+def compute_enemy_size(enemy_type, scale=1.0):
+    stats = ENEMY_STATS[enemy_type]
+    base_size = stats.get('size', ENEMY_SIZE_SCALE.get(enemy_type, 6))
+    scale_factor = 1.0 if scale <= 1.0 else (1.0 + (scale - 1.0) * 0.5)
+    size_multiplier = 1.0 if enemy_type in ('minotaur_boss', 'demon_boss') else NON_BOSS_SIZE_MULTIPLIER
+    type_size_multiplier = ENEMY_TYPE_SIZE_MULTIPLIER.get(enemy_type, 1.0)
+    return base_size * 0.9 * scale_factor * size_multiplier * type_size_multiplier
+
+
+def enemy_sprite_size(size):
+    return int(size * 1.6)
+
+
+def _frozen_layer(size):
+    key = ('frozen', size)
+    layer = _STATUS_LAYERS.get(key)
+    if layer is None:
+        tint_size = int(size * 2.4)
+        radius = max(size + 3, tint_size // 2 + 1)
+        layer = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+        pygame.draw.circle(layer, (100, 200, 255), (radius, radius), size + 3, 3)
+        tint = pygame.Surface((tint_size, tint_size), pygame.SRCALPHA)
+        pygame.draw.circle(tint, (120, 210, 255, 80), (tint_size // 2, tint_size // 2), int(size * 1.1))
+        layer.blit(tint, (radius - tint_size // 2, radius - tint_size // 2))
+        crack = size
+        pygame.draw.line(layer, (220, 245, 255), (radius - crack, radius), (radius + crack, radius), 1)
+        pygame.draw.line(layer, (220, 245, 255), (radius, radius - crack), (radius, radius + crack), 1)
+        pygame.draw.line(layer, (180, 230, 255), (radius - crack // 2, radius - crack // 2), (radius + crack // 2, radius + crack // 2), 1)
+        _STATUS_LAYERS[key] = layer
+    return layer
+
+
+def _slow_layer(size, level):
+    key = ('slow', size, level)
+    layer = _STATUS_LAYERS.get(key)
+    if layer is None:
+        width = max(1, int(level / 5))
+        orbit = (size + 4) * 0.8
+        radius = max(size + width, int(orbit) + 2)
+        layer = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA)
+        pygame.draw.circle(layer, (100, int(100 + (level / 10) * 70), 255), (radius, radius), size + width, width)
+        particle_count = min(6, level // 2 + 1)
+        for idx in range(particle_count):
+            angle = (idx / particle_count) * 6.283
+            center = (radius + int(orbit * math.cos(angle)), radius + int(orbit * math.sin(angle)))
+            pygame.draw.circle(layer, (140, 220, 255), center, 2)
+        _STATUS_LAYERS[key] = layer
+    return layer
+
+
+def _shield_layer(width, height):
+    key = ('shield', width, height)
+    layer = _STATUS_LAYERS.get(key)
+    if layer is None:
+        layer = pygame.Surface((width, height), pygame.SRCALPHA)
+        layer.fill((255, 230, 80, 160))
+        _STATUS_LAYERS[key] = layer
+    return layer
+
+
+def warm_enemy_sprites(scales):
+    if not warm_assets:
+        return
+    requests = set()
+    for scale in scales:
+        for enemy_type in ENEMY_STATS:
+            requests.add((f"enemy_{enemy_type}", enemy_sprite_size(compute_enemy_size(enemy_type, scale))))
+    warm_assets(sorted(requests))
+
 
 class Enemy:
-    def __init__(self, grid, spawn, goal, enemy_type, scale=1.0):
+    __slots__ = (
+        'grid', 'rng', 'type', 'max_hp', 'hp', 'base_speed', 'speed',
+        'base_resist_phys', 'base_resist_magic', 'resist_phys', 'resist_magic',
+        'size', 'color', 'reward', 'spawn_tile', 'lane_id', 'pos', 'tile', 'spatial_key', 'spatial_order',
+        'goal', 'path', 'path_idx', 'dodge_chance', 'dodge_streak',
+        'healer_chain_timer', 'healer_chain_interval', 'healer_chain_amount',
+        'fighter_shield_used', 'shield_hp', 'mage_blocks_left', 'assassin_emergency_used',
+        'tank_bulwark_active', 'minotaur_phase2', 'minotaur_stun_cooldown',
+        'demon_phase1_done', 'demon_phase2_done', 'demon_phase3_done',
+        'slow_stacks', 'slow_decay_rate', 'frozen_time', 'freeze_immunity_timer',
+        'burning', 'burn_dps', 'bleed_dps', 'target_x', 'target_y', 'batch_dirty',
+        'status_effects', 'impaled_time', 'is_boss', 'freeze_resist',
+        'burn_dot_multiplier', 'damage_taken_mult',
+    )
+
+    def __init__(self, grid, spawn, goal, enemy_type, scale=1.0, rng=None):
         self.grid = grid
+        self.rng = rng if rng is not None else random
         self.type = enemy_type
         stats = ENEMY_STATS[enemy_type]
         self.max_hp = int(stats['max_hp'] * scale)
@@ -50,17 +153,16 @@ class Enemy:
         self.base_resist_magic = stats.get('resist_magic', 0)
         self.resist_phys = self.base_resist_phys
         self.resist_magic = self.base_resist_magic
-        base_size = stats.get('size', ENEMY_SIZE_SCALE.get(enemy_type, 6))
-        scale_factor = 1.0 if scale <= 1.0 else (1.0 + (scale - 1.0) * 0.5)
-        size_multiplier = 1.0 if enemy_type in ('minotaur_boss', 'demon_boss') else NON_BOSS_SIZE_MULTIPLIER
-        type_size_multiplier = ENEMY_TYPE_SIZE_MULTIPLIER.get(enemy_type, 1.0)
-        self.size = base_size * 0.9 * scale_factor * size_multiplier * type_size_multiplier
+        self.size = compute_enemy_size(enemy_type, scale)
         self.color = ENEMY_COLORS[enemy_type]
         self.reward = stats['reward']
         self.reward = int(self.reward * scale)
         self.spawn_tile = spawn
         self.lane_id = spawn
         self.pos = pygame.Vector2(spawn[0] * TILE + TILE // 2, spawn[1] * TILE + TILE // 2)
+        self.tile = tuple(spawn)
+        self.spatial_key = None
+        self.spatial_order = 0
         self.goal = goal
         self.path = []
         self.path_idx = 0
@@ -84,15 +186,22 @@ class Enemy:
         self.frozen_time = 0.0
         self.freeze_immunity_timer = 0.0
         self.burning = False
+        self.burn_dps = 0.0
+        self.bleed_dps = 0.0
+        self.target_x = 0
+        self.target_y = 0
+        self.batch_dirty = True
         self.status_effects = {}
         self.impaled_time = 0.0
         self.is_boss = enemy_type in ('minotaur_boss', 'demon_boss')
         self.freeze_resist = 0.0
         self.burn_dot_multiplier = 1.0
+        self.damage_taken_mult = 1.0
         
         self.repath()
 
     def _set_status(self, effect_type, duration, strength=0.0, stack_strength=True):
+        self.batch_dirty = True
         existing = self.status_effects.get(effect_type)
         if existing and existing.active:
             existing.duration = max(existing.duration, duration)
@@ -112,7 +221,7 @@ class Enemy:
         effect = self.status_effects.get(effect_type)
         return bool(effect and effect.active)
 
-    def _update_status_effects(self, dt):
+    def _update_status_effects(self, dt, apply_dot=True):
         for effect in list(self.status_effects.values()):
             effect.tick(dt)
             if effect.type == 'slow' and effect.strength > 0:
@@ -137,20 +246,23 @@ class Enemy:
 
         if self.burning:
             burn_mult = max(0.0, float(getattr(self, 'burn_dot_multiplier', 1.0)))
-            self.take_damage(3.5 * burn_mult * dt, 'magic', source='trap')
+            self.burn_dps = 3.5 * burn_mult
+        else:
+            self.burn_dps = 0.0
+        self.bleed_dps = 5.0 + (bleed.strength * 0.5) if bleeding else 0.0
+
+        if apply_dot:
+            self.apply_dot(dt)
 
-        if bleeding:
-            bleed_dps = 5.0 + (bleed.strength * 0.5)
-            self.take_damage(bleed_dps * dt, 'physical', source='trap')
+    def apply_dot(self, dt):
+        if self.burning:
+            self.take_damage(self.burn_dps * dt, 'magic', source='trap')
+        if self.bleed_dps:
+            self.take_damage(self.bleed_dps * dt, 'physical', source='trap')
 
     def repath(self):
-        start = self.grid_pos()
-        cache_key = (_PATH_CACHE_VERSION, id(self.grid), start, self.goal)
-        cached = _PATH_CACHE.get(cache_key)
-        if cached is None:
-            cached = astar(self.grid, start, self.goal)
-            _PATH_CACHE[cache_key] = list(cached)
-        self.path = list(cached)
+        self.batch_dirty = True
+        self.path = flow_path(get_flow_field(self.grid, self.goal), self.grid_pos())
         if self.path and len(self.path) > 1:
             self.path = self.path[1:]
         self.path_idx = 0
@@ -158,12 +270,43 @@ class Enemy:
     def grid_pos(self):
         return (int(self.pos.x // TILE), int(self.pos.y // TILE))
 
+    def goal_distance(self):
+        tile = self.tile
+        distance = field_distance(get_flow_field(self.grid, self.goal), tile)
+        if distance < 0:
+            return abs(tile[0] - self.goal[0]) + abs(tile[1] - self.goal[1])
+        return distance
+
     def logic(self, enemies, dt, towers=None, spawn_points=None, goal_grid=None):
+        if not self.prepare_move(enemies, dt, towers, spawn_points, goal_grid):
+            return
+
+        target = pygame.Vector2(self.target_x, self.target_y)
+        diff = target - self.pos
+        distance = diff.length()
+
+        if distance < self.speed * 1.5:
+            self.path_idx += 1
+            return
+
+        direction = diff.normalize()
+        slow_multiplier = max(0.1, 1.0 - (self.slow_stacks * 0.08))
+        step = self.speed * slow_multiplier * dt * FPS
+        self.pos += direction * step
+
+        self.after_move(enemies, dt)
+
+    def prepare_move(self, enemies, dt, towers=None, spawn_points=None, goal_grid=None, apply_dot=True):
+        self.prepare_status(dt, apply_dot)
+        return self.prepare_behaviors(enemies, dt, towers, spawn_points, goal_grid)
+
+    def prepare_status(self, dt, apply_dot=True):
         if self.freeze_immunity_timer > 0:
             self.freeze_immunity_timer = max(0.0, self.freeze_immunity_timer - dt)
 
-        self._update_status_effects(dt)
+        self._update_status_effects(dt, apply_dot)
 
+    def prepare_behaviors(self, enemies, dt, towers=None, spawn_points=None, goal_grid=None):
         self._apply_health_behaviors(enemies)
         self._apply_boss_behaviors(enemies, towers or [], spawn_points or [], goal_grid or self.goal, dt)
 
@@ -176,16 +319,16 @@ class Enemy:
             self.impaled_time = 0.0
 
         if self.impaled_time > 0 and not movement_impairment_immune:
-            return
+            return False
         
         if not self.path or self.path_idx >= len(self.path):
             self.repath()
             if not self.path:
                 self.hp = 0
-                return
+                return False
 
         if self.has_status('frozen') and not movement_impairment_immune:
-            return
+            return False
 
         if self.slow_stacks >= 10 and self.freeze_immunity_timer <= 0 and not movement_impairment_immune:
             base_duration = 1.5
@@ -196,25 +339,17 @@ class Enemy:
             if 'slow' in self.status_effects:
                 del self.status_effects['slow']
             self.slow_stacks = 0.0
-            return
-
-        target = pygame.Vector2(
-            self.path[self.path_idx][0] * TILE + TILE // 2,
-            self.path[self.path_idx][1] * TILE + TILE // 2
-        )
-
-        diff = target - self.pos
-        distance = diff.length()
+            return False
 
-        if distance < self.speed * 1.5:
-            self.path_idx += 1
-            return
+        node = self.path[self.path_idx]
+        self.target_x = node[0] * TILE + TILE // 2
+        self.target_y = node[1] * TILE + TILE // 2
+        return True
 
-        direction = diff.normalize()
-        slow_multiplier = max(0.1, 1.0 - (self.slow_stacks * 0.08))
-        step = self.speed * slow_multiplier * dt * FPS
-        self.pos += direction * step
+    def needs_prepare(self):
+        return bool(self.status_effects) or self.freeze_immunity_timer > 0 or self.type in ALWAYS_PREPARE_TYPES
 
+    def after_move(self, enemies, dt):
         if self.type == 'healer':
             self.healer_chain_timer += dt
             if self.healer_chain_timer >= self.healer_chain_interval:
@@ -222,11 +357,12 @@ class Enemy:
                 self._chain_heal_lane(enemies)
 
     def take_damage(self, incoming_dmg, dmg_type, source='generic', resist_override=None):
+        self.batch_dirty = True
         if self.type == 'mage' and source == 'projectile' and self.mage_blocks_left > 0:
             self.mage_blocks_left -= 1
             return False
 
-        if self.type == 'assassin' and random.random() < self.dodge_chance:
+        if self.type == 'assassin' and self.rng.random() < self.dodge_chance:
             self.dodge_streak += 1
             self.dodge_chance = max(0.05, self.dodge_chance - 0.02)
             return False
@@ -284,8 +420,7 @@ class Enemy:
             if self.minotaur_stun_cooldown <= 0 and towers:
                 nearest_tower = min(towers, key=lambda t: self.pos.distance_to(t.pos))
                 if self.pos.distance_to(nearest_tower.pos) <= 170:
-                    current_stun = getattr(nearest_tower, 'stun_timer', 0.0)
-                    nearest_tower.stun_timer = max(current_stun, 2.5)
+                    nearest_tower.stun(2.5)
                 self.minotaur_stun_cooldown = 3.5
 
         if self.type != 'demon_boss':
@@ -313,7 +448,7 @@ class Enemy:
             ally.hp = min(ally.max_hp, ally.hp + self.healer_chain_amount)
 
     def _swap_lane_towers(self, towers, spawn_points):
-        lane_a, lane_b = random.sample(spawn_points, 2)
+        lane_a, lane_b = self.rng.sample(spawn_points, 2)
 
         def lane_center(tile):
             return pygame.Vector2(tile[0] * TILE + TILE // 2, tile[1] * TILE + TILE // 2)
@@ -345,13 +480,15 @@ class Enemy:
                 tower_a.grid_pos = (int(tower_a.pos.x // TILE), int(tower_a.pos.y // TILE))
             if hasattr(tower_b, 'grid_pos'):
                 tower_b.grid_pos = (int(tower_b.pos.x // TILE), int(tower_b.pos.y // TILE))
+            tower_a.notify_changed()
+            tower_b.notify_changed()
         return True
 
     def _spawn_demon_minions(self, enemies):
         minion_types = ['fighter', 'fighter', 'assassin', 'mage']
         summon_tile = self.grid_pos()
         for minion_type in minion_types:
-            minion = Enemy(self.grid, summon_tile, self.goal, minion_type, scale=0.9)
+            minion = Enemy(self.grid, summon_tile, self.goal, minion_type, scale=DEMON_MINION_SCALE, rng=self.rng)
             minion.lane_id = self.lane_id
             enemies.append(minion)
 
@@ -373,7 +510,7 @@ class Enemy:
         if not candidates:
             return False
 
-        teleport_idx, teleport_tile = random.choice(candidates[-max(1, len(candidates) // 2):])
+        teleport_idx, teleport_tile = self.rng.choice(candidates[-max(1, len(candidates) // 2):])
         self.pos = pygame.Vector2(teleport_tile[0] * TILE + TILE // 2, teleport_tile[1] * TILE + TILE // 2)
         self.path_idx = teleport_idx
         return True
@@ -405,7 +542,7 @@ class Enemy:
     def draw(self, screen):
         sprite = None
         if get_asset:
-            sprite = get_asset(f"enemy_{self.type}", size=int(self.size * 1.6))
+            sprite = get_asset(f"enemy_{self.type}", size=enemy_sprite_size(self.size))
         if sprite:
             rect = sprite.get_rect(center=(int(self.pos.x), int(self.pos.y)))
             screen.blit(sprite, rect.topleft)
@@ -415,30 +552,14 @@ class Enemy:
         is_frozen = self.has_status('frozen')
 
         if is_frozen or self.slow_stacks >= 10:
-            outline_color = (100, 200, 255)
-            outline_width = 3
-            pygame.draw.circle(screen, outline_color, (int(self.pos.x), int(self.pos.y)), int(self.size) + outline_width, outline_width)
-            tint = pygame.Surface((int(self.size * 2.4), int(self.size * 2.4)), pygame.SRCALPHA)
-            pygame.draw.circle(tint, (120, 210, 255, 80), (tint.get_width() // 2, tint.get_height() // 2), int(self.size * 1.1))
-            screen.blit(tint, (self.pos.x - tint.get_width() / 2, self.pos.y - tint.get_height() / 2))
-
-            crack_len = int(self.size)
-            center = (int(self.pos.x), int(self.pos.y))
-            pygame.draw.line(screen, (220, 245, 255), (center[0] - crack_len, center[1]), (center[0] + crack_len, center[1]), 1)
-            pygame.draw.line(screen, (220, 245, 255), (center[0], center[1] - crack_len), (center[0], center[1] + crack_len), 1)
-            pygame.draw.line(screen, (180, 230, 255), (center[0] - crack_len // 2, center[1] - crack_len // 2), (center[0] + crack_len // 2, center[1] + crack_len // 2), 1)
+            layer = _frozen_layer(int(self.size))
         elif self.slow_stacks > 0:
-            slow_intensity = int(100 + (self.slow_stacks / 10) * 70)
-            outline_color = (100, slow_intensity, 255)
-            outline_width = max(1, int(self.slow_stacks / 5))
-            pygame.draw.circle(screen, outline_color, (int(self.pos.x), int(self.pos.y)), int(self.size) + outline_width, outline_width)
-
-            particle_count = min(6, int(self.slow_stacks // 2) + 1)
-            for idx in range(particle_count):
-                angle = (idx / max(1, particle_count)) * 6.283
-                offset_x = int((self.size + 4) * 0.8 * math.cos(angle))
-                offset_y = int((self.size + 4) * 0.8 * math.sin(angle))
-                pygame.draw.circle(screen, (140, 220, 255), (int(self.pos.x) + offset_x, int(self.pos.y) + offset_y), 2)
+            layer = _slow_layer(int(self.size), min(SLOW_LAYER_LEVELS - 1, int(self.slow_stacks)))
+        else:
+            layer = None
+        if layer is not None:
+            half = layer.get_width() // 2
+            screen.blit(layer, (int(self.pos.x) - half, int(self.pos.y) - half))
 
         bar_w, bar_h = 12, 2
         fill_w = max(0, (self.hp / self.max_hp) * bar_w)
@@ -452,9 +573,7 @@ class Enemy:
             max_shield_hp = max(1.0, self.max_hp * 0.30)
             shield_ratio = max(0.0, min(1.0, self.shield_hp / max_shield_hp))
             shield_w = max(1, int(bar_w * shield_ratio))
-            shield_overlay = pygame.Surface((shield_w, bar_h), pygame.SRCALPHA)
-            shield_overlay.fill((255, 230, 80, 160))
-            screen.blit(shield_overlay, (bar_x, bar_y))
+            screen.blit(_shield_layer(shield_w, bar_h), (bar_x, bar_y))
 
         if self.slow_stacks > 0 or is_frozen:
             meter_w, meter_h = 12, 2
@@ -0,0 +1,150 @@
+from constants import FPS, TILE
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MOVE_COLUMNS = ('x', 'y', 'target_x', 'target_y', 'speed', 'slow', 'moving')
+DOT_COLUMNS = ('hp', 'shield', 'resist_phys', 'resist_magic', 'damage_mult', 'burn_dps', 'bleed_dps')
+PYTHON_DOT_TYPES = ('assassin',)
+MIN_BATCH_SIZE = 32
+
+
+def store_available():
+    return np is not None
+
+
+class _Columns:
+    def __init__(self, names, capacity):
+        self.index = {name: idx for idx, name in enumerate(names)}
+        self.capacity = capacity
+        self.data = np.zeros((len(names), capacity))
+        self.count = 0
+
+    def load(self, rows):
+        count = len(rows)
+        if count > self.capacity:
+            while self.capacity < count:
+                self.capacity *= 2
+            self.data = np.zeros((len(self.index), self.capacity))
+        self.count = count
+        if count:
+            self.data[:, :count] = np.array(rows, dtype=float).T
+
+    def __getitem__(self, name):
+        return self.data[self.index[name], :self.count]
+
+
+class EnemyStore:
+    def __init__(self, capacity=256, min_batch=MIN_BATCH_SIZE):
+        if np is None:
+            raise RuntimeError("EnemyStore needs numpy")
+        self.movement = _Columns(MOVE_COLUMNS, max(1, int(capacity)))
+        self.dot = _Columns(DOT_COLUMNS, 32)
+        self.min_batch = min_batch
+        self.prepared = 0
+
+    def update(self, enemies, dt, towers=None, spawn_points=None, goal_grid=None):
+        if len(enemies) < self.min_batch or self._heal_due(enemies, dt):
+            for enemy in enemies:
+                enemy.logic(enemies, dt, towers=towers, spawn_points=spawn_points, goal_grid=goal_grid)
+                enemy.batch_dirty = True
+            self.prepared = len(enemies)
+            return
+
+        dirty = [enemy.batch_dirty for enemy in enemies]
+        dot_rows = []
+        dotted = []
+        for enemy, was_dirty in zip(enemies, dirty):
+            if not was_dirty or enemy.type in PYTHON_DOT_TYPES:
+                continue
+            enemy.prepare_status(dt, apply_dot=False)
+            if enemy.burning or enemy.bleed_dps:
+                dotted.append(enemy)
+                dot_rows.append((
+                    enemy.hp, enemy.shield_hp, enemy.resist_phys, enemy.resist_magic,
+                    getattr(enemy, 'damage_taken_mult', 1.0),
+                    enemy.burn_dps if enemy.burning else 0.0, enemy.bleed_dps,
+                ))
+
+        if dotted:
+            self.dot.load(dot_rows)
+            self._apply_dot(dt)
+            for enemy, hp, shield in zip(dotted, self.dot['hp'].tolist(), self.dot['shield'].tolist()):
+                enemy.hp = hp
+                enemy.shield_hp = shield
+
+        move_rows = []
+        prepared = 0
+        statused = len(dirty)
+        for idx, enemy in enumerate(enemies):
+            if idx < statused and dirty[idx] and enemy.type not in PYTHON_DOT_TYPES:
+                prepare = enemy.prepare_behaviors
+            elif enemy.batch_dirty:
+                prepare = enemy.prepare_move
+            else:
+                prepare = None
+            moving = True
+            if prepare is not None:
+                prepared += 1
+                moving = prepare(enemies, dt, towers, spawn_points, goal_grid)
+                enemy.batch_dirty = not moving or enemy.needs_prepare()
+            move_rows.append((enemy.pos.x, enemy.pos.y, enemy.target_x, enemy.target_y, enemy.speed, enemy.slow_stacks, moving))
+        self.prepared = prepared
+
+        self.movement.load(move_rows)
+        advanced, stepped = self._move(dt)
+        self._write_back(enemies, advanced, stepped, dt)
+
+    def _heal_due(self, enemies, dt):
+        return any(
+            enemy.type == 'healer' and enemy.healer_chain_timer + dt >= enemy.healer_chain_interval
+            for enemy in enemies
+        )
+
+    def _apply_dot(self, dt):
+        cols = self.dot
+        hp, shield, mult = cols['hp'], cols['shield'], cols['damage_mult']
+        for dps_name, resist_name in (('burn_dps', 'resist_magic'), ('bleed_dps', 'resist_phys')):
+            dps = cols[dps_name]
+            damage = np.where(dps > 0, np.maximum(0.0, dps * dt * (1 - cols[resist_name])) * mult, 0.0)
+            absorbed = np.minimum(np.maximum(shield, 0.0), damage)
+            shield -= absorbed
+            hp -= damage - absorbed
+
+    def _move(self, dt):
+        cols = self.movement
+        x, y, speed = cols['x'], cols['y'], cols['speed']
+        moving = cols['moving'] > 0
+        dx = cols['target_x'] - x
+        dy = cols['target_y'] - y
+        distance = np.sqrt(dx * dx + dy * dy)
+        advanced = moving & (distance < speed * 1.5)
+        stepped = moving & ~advanced
+
+        slow_multiplier = np.maximum(0.1, 1.0 - (cols['slow'] * 0.08))
+        step = speed * slow_multiplier * dt * FPS
+        safe_distance = np.where(stepped, distance, 1.0)
+        x += np.where(stepped, dx / safe_distance * step, 0.0)
+        y += np.where(stepped, dy / safe_distance * step, 0.0)
+        return advanced, stepped
+
+    def _write_back(self, enemies, advanced, stepped, dt):
+        cols = self.movement
+        healers = []
+        for enemy, x, y, advance, moved in zip(enemies, cols['x'].tolist(), cols['y'].tolist(), advanced.tolist(), stepped.tolist()):
+            if moved:
+                enemy.pos.update(x, y)
+                if enemy.type == 'healer':
+                    healers.append(enemy)
+            elif advance:
+                enemy.path_idx += 1
+                if enemy.path_idx < len(enemy.path):
+                    node = enemy.path[enemy.path_idx]
+                    enemy.target_x = node[0] * TILE + TILE // 2
+                    enemy.target_y = node[1] * TILE + TILE // 2
+                else:
+                    enemy.batch_dirty = True
+        for healer in healers:
+            healer.after_move(enemies, dt)
@@ -0,0 +1,21 @@
+class EntityList(list):
+    __slots__ = ('_dead',)
+
+    def __init__(self, iterable=()):
+        super().__init__(iterable)
+        self._dead = set()
+
+    def mark_dead(self, entity):
+        self._dead.add(id(entity))
+
+    def is_marked(self, entity):
+        return id(entity) in self._dead
+
+    def compact(self):
+        dead = self._dead
+        if not dead:
+            return 0
+        count = len(self)
+        self[:] = [entity for entity in self if id(entity) not in dead]
+        dead.clear()
+        return count - len(self)
@@ -13,6 +13,9 @@ RESOLUTION_OPTIONS = [
     (1920, 1080),
 ]
 
+SCALE_MODES = ('smooth', 'fast', 'integer')
+DEFAULT_SCALE_MODE = 'smooth'
+
 DEFAULT_KEYBINDS = {
     'pause': 'escape',
     'open_guide': 'h',
@@ -27,6 +30,7 @@ DEFAULT_KEYBINDS = {
     'upgrade_path2': 'e',
     'sell_structure': 'r',
     'cycle_speed': 'c',
+    'toggle_profiler': 'f3',
 }
 
 
@@ -41,6 +45,10 @@ def _sanitize_resolution(value):
         return DEFAULT_RESOLUTION
 
 
+def _sanitize_scale_mode(value):
+    return value if value in SCALE_MODES else DEFAULT_SCALE_MODE
+
+
 def _sanitize_keybinds(value):
     if not isinstance(value, dict):
         return dict(DEFAULT_KEYBINDS)
@@ -55,23 +63,26 @@ def _sanitize_keybinds(value):
 
 def load_settings():
     if not SETTINGS_PATH.exists():
-        return {'resolution': list(DEFAULT_RESOLUTION), 'keybinds': dict(DEFAULT_KEYBINDS)}
+        return {'resolution': list(DEFAULT_RESOLUTION), 'keybinds': dict(DEFAULT_KEYBINDS), 'scale_mode': DEFAULT_SCALE_MODE}
 
     try:
         data = json.loads(SETTINGS_PATH.read_text(encoding='utf-8'))
     except Exception:
-        return {'resolution': list(DEFAULT_RESOLUTION), 'keybinds': dict(DEFAULT_KEYBINDS)}
+        return {'resolution': list(DEFAULT_RESOLUTION), 'keybinds': dict(DEFAULT_KEYBINDS), 'scale_mode': DEFAULT_SCALE_MODE}
 
     resolution = _sanitize_resolution(data.get('resolution', DEFAULT_RESOLUTION))
     keybinds = _sanitize_keybinds(data.get('keybinds', DEFAULT_KEYBINDS))
-    return {'resolution': list(resolution), 'keybinds': keybinds}
+    scale_mode = _sanitize_scale_mode(data.get('scale_mode', DEFAULT_SCALE_MODE))
+    return {'resolution': list(resolution), 'keybinds': keybinds, 'scale_mode': scale_mode}
 
 
 def save_settings(settings):
     resolution = _sanitize_resolution(settings.get('resolution', DEFAULT_RESOLUTION))
     keybinds = _sanitize_keybinds(settings.get('keybinds', DEFAULT_KEYBINDS))
+    scale_mode = _sanitize_scale_mode(settings.get('scale_mode', DEFAULT_SCALE_MODE))
     payload = {
         'resolution': [resolution[0], resolution[1]],
         'keybinds': keybinds,
+        'scale_mode': scale_mode,
     }
     SETTINGS_PATH.write_text(json.dumps(payload, indent=2), encoding='utf-8')
@@ -1,11 +1,12 @@
-import math
+import argparse
 import random
 import sys
 
 import pygame
 
+from assets import get_font, render_text
 from colors import DARK_GRAY
-from constants import FPS, GRID_H, GRID_W, HEIGHT, TILE, TOWER_COSTS, TRAP_COSTS, WIDTH
+from constants import FPS, GAME_HEIGHT, HEIGHT, TILE, TOWER_COSTS, TRAP_COSTS, WIDTH
 from drawing import (
     draw_boss_spawn_popup,
     draw_end_progress_bar,
@@ -14,6 +15,8 @@ from drawing import (
     draw_main_menu,
     draw_modifier_draft,
     draw_pause,
+    draw_placement_preview,
+    draw_profiler_overlay,
     draw_progression_screen,
     draw_settings_popup,
     draw_ui,
@@ -21,42 +24,49 @@ from drawing import (
     draw_wave_selection_popup,
     draw_upgrade_ui,
     draw_guide,
+    invalidate_map_layer,
 )
-from enemy import Enemy, invalidate_path_cache
-from maze import create_maze, expand_paths
-from tower import Tower
-from traps import Trap
-from projectiles import IceLaser, ProjectilePool
-from spatial import SpatialHash
-from wave_templates import choose_enemy_type, get_spawn_interval
-from game_settings import RESOLUTION_OPTIONS, load_settings, save_settings
+from enemy import DEMON_MINION_SCALE, warm_enemy_sprites
+from game_settings import RESOLUTION_OPTIONS, SCALE_MODES, load_settings, save_settings
 from keybind_utils import load_keybind_maps, pretty_key_name
-from economy import calculate_interest, get_structure_sell_value
-from modifiers import MODIFIERS, compile_run_effects, get_modifier
-from progression import add_xp, load_progression, save_progression, sync_unlocks, xp_to_next
-from spawn_scaling import apply_spawn_scaling
-from viewport_utils import get_viewport_rect, present_frame, window_to_game_pos
-from placement_rules import can_place_tower, can_place_trap
-from wave_progression import get_wave_enemy_count
+from modifiers import MODIFIERS, get_modifier
+from profiler import FrameProfiler
+from progression import ProgressionStore, xp_to_next
+from replay import ReplayRecorder, load_replay, start_playback
+from simulation import Simulation, main as run_headless
+from spawn_scaling import project_enemy_scales
+from viewport_utils import get_viewport_rect, invalidate_present, present_frame, set_scale_mode, window_to_game_pos
+
+cli_parser = argparse.ArgumentParser(add_help=False)
+cli_parser.add_argument('--headless', action='store_true')
+cli_parser.add_argument('--replay', default=None)
+cli_parser.add_argument('--speed', type=float, default=None)
+cli_parser.add_argument('--scale-mode', choices=SCALE_MODES, default=None)
+cli_args, _ = cli_parser.parse_known_args()
+
+if cli_args.headless:
+    sys.exit(run_headless(sys.argv[1:]))
 
 pygame.init()
 game_settings = load_settings()
 current_resolution = tuple(game_settings.get('resolution', [WIDTH, HEIGHT]))
 window = pygame.display.set_mode(current_resolution, pygame.RESIZABLE)
 screen = pygame.Surface((WIDTH, HEIGHT))
+set_scale_mode(cli_args.scale_mode or game_settings.get('scale_mode'))
 pygame.display.set_caption("Maze Treasure Defense - Dynamic Random Paths!")
 clock = pygame.time.Clock()
-font = pygame.font.SysFont("arial", 16)
-debug_font = pygame.font.SysFont("arial", 12)
+font = get_font("arial", 16)
+debug_font = get_font("arial", 12)
+STRUCTURE_COSTS = {**TOWER_COSTS, **TRAP_COSTS}
 DEBUG_LANE_OVERLAY = True
-SWARM_GROUP_SIZE = 4
-SWARM_SPAWN_SPACING = 0.15
+frame_profiler = FrameProfiler()
 
 
 def apply_resolution(new_resolution):
     global window, current_resolution, game_settings
     current_resolution = (int(new_resolution[0]), int(new_resolution[1]))
     window = pygame.display.set_mode(current_resolution, pygame.RESIZABLE)
+    invalidate_present()
     game_settings['resolution'] = [current_resolution[0], current_resolution[1]]
     save_settings(game_settings)
 
@@ -79,44 +89,21 @@ def bind_action(action, key_code):
     game_settings['keybinds'] = dict(keybind_names)
     save_settings(game_settings)
 
-grid, spawn_points, GOAL_GRID = create_maze()
-towers = []
-enemies = []
-traps = []
-projectiles = []
-money = 400
-lives = 25
-wave = 0
-wave_enemies_left = 0
-wave_timer = 0
+sim = Simulation()
 placing_tower_type = 'physical'
 selected_tower = None
-boss_spawn_lane = None
-enemy_scale = 1.0
-target_wave = 50
-boss_popup_counter = 0
 paused = False
 show_guide = False
 guide_page = 'menu'
 guide_scroll = 0
-game_won = False
-game_over = False
 victory_play_again_rect = None
 victory_menu_rect = None
 victory_exit_rect = None
 game_over_play_again_rect = None
 game_over_menu_rect = None
 game_over_exit_rect = None
-game_speed = 1
-projectile_pool = ProjectilePool()
-spatial_index = SpatialHash()
-last_interest_wave = 0
-last_wave_xp_awarded = 0
 targeting_mode_rects = {}
 sell_button_rect = None
-pending_spawns = []
-spawn_clock = 0.0
-wave_swarm_spawn_count = 0
 show_settings = False
 settings_option_rects = []
 settings_tab_rects = []
@@ -128,9 +115,8 @@ settings_max_scroll = 0
 viewport_rect = get_viewport_rect(window, WIDTH, HEIGHT)
 keybind_names, keybind_codes = load_keybind_maps(game_settings)
 
-progression = load_progression()
-sync_unlocks(progression)
-save_progression(progression)
+progression_store = ProgressionStore().start()
+progression = progression_store.data
 
 app_state = 'main_menu'
 menu_button_rects = {}
@@ -139,112 +125,45 @@ progression_scroll = 0
 progression_back_rect = None
 draft_choices = []
 draft_button_rects = {}
-active_modifier_id = None
-run_effects = compile_run_effects(None)
-rapid_deployment_wave_used = -1
 run_start_level = int(progression.get('level', 1))
 run_start_xp = int(progression.get('xp', 0))
 run_xp_gained = 0
 end_progress_shown_gain = 0
 
-def next_wave():
-    global wave, wave_enemies_left, boss_spawn_lane, spawn_points
-    global enemy_scale, boss_popup_counter, target_wave
-    global pending_spawns, wave_swarm_spawn_count, rapid_deployment_wave_used
-    wave += 1
-    rapid_deployment_wave_used = -1
-
-    wave_enemies_left = max(2, get_wave_enemy_count(wave, target_wave))
-    
-    if wave % 5 == 0:
-        _, towers_to_remove, spawn_point = expand_paths(grid, towers, spawn_points)
-        invalidate_path_cache()
-        for tower in towers_to_remove:
-            if tower in towers:
-                towers.remove(tower)
-        
-        if spawn_point and spawn_point not in spawn_points:
-            spawn_points.append(spawn_point)
-        boss_spawn_lane = random.choice(spawn_points)
-    else:
-        boss_spawn_lane = None
-    
-    boss_popup_counter = 0
-    pending_spawns = []
-    wave_swarm_spawn_count = 0
-
-    try:
-        from constants import ENEMY_SCALE_WAVE_INTERVAL, ENEMY_SCALE_INCREMENT
-        if ENEMY_SCALE_WAVE_INTERVAL > 0 and wave % ENEMY_SCALE_WAVE_INTERVAL == 0:
-            if wave <= 10:
-                increment = max(0.04, ENEMY_SCALE_INCREMENT - 0.02)
-            elif wave <= 15:
-                increment = ENEMY_SCALE_INCREMENT
-            else:
-                increment = ENEMY_SCALE_INCREMENT + 0.02
-            enemy_scale *= 1.0 + increment
-    except Exception:
-        pass
-
-
 def reset_match_state(selected_target_wave=None, auto_start_wave=True):
-    global grid, spawn_points, GOAL_GRID
-    global towers, enemies, traps, projectiles
-    global money, lives, wave, wave_enemies_left, wave_timer
-    global placing_tower_type, selected_tower, boss_spawn_lane
-    global enemy_scale, target_wave, boss_popup_counter
+    global sim, placing_tower_type, selected_tower
     global paused, show_guide, guide_page, guide_scroll
-    global game_won, game_over, victory_play_again_rect, victory_menu_rect, victory_exit_rect
+    global victory_play_again_rect, victory_menu_rect, victory_exit_rect
     global game_over_play_again_rect, game_over_menu_rect, game_over_exit_rect
-    global game_speed, projectile_pool, spatial_index, last_interest_wave
-    global last_wave_xp_awarded
-    global targeting_mode_rects, sell_button_rect
-    global pending_spawns, spawn_clock
-    global wave_swarm_spawn_count, rapid_deployment_wave_used
+    global targeting_mode_rects, sell_button_rect, playback_mode, run_end_handled
     global show_settings, settings_option_rects, settings_tab_rects, settings_tab
     global settings_action_rects, awaiting_keybind_action, settings_scroll, settings_max_scroll
     global run_start_level, run_start_xp, run_xp_gained, end_progress_shown_gain
 
-    grid, spawn_points, GOAL_GRID = create_maze()
-    invalidate_path_cache()
-    towers = []
-    enemies = []
-    traps = []
-    projectiles = []
-
-    money = 400
-    lives = 25
-    wave = 0
-    wave_enemies_left = 0
-    wave_timer = 0
+    sim = Simulation(
+        target_wave=selected_target_wave if selected_target_wave is not None else sim.target_wave,
+        on_xp=award_xp,
+        on_wave_cleared=lambda wave: progression_store.request_flush(),
+        on_tiles_carved=invalidate_map_layer,
+        profiler=frame_profiler,
+    )
+    invalidate_map_layer()
     placing_tower_type = 'physical'
     selected_tower = None
-    boss_spawn_lane = None
-    enemy_scale = 1.0
-    target_wave = selected_target_wave if selected_target_wave is not None else target_wave
-    boss_popup_counter = 0
     paused = False
     show_guide = False
     guide_page = 'menu'
     guide_scroll = 0
-    game_won = False
-    game_over = False
     victory_play_again_rect = None
     victory_menu_rect = None
     victory_exit_rect = None
     game_over_play_again_rect = None
     game_over_menu_rect = None
     game_over_exit_rect = None
-    game_speed = 1
-    projectile_pool = ProjectilePool()
-    spatial_index = SpatialHash()
-    last_interest_wave = 0
     targeting_mode_rects = {}
     sell_button_rect = None
-    pending_spawns = []
-    spawn_clock = 0.0
-    wave_swarm_spawn_count = 0
-    rapid_deployment_wave_used = -1
+    playback_mode = False
+    run_end_handled = False
     show_settings = False
     settings_option_rects = []
     settings_tab_rects = []
@@ -253,14 +172,14 @@ def reset_match_state(selected_target_wave=None, auto_start_wave=True):
     awaiting_keybind_action = None
     settings_scroll = 0
     settings_max_scroll = 0
-    last_wave_xp_awarded = 0
     run_start_level = int(progression.get('level', 1))
     run_start_xp = int(progression.get('xp', 0))
     run_xp_gained = 0
     end_progress_shown_gain = 0
+    warm_enemy_sprites(project_enemy_scales(sim.target_wave) + [DEMON_MINION_SCALE])
 
     if auto_start_wave:
-        next_wave()
+        sim.next_wave()
 
 
 def award_xp(amount):
@@ -268,8 +187,7 @@ def award_xp(amount):
     if amount <= 0:
         return
     run_xp_gained += int(amount)
-    add_xp(progression, int(amount))
-    save_progression(progression)
+    progression_store.add_xp(int(amount))
 
 
 def project_progress(level, xp, gained_xp):
@@ -281,28 +199,22 @@ def project_progress(level, xp, gained_xp):
     return lvl, current_xp, xp_to_next(lvl)
 
 
-def apply_tower_modifier_effects(tower):
-    tower.dmg *= run_effects['tower_damage_mult']
-    if tower.type == 'physical':
-        tower.dmg *= run_effects['archer_damage_mult']
-    if tower.type == 'magic':
-        tower.attack_interval *= run_effects['magic_interval_mult']
-    tower.attack_interval *= run_effects['tower_attack_interval_mult']
-    tower.range *= run_effects['tower_range_mult']
-    tower.focused_targeting_bonus = run_effects['focused_targeting_bonus']
-
+def structure_command(op, structure, **args):
+    if playback_mode:
+        return None
+    gx, gy = sim.structure_tile(structure)
+    return sim.command(op, gx=gx, gy=gy, **args)
 
-def apply_trap_modifier_effects(trap):
-    if trap.trap_type == 'spikes':
-        trap.damage *= run_effects['spike_damage_mult']
 
-
-def apply_enemy_modifier_effects(enemy):
-    enemy.speed *= run_effects['enemy_speed_mult']
-    enemy.base_speed *= run_effects['enemy_speed_mult']
-    enemy.reward = int(enemy.reward * run_effects['enemy_reward_mult'])
-    enemy.slow_decay_rate *= run_effects['slow_decay_mult']
-    enemy.burn_dot_multiplier = run_effects['burn_dot_mult']
+def present_gameplay_frame():
+    if frame_profiler.enabled:
+        with frame_profiler.span('ui_draw'):
+            draw_profiler_overlay(screen, debug_font, frame_profiler.summary(), frame_profiler.counts)
+    with frame_profiler.span('present_frame'):
+        rect = present_frame(window, screen, WIDTH, HEIGHT)
+    if frame_profiler.enabled:
+        frame_profiler.end_frame(sim.entity_counts())
+    return rect
 
 
 def build_modifier_draft():
@@ -313,10 +225,28 @@ def build_modifier_draft():
     return [MODIFIERS[mid] for mid in choice_ids]
 
 
+replay_recorder = None
+playback_mode = False
+run_end_handled = False
+if cli_args.replay:
+    replay_header, replay_commands, _ = load_replay(cli_args.replay)
+    reset_match_state(selected_target_wave=replay_header['target_wave'], auto_start_wave=False)
+    sim = start_playback(
+        replay_header,
+        replay_commands,
+        include_speed=cli_args.speed is None,
+        on_tiles_carved=invalidate_map_layer,
+        profiler=frame_profiler,
+    )
+    if cli_args.speed is not None:
+        sim.speed = cli_args.speed
+    playback_mode = True
+    app_state = 'gameplay'
+
 run = True
 while run:
     raw_dt = clock.tick(FPS) / 1000.0
-    dt = raw_dt * game_speed
+    dt = raw_dt
 
     if app_state != 'gameplay':
         for event in pygame.event.get():
@@ -324,6 +254,7 @@ while run:
                 run = False
             elif event.type == pygame.VIDEORESIZE:
                 window = pygame.display.set_mode((max(640, event.w), max(480, event.h)), pygame.RESIZABLE)
+                invalidate_present()
                 current_resolution = window.get_size()
                 game_settings['resolution'] = [current_resolution[0], current_resolution[1]]
                 save_settings(game_settings)
@@ -448,10 +379,8 @@ while run:
                         run_start_xp = int(progression.get('xp', 0))
                         run_xp_gained = 0
                         end_progress_shown_gain = 0
-                        active_modifier_id = picked
-                        run_effects = compile_run_effects(active_modifier_id)
-                        money += int(run_effects.get('start_gold_bonus', 0))
-                        next_wave()
+                        sim.start(picked)
+                        replay_recorder = ReplayRecorder(sim).attach(sim)
                         app_state = 'gameplay'
                 elif app_state == 'menu_settings':
                     for tab_rect, tab_key in settings_tab_rects:
@@ -508,16 +437,19 @@ while run:
             settings_scroll = min(settings_scroll, settings_max_scroll)
 
         viewport_rect = present_frame(window, screen, WIDTH, HEIGHT)
+        frame_profiler.skip_frame()
         continue
 
-    screen.fill(DARK_GRAY)
-    draw_grid(screen, grid, GOAL_GRID)
+    with frame_profiler.span('world_draw'):
+        screen.fill(DARK_GRAY)
+        draw_grid(screen, sim.grid, sim.goal)
 
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             run = False
         elif event.type == pygame.VIDEORESIZE:
             window = pygame.display.set_mode((max(640, event.w), max(480, event.h)), pygame.RESIZABLE)
+            invalidate_present()
             current_resolution = window.get_size()
             game_settings['resolution'] = [current_resolution[0], current_resolution[1]]
             save_settings(game_settings)
@@ -532,6 +464,8 @@ while run:
                 else:
                     bind_action(awaiting_keybind_action, event.key)
                     awaiting_keybind_action = None
+            elif event.key == keybind_codes.get('toggle_profiler', pygame.K_F3):
+                frame_profiler.toggle()
             elif event.key in (pause_key, pygame.K_ESCAPE):
                 if paused and show_settings:
                     show_settings = False
@@ -630,28 +564,17 @@ while run:
                 elif event.key == keybind_codes.get('build_spikes', pygame.K_5):
                     placing_tower_type = 'spikes'
                 elif event.key == keybind_codes.get('cycle_speed', pygame.K_c):
-                    game_speed = 1 if game_speed >= 3 else game_speed + 1
+                    if not playback_mode:
+                        sim.command('speed', speed=1 if sim.speed >= 3 else sim.speed + 1)
                 elif event.key == keybind_codes.get('upgrade_path1', pygame.K_q):
                     if selected_tower:
-                        upgrade_name, upgrade_cost = selected_tower.get_upgrade_info(1)
-                        if upgrade_name and money >= upgrade_cost and selected_tower.can_upgrade(1):
-                            if selected_tower.upgrade(1):
-                                money -= upgrade_cost
-                                selected_tower.upgrade_spent = getattr(selected_tower, 'upgrade_spent', 0) + upgrade_cost
+                        structure_command('upgrade', selected_tower, path=1)
                 elif event.key == keybind_codes.get('upgrade_path2', pygame.K_e):
                     if selected_tower:
-                        upgrade_name, upgrade_cost = selected_tower.get_upgrade_info(2)
-                        if upgrade_name and money >= upgrade_cost and selected_tower.can_upgrade(2):
-                            if selected_tower.upgrade(2):
-                                money -= upgrade_cost
-                                selected_tower.upgrade_spent = getattr(selected_tower, 'upgrade_spent', 0) + upgrade_cost
+                        structure_command('upgrade', selected_tower, path=2)
                 elif event.key == keybind_codes.get('sell_structure', pygame.K_r):
                     if selected_tower:
-                        money += get_structure_sell_value(selected_tower, refund_rate=run_effects['sell_refund_rate'])
-                        if selected_tower in towers:
-                            towers.remove(selected_tower)
-                        elif selected_tower in traps:
-                            traps.remove(selected_tower)
+                        structure_command('sell', selected_tower)
                         selected_tower = None
                         targeting_mode_rects = {}
                         sell_button_rect = None
@@ -663,7 +586,7 @@ while run:
                 continue
             mx, my = logical_pos
             gx, gy = mx // TILE, my // TILE
-            if game_over:
+            if sim.game_over:
                 if game_over_play_again_rect and game_over_play_again_rect.collidepoint(mx, my):
                     wave_select_input = ''
                     app_state = 'wave_select'
@@ -673,7 +596,7 @@ while run:
                     pygame.quit()
                     sys.exit()
                 continue
-            if game_won:
+            if sim.game_won:
                 if victory_play_again_rect and victory_play_again_rect.collidepoint(mx, my):
                     wave_select_input = ''
                     app_state = 'wave_select'
@@ -687,17 +610,13 @@ while run:
             if selected_tower and targeting_mode_rects and hasattr(selected_tower, 'targeting_mode'):
                 for mode, rect in targeting_mode_rects.items():
                     if rect.collidepoint(mx, my):
-                        selected_tower.targeting_mode = mode
+                        structure_command('target', selected_tower, mode=mode)
                         break
                 if any(rect.collidepoint(mx, my) for rect in targeting_mode_rects.values()):
                     continue
 
             if selected_tower and sell_button_rect and sell_button_rect.collidepoint(mx, my):
-                money += get_structure_sell_value(selected_tower, refund_rate=run_effects['sell_refund_rate'])
-                if selected_tower in towers:
-                    towers.remove(selected_tower)
-                elif selected_tower in traps:
-                    traps.remove(selected_tower)
+                structure_command('sell', selected_tower)
                 selected_tower = None
                 targeting_mode_rects = {}
                 sell_button_rect = None
@@ -722,35 +641,10 @@ while run:
                             awaiting_keybind_action = action_name
                             break
                 continue
+            if playback_mode:
+                continue
           
-            structure_placed = False
-
-            if not game_won and placing_tower_type in ['physical', 'magic', 'ice', 'executioner'] and can_place_tower(grid, gx, gy, towers, TILE, GRID_W, GRID_H):
-                cost = TOWER_COSTS[placing_tower_type]
-                if run_effects['rapid_deployment'] and rapid_deployment_wave_used != wave:
-                    cost = int(cost * 0.85)
-                if money >= cost:
-                    tower_pos = pygame.Vector2(gx * TILE + TILE // 2, gy * TILE + TILE // 2)
-                    tower = Tower(tower_pos, placing_tower_type)
-                    apply_tower_modifier_effects(tower)
-                    tower.upgrade_spent = 0
-                    tower.build_cost = cost
-                    towers.append(tower)
-                    money -= cost
-                    if run_effects['rapid_deployment'] and rapid_deployment_wave_used != wave:
-                        rapid_deployment_wave_used = wave
-                    structure_placed = True
-            elif not game_won and placing_tower_type in ['fire', 'spikes']:
-                if can_place_trap(grid, gx, gy, towers, traps, GRID_W, GRID_H, TILE):
-                    cost = TRAP_COSTS.get(placing_tower_type, 0)
-                    if money >= cost:
-                        trap = Trap((gx, gy), placing_tower_type)
-                        apply_trap_modifier_effects(trap)
-                        trap.upgrade_spent = 0
-                        trap.build_cost = cost
-                        traps.append(trap)
-                        money -= cost
-                        structure_placed = True
+            structure_placed = sim.command('build', gx=gx, gy=gy, structure_type=placing_tower_type) is not None
 
             if structure_placed:
                 selected_tower = None
@@ -759,16 +653,7 @@ while run:
                 sell_button_rect = None
                 continue
            
-            selected_tower = None
-            for t in towers:
-                if math.hypot(t.pos.x - mx, t.pos.y - my) < t.size * 1.2:
-                    selected_tower = t
-                    break
-            if not selected_tower:
-                for tr in traps:
-                    if math.hypot(tr.pos.x - mx, tr.pos.y - my) < TILE:
-                        selected_tower = tr
-                        break
+            selected_tower = sim.structure_at(mx, my)
         elif event.type == pygame.MOUSEWHEEL:
             if paused and show_guide and guide_page != 'menu':
                 guide_scroll = max(0, guide_scroll - event.y * 30)
@@ -776,20 +661,19 @@ while run:
                 settings_scroll = max(0, min(settings_max_scroll, settings_scroll - event.y * 30))
 
     if paused:
-        for t in towers:
+        for t in sim.towers:
             t.draw(screen, selected_tower == t)
         
-        for p in projectiles:
+        for p in sim.projectiles:
             p.draw(screen)
         
-        for tr in traps:
+        for tr in sim.traps:
             tr.draw(screen)
         
-        for e in enemies:
+        for e in sim.enemies:
             e.draw(screen)
         
-        combined_costs = {**TOWER_COSTS, **TRAP_COSTS}
-        draw_ui(screen, font, money, lives, wave, wave_enemies_left, placing_tower_type, tower_costs=combined_costs, game_speed=game_speed, selected_structure=selected_tower)
+        draw_ui(screen, font, sim.money, sim.lives, sim.wave, sim.wave_enemies_left, placing_tower_type, tower_costs=STRUCTURE_COSTS, game_speed=sim.speed, selected_structure=selected_tower)
         
         if show_guide:
             max_scroll = draw_guide(screen, font, guide_page, guide_scroll)
@@ -832,42 +716,38 @@ while run:
             settings_max_scroll = 0
         
         if selected_tower and not show_guide and not show_settings:
-            panel_info = draw_upgrade_ui(screen, font, selected_tower, money, refund_rate=run_effects['sell_refund_rate'])
+            panel_info = draw_upgrade_ui(screen, font, selected_tower, sim.money, refund_rate=sim.run_effects['sell_refund_rate'])
             targeting_mode_rects = panel_info.get('targeting_modes', {})
             sell_button_rect = panel_info.get('sell_rect')
         else:
             targeting_mode_rects = {}
             sell_button_rect = None
-        viewport_rect = present_frame(window, screen, WIDTH, HEIGHT)
+        viewport_rect = present_gameplay_frame()
         continue
 
-    if wave_enemies_left == 0 and len(enemies) == 0 and not game_won and not pending_spawns:
-        if wave > 0 and last_wave_xp_awarded != wave:
-            award_xp(8 + wave * 2)
-            last_wave_xp_awarded = wave
-        if wave > 0 and last_interest_wave != wave:
-            interest_cap = 150 + int(run_effects.get('interest_cap_bonus', 0))
-            interest = calculate_interest(money, cap=interest_cap)
-            interest = int(interest * run_effects.get('interest_mult', 1.0))
-            money += max(0, interest)
-            last_interest_wave = wave
-
-        if wave < target_wave:
-            next_wave()
-        elif wave == target_wave:
-            game_won = True
-    
-    if game_over:
-        for t in towers:
+    sim.advance(dt)
+    if sim.finished and not run_end_handled:
+        run_end_handled = True
+        progression_store.request_flush()
+        if replay_recorder:
+            replay_recorder.finish(sim)
+            replay_recorder.save()
+            replay_recorder = None
+        if frame_profiler.history:
+            frame_profiler.export()
+            frame_profiler.reset()
+
+    if sim.game_over:
+        for t in sim.towers:
             t.draw(screen, selected_tower == t)
 
-        for p in projectiles:
+        for p in sim.projectiles:
             p.draw(screen)
 
-        for tr in traps:
+        for tr in sim.traps:
             tr.draw(screen)
 
-        for e in enemies:
+        for e in sim.enemies:
             e.draw(screen)
 
         if end_progress_shown_gain < run_xp_gained:
@@ -875,20 +755,20 @@ while run:
         shown_level, shown_xp, shown_xp_next = project_progress(run_start_level, run_start_xp, end_progress_shown_gain)
         game_over_play_again_rect, game_over_menu_rect, game_over_exit_rect = draw_game_over(screen, font)
         draw_end_progress_bar(screen, font, shown_level, shown_xp, shown_xp_next, end_progress_shown_gain, run_xp_gained)
-        viewport_rect = present_frame(window, screen, WIDTH, HEIGHT)
+        viewport_rect = present_gameplay_frame()
         continue
 
-    if game_won:
-        for t in towers:
+    if sim.game_won:
+        for t in sim.towers:
             t.draw(screen, selected_tower == t)
         
-        for p in projectiles:
+        for p in sim.projectiles:
             p.draw(screen)
         
-        for tr in traps:
+        for tr in sim.traps:
             tr.draw(screen)
         
-        for e in enemies:
+        for e in sim.enemies:
             e.draw(screen)
         
         if end_progress_shown_gain < run_xp_gained:
@@ -896,152 +776,53 @@ while run:
         shown_level, shown_xp, shown_xp_next = project_progress(run_start_level, run_start_xp, end_progress_shown_gain)
         victory_play_again_rect, victory_menu_rect, victory_exit_rect = draw_victory(screen, font)
         draw_end_progress_bar(screen, font, shown_level, shown_xp, shown_xp_next, end_progress_shown_gain, run_xp_gained)
-        viewport_rect = present_frame(window, screen, WIDTH, HEIGHT)
+        viewport_rect = present_gameplay_frame()
         continue
 
-    if not paused:
-        spawn_clock += dt
+    with frame_profiler.span('world_draw'):
+        if not playback_mode and placing_tower_type != 'none':
+            hover_pos = window_to_game_pos(pygame.mouse.get_pos(), viewport_rect, WIDTH, HEIGHT)
+            if hover_pos is not None and hover_pos[1] < GAME_HEIGHT:
+                hover_gx, hover_gy = hover_pos[0] // TILE, hover_pos[1] // TILE
+                draw_placement_preview(screen, hover_gx, hover_gy, sim.can_build(hover_gx, hover_gy, placing_tower_type))
 
-        if pending_spawns:
-            ready_spawns = [entry for entry in pending_spawns if entry['spawn_time'] <= spawn_clock]
-            if ready_spawns:
-                pending_spawns = [entry for entry in pending_spawns if entry['spawn_time'] > spawn_clock]
-                for entry in ready_spawns:
-                    spawn_tile = entry['spawn_point'] if entry['spawn_point'] in spawn_points else random.choice(spawn_points)
-                    enemy = Enemy(grid, spawn_tile, GOAL_GRID, entry['enemy_type'], scale=enemy_scale)
-                    apply_enemy_modifier_effects(enemy)
-                    if entry['enemy_type'] == 'swarm':
-                        offset_x = random.uniform(-4.0, 4.0)
-                        offset_y = random.uniform(-4.0, 4.0)
-                        enemy.pos.x += offset_x
-                        enemy.pos.y += offset_y
-                        wave_swarm_spawn_count += 1
-                        apply_spawn_scaling(enemy, wave, swarm_spawn_index=wave_swarm_spawn_count)
-                    else:
-                        apply_spawn_scaling(enemy, wave)
-                    enemies.append(enemy)
-
-        spawn_interval = get_spawn_interval(wave)
-        wave_timer += dt
-        if wave_enemies_left > 0 and wave_timer >= spawn_interval:
-            if wave_enemies_left == 1 and wave % 5 == 0:
-                etype = 'demon_boss' if wave % 10 == 0 else 'minotaur_boss'
-                spawn = boss_spawn_lane
-                boss_popup_counter = 60
-            else:
-                regular_budget = wave_enemies_left - 1 if wave % 5 == 0 else wave_enemies_left
-                etype = choose_enemy_type(wave, enemies, wave_enemies_left=regular_budget)
-                spawn = random.choice(spawn_points)
-
-            if etype == 'swarm':
-                burst_budget = wave_enemies_left - 1 if wave % 5 == 0 else wave_enemies_left
-                burst_count = max(0, min(SWARM_GROUP_SIZE, burst_budget))
-                if burst_count > 0:
-                    for i in range(burst_count):
-                        pending_spawns.append({
-                            'enemy_type': 'swarm',
-                            'spawn_point': spawn,
-                            'spawn_time': spawn_clock + (i * SWARM_SPAWN_SPACING),
-                        })
-                    wave_enemies_left -= burst_count
-            else:
-                enemy = Enemy(grid, spawn, GOAL_GRID, etype, scale=enemy_scale)
-                apply_enemy_modifier_effects(enemy)
-                apply_spawn_scaling(enemy, wave)
-                enemies.append(enemy)
-                wave_enemies_left -= 1
-            wave_timer = 0
-        
-        for e in enemies:
-            e.logic(enemies, dt, towers=towers, spawn_points=spawn_points, goal_grid=GOAL_GRID)
-
-        spatial_index.rebuild(enemies)
+        for t in sim.towers:
+            t.draw(screen, selected_tower == t)
 
-        for t in towers:
-            if getattr(t, 'stun_timer', 0.0) > 0:
-                t.stun_timer = max(0.0, t.stun_timer - dt)
-                continue
-            projectile = t.update(enemies, dt=dt, spatial_index=spatial_index, projectile_pool=projectile_pool)
-            if projectile:
-                if isinstance(projectile, list):
-                    projectiles.extend(projectile)
-                else:
-                    projectiles.append(projectile)
-        
-        projectiles_to_remove = []
-        for p in projectiles:
-            if not p.update(dt, enemies):
-                projectiles_to_remove.append(p)
-        for p in projectiles_to_remove:
-            projectiles.remove(p)
-            if not isinstance(p, IceLaser):
-                projectile_pool.release(p)
+        for p in sim.projectiles:
+            p.draw(screen)
 
-        for tr in traps:
-            tr.update(enemies, dt)
+        for tr in sim.traps:
+            tr.draw(screen)
 
-        to_remove = []
-        for e in enemies:
-            if e.grid_pos() == GOAL_GRID:
-                lives -= 1
-                e.hp = 0
-                to_remove.append(e)
-            elif e.hp <= 0:
-                money += int(e.reward * 1.5 * run_effects.get('kill_reward_mult', 1.0))
-                kill_xp = int(e.reward * 0.6)
-                if getattr(e, 'is_boss', False):
-                    kill_xp += 40
-                award_xp(kill_xp)
-                to_remove.append(e)
-        for e in to_remove:
-            if e in enemies:
-                enemies.remove(e)
+        for e in sim.enemies:
+            e.draw(screen)
 
-        if lives <= 0:
-            game_over = True
-            game_won = False
-            paused = False
-            show_guide = False
-            show_settings = False
-            awaiting_keybind_action = None
+    with frame_profiler.span('ui_draw'):
+        if DEBUG_LANE_OVERLAY:
+            lane_text = render_text(debug_font, f"Lanes: {len(sim.spawn_points)}", (220, 245, 255))
+            lane_bg = pygame.Surface((lane_text.get_width() + 10, lane_text.get_height() + 6), pygame.SRCALPHA)
+            pygame.draw.rect(lane_bg, (10, 20, 35, 180), (0, 0, lane_bg.get_width(), lane_bg.get_height()), border_radius=4)
+            screen.blit(lane_bg, (10, 10))
+            screen.blit(lane_text, (15, 13))
 
+        if sim.boss_popup_counter > 0:
+            boss_type = 'minotaur_boss' if sim.wave % 10 != 0 else 'demon_boss'
+            draw_boss_spawn_popup(screen, font, boss_type)
+            sim.boss_popup_counter -= 1
 
-    for t in towers:
-        t.draw(screen, selected_tower == t)
-    
-    for p in projectiles:
-        p.draw(screen)
-    
-    for tr in traps:
-        tr.draw(screen)
-    
-    for e in enemies:
-        e.draw(screen)
+        draw_ui(screen, font, sim.money, sim.lives, sim.wave, sim.wave_enemies_left, placing_tower_type, tower_costs=STRUCTURE_COSTS, game_speed=sim.speed, selected_structure=selected_tower)
 
-    if DEBUG_LANE_OVERLAY:
-        lane_text = debug_font.render(f"Lanes: {len(spawn_points)}", True, (220, 245, 255))
-        lane_bg = pygame.Surface((lane_text.get_width() + 10, lane_text.get_height() + 6), pygame.SRCALPHA)
-        pygame.draw.rect(lane_bg, (10, 20, 35, 180), (0, 0, lane_bg.get_width(), lane_bg.get_height()), border_radius=4)
-        screen.blit(lane_bg, (10, 10))
-        screen.blit(lane_text, (15, 13))
-    
-    if boss_popup_counter > 0:
-        boss_type = 'minotaur_boss' if wave % 10 != 0 else 'demon_boss'
-        draw_boss_spawn_popup(screen, font, boss_type)
-        boss_popup_counter -= 1
-    
-    combined_costs = {**TOWER_COSTS, **TRAP_COSTS}
-    draw_ui(screen, font, money, lives, wave, wave_enemies_left, placing_tower_type, tower_costs=combined_costs, game_speed=game_speed, selected_structure=selected_tower)
-    
-    if selected_tower:
-        panel_info = draw_upgrade_ui(screen, font, selected_tower, money, refund_rate=run_effects['sell_refund_rate'])
-        targeting_mode_rects = panel_info.get('targeting_modes', {})
-        sell_button_rect = panel_info.get('sell_rect')
-    else:
-        targeting_mode_rects = {}
-        sell_button_rect = None
+        if selected_tower:
+            panel_info = draw_upgrade_ui(screen, font, selected_tower, sim.money, refund_rate=sim.run_effects['sell_refund_rate'])
+            targeting_mode_rects = panel_info.get('targeting_modes', {})
+            sell_button_rect = panel_info.get('sell_rect')
+        else:
+            targeting_mode_rects = {}
+            sell_button_rect = None
 
-    viewport_rect = present_frame(window, screen, WIDTH, HEIGHT)
+    viewport_rect = present_gameplay_frame()
 
+progression_store.close()
 pygame.quit()
 sys.exit()
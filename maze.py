@@ -66,29 +66,29 @@ def _spawn_is_spaced(spawn, spawn_points):
     return all(manhattan_distance(spawn, existing) >= MIN_SPAWN_DISTANCE for existing in spawn_points)
 
 
-def _pick_spawn_for_zone(zone_name, spawn_points, retries=12):
+def _pick_spawn_for_zone(zone_name, spawn_points, rng, retries=12):
     candidates = _zone_candidates(zone_name)
     if not candidates:
         return None
 
     for _ in range(retries):
-        spawn = random.choice(candidates)
+        spawn = rng.choice(candidates)
         if _spawn_is_spaced(spawn, spawn_points):
             return spawn
 
-    random.shuffle(candidates)
+    rng.shuffle(candidates)
     for spawn in candidates:
         if _spawn_is_spaced(spawn, spawn_points):
             return spawn
     return None
 
 
-def _carve_path_to_goal(grid, spawn, goal):
+def _carve_path_to_goal(grid, spawn, goal, rng):
     sx, sy = spawn
     gx, gy = goal
     grid[sy][sx] = 2
 
-    if random.choice((True, False)):
+    if rng.choice((True, False)):
         x_step = 1 if gx >= sx else -1
         for x in range(sx, gx + x_step, x_step):
             grid[sy][x] = 2
@@ -103,7 +103,9 @@ def _carve_path_to_goal(grid, spawn, goal):
         for x in range(sx, gx + x_step, x_step):
             grid[gy][x] = 2
 
-def create_maze():
+def create_maze(rng=None):
+    if rng is None:
+        rng = random
     grid = [[1] * GRID_W for _ in range(GRID_H)]
     
     for y in range(1, GRID_H - 1):
@@ -113,10 +115,10 @@ def create_maze():
     goal = (GRID_W // 2, GRID_H // 2)
     spawn_points = []
 
-    lane_count = random.randint(MIN_STARTING_LANES, MAX_STARTING_LANES)
+    lane_count = rng.randint(MIN_STARTING_LANES, MAX_STARTING_LANES)
 
     zone_pool = list(SPAWN_ZONES)
-    random.shuffle(zone_pool)
+    rng.shuffle(zone_pool)
 
     selected_zones = []
     used_sides = set()
@@ -136,7 +138,7 @@ def create_maze():
 
     zone_names = [zone_name for zone_name, _ in zone_pool]
     for zone_name in selected_zones:
-        spawn = _pick_spawn_for_zone(zone_name, spawn_points)
+        spawn = _pick_spawn_for_zone(zone_name, spawn_points, rng)
         if spawn is not None:
             spawn_points.append(spawn)
 
@@ -145,7 +147,7 @@ def create_maze():
             break
         if any(spawn in _zone_candidates(zone_name) for spawn in spawn_points):
             continue
-        spawn = _pick_spawn_for_zone(zone_name, spawn_points)
+        spawn = _pick_spawn_for_zone(zone_name, spawn_points, rng)
         if spawn is not None:
             spawn_points.append(spawn)
 
@@ -153,15 +155,18 @@ def create_maze():
         spawn_points.append((1, 1))
 
     for spawn in spawn_points:
-        _carve_path_to_goal(grid, spawn, goal)
+        _carve_path_to_goal(grid, spawn, goal, rng)
 
     grid[goal[1]][goal[0]] = 2
     
     return grid, spawn_points, goal
 
-def expand_paths(grid, towers, spawn_points):
+def expand_paths(grid, towers, spawn_points, rng=None):
     from constants import TILE
 
+    if rng is None:
+        rng = random
+
     if len(spawn_points) >= MAX_TOTAL_LANES:
         return [], [], None
     
@@ -182,7 +187,7 @@ def expand_paths(grid, towers, spawn_points):
     if not edge_options:
         return [], [], None
     
-    new_spawn = random.choice(edge_options)
+    new_spawn = rng.choice(edge_options)
     
     closest_path = None
     min_distance = float('inf')
@@ -1,4 +1,6 @@
 import heapq
+from collections import deque
+
 from constants import GRID_W, GRID_H
 
 def astar(grid, start, goal):
@@ -35,3 +37,85 @@ def astar(grid, start, goal):
                     fscore[neighbor] = tentative_g + heuristic(neighbor, goal)
                     heapq.heappush(open_heap, (fscore[neighbor], neighbor))
     return []
+
+
+NEIGHBORS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+
+def _walkable(grid, x, y):
+    return 0 <= x < GRID_W and 0 <= y < GRID_H and grid[y][x] == 2
+
+
+def build_flow_field(grid, goal):
+    dist = [[-1] * GRID_W for _ in range(GRID_H)]
+    gx, gy = goal
+    if not _walkable(grid, gx, gy):
+        return dist
+    dist[gy][gx] = 0
+    queue = deque([(gx, gy)])
+    while queue:
+        x, y = queue.popleft()
+        next_dist = dist[y][x] + 1
+        for dx, dy in NEIGHBORS:
+            nx, ny = x + dx, y + dy
+            if _walkable(grid, nx, ny) and dist[ny][nx] < 0:
+                dist[ny][nx] = next_dist
+                queue.append((nx, ny))
+    return dist
+
+
+def update_flow_field(dist, grid, new_tiles):
+    queue = deque()
+    for x, y in new_tiles:
+        if not _walkable(grid, x, y):
+            continue
+        best = dist[y][x]
+        for dx, dy in NEIGHBORS:
+            nx, ny = x + dx, y + dy
+            if _walkable(grid, nx, ny) and dist[ny][nx] >= 0:
+                if best < 0 or dist[ny][nx] + 1 < best:
+                    best = dist[ny][nx] + 1
+        if best >= 0 and (dist[y][x] < 0 or best < dist[y][x]):
+            dist[y][x] = best
+        if dist[y][x] >= 0:
+            queue.append((x, y))
+
+    while queue:
+        x, y = queue.popleft()
+        next_dist = dist[y][x] + 1
+        for dx, dy in NEIGHBORS:
+            nx, ny = x + dx, y + dy
+            if _walkable(grid, nx, ny) and (dist[ny][nx] < 0 or dist[ny][nx] > next_dist):
+                dist[ny][nx] = next_dist
+                queue.append((nx, ny))
+    return dist
+
+
+def field_distance(dist, tile):
+    x, y = tile
+    if 0 <= x < GRID_W and 0 <= y < GRID_H:
+        return dist[y][x]
+    return -1
+
+
+def next_tile(dist, tile):
+    current = field_distance(dist, tile)
+    if current <= 0:
+        return None
+    x, y = tile
+    for dx, dy in NEIGHBORS:
+        neighbor = (x + dx, y + dy)
+        if field_distance(dist, neighbor) == current - 1:
+            return neighbor
+    return None
+
+
+def flow_path(dist, start):
+    if field_distance(dist, start) < 0:
+        return []
+    path = [start]
+    current = start
+    while field_distance(dist, current) > 0:
+        current = next_tile(dist, current)
+        path.append(current)
+    return path
@@ -18,20 +18,24 @@ def _tower_too_close(tower, gx, gy, tile_size):
     return math.hypot(tower.pos.x - center_x, tower.pos.y - center_y) < tile_size
 
 
-def can_place_tower(grid, gx, gy, towers, tile_size, grid_width, grid_height):
+def can_place_tower(grid, gx, gy, towers, tile_size, grid_width, grid_height, occupancy=None):
     if not _in_bounds(gx, gy, grid_width, grid_height):
         return False
     if grid[gy][gx] != 0:
         return False
+    if occupancy is not None:
+        return occupancy.tower_at((gx, gy)) is None
     tower_exists = any(_tower_too_close(tower, gx, gy, tile_size) for tower in towers)
     return not tower_exists
 
 
-def can_place_trap(grid, gx, gy, towers, traps, grid_width, grid_height, tile_size):
+def can_place_trap(grid, gx, gy, towers, traps, grid_width, grid_height, tile_size, occupancy=None):
     if not _in_bounds(gx, gy, grid_width, grid_height):
         return False
     if grid[gy][gx] != 2:
         return False
+    if occupancy is not None:
+        return occupancy.at((gx, gy)) is None
     for tower in towers:
         if _tower_occupies_tile(tower, gx, gy, tile_size):
             return False
@@ -0,0 +1,165 @@
+import csv
+import json
+import time
+from collections import deque
+from pathlib import Path
+
+PROFILE_PHASES = (
+    'spawn',
+    'enemy_logic',
+    'spatial_rebuild',
+    'tower_update',
+    'projectile_update',
+    'trap_update',
+    'death_resolution',
+    'world_draw',
+    'ui_draw',
+    'present_frame',
+)
+COUNT_KEYS = ('enemies', 'towers', 'traps', 'projectiles', 'pending_spawns')
+ROLLING_WINDOW = 240
+MAX_HISTORY_FRAMES = 60 * 60 * 10
+SUMMARY_REFRESH_FRAMES = 15
+PROFILE_DIR = Path(__file__).with_name("profiles")
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('profiler', 'name', 'started')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.started = 0
+
+    def __enter__(self):
+        self.started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.add(self.name, time.perf_counter_ns() - self.started)
+        return False
+
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def _spread(values):
+    ordered = sorted(values)
+    return (_percentile(ordered, 0.50), _percentile(ordered, 0.95), _percentile(ordered, 0.99))
+
+
+class FrameProfiler:
+    def __init__(self, window=ROLLING_WINDOW, history_limit=MAX_HISTORY_FRAMES):
+        self.enabled = False
+        self.phases = list(PROFILE_PHASES) + ['frame']
+        self.rolling = {name: deque(maxlen=window) for name in self.phases}
+        self.history = deque(maxlen=history_limit)
+        self.counts = {key: 0 for key in COUNT_KEYS}
+        self._current = {}
+        self._frame_started = None
+        self._summary = None
+        self._frames_since_summary = 0
+
+    def toggle(self):
+        self.set_enabled(not self.enabled)
+        return self.enabled
+
+    def set_enabled(self, enabled):
+        self.enabled = bool(enabled)
+        self.skip_frame()
+
+    def skip_frame(self):
+        self._current = {}
+        self._frame_started = None
+
+    def span(self, name):
+        if not self.enabled:
+            return NULL_SPAN
+        return _Span(self, name)
+
+    def add(self, name, elapsed_ns):
+        self._current[name] = self._current.get(name, 0) + elapsed_ns
+
+    def end_frame(self, counts=None):
+        if not self.enabled:
+            return
+        now = time.perf_counter_ns()
+        if self._frame_started is not None:
+            self._current['frame'] = now - self._frame_started
+        self._frame_started = now
+
+        if counts:
+            self.counts.update(counts)
+        row = []
+        for name in self.phases:
+            ms = self._current.get(name, 0) / 1_000_000.0
+            self.rolling[name].append(ms)
+            row.append(ms)
+        row.extend(self.counts.get(key, 0) for key in COUNT_KEYS)
+        self.history.append(tuple(row))
+        self._current = {}
+        self._frames_since_summary += 1
+
+    def summary(self):
+        if self._summary is None or self._frames_since_summary >= SUMMARY_REFRESH_FRAMES:
+            self._summary = {name: _spread(self.rolling[name]) for name in self.phases}
+            self._frames_since_summary = 0
+        return self._summary
+
+    def reset(self):
+        for values in self.rolling.values():
+            values.clear()
+        self.history.clear()
+        self._current = {}
+        self._frame_started = None
+        self._summary = None
+
+    def export_csv(self, path):
+        path = Path(path)
+        with path.open('w', newline='', encoding='utf-8') as out:
+            writer = csv.writer(out)
+            writer.writerow(['frame'] + [f"{name}_ms" for name in self.phases] + list(COUNT_KEYS))
+            for idx, row in enumerate(self.history):
+                writer.writerow([idx] + [round(value, 4) for value in row[:len(self.phases)]] + list(row[len(self.phases):]))
+        return path
+
+    def export_json(self, path):
+        path = Path(path)
+        columns = list(zip(*self.history))
+        percentiles = {}
+        for idx, name in enumerate(self.phases):
+            p50, p95, p99 = _spread(columns[idx] if columns else ())
+            percentiles[name] = {'p50': p50, 'p95': p95, 'p99': p99}
+        payload = {
+            'frames': len(self.history),
+            'columns': [f"{name}_ms" for name in self.phases] + list(COUNT_KEYS),
+            'percentiles_ms': percentiles,
+            'history': [list(row) for row in self.history],
+        }
+        path.write_text(json.dumps(payload), encoding='utf-8')
+        return path
+
+    def export(self, stem=None):
+        if not self.history:
+            return None
+        PROFILE_DIR.mkdir(exist_ok=True)
+        stem = stem or time.strftime("%Y%m%d-%H%M%S")
+        return (
+            self.export_csv(PROFILE_DIR / f"{stem}.csv"),
+            self.export_json(PROFILE_DIR / f"{stem}.json"),
+        )
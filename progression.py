@@ -1,7 +1,12 @@
+import atexit
 import json
+import os
+import threading
+import time
 from pathlib import Path
 
 PROGRESSION_PATH = Path(__file__).with_name("progression.json")
+FLUSH_INTERVAL_SECONDS = 10.0
 
 DEFAULT_PROGRESSION = {
     "level": 1,
@@ -95,9 +100,18 @@ def load_progression() -> dict:
     return clean
 
 
+def _write_atomic(path: Path, text: str) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        handle.write(text)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp_path, path)
+
+
 def save_progression(progression: dict) -> None:
     clean = _sanitize_progression(progression)
-    PROGRESSION_PATH.write_text(json.dumps(clean, indent=2), encoding="utf-8")
+    _write_atomic(PROGRESSION_PATH, json.dumps(clean, indent=2))
 
 
 def sync_unlocks(progression: dict) -> list[int]:
@@ -129,3 +143,124 @@ def add_xp(progression: dict, amount: int) -> dict:
         "levels_gained": levels_gained,
         "newly_unlocked": newly_unlocked,
     }
+
+
+def _read_journal(path: Path) -> list[tuple[int, int]]:
+    entries = []
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return entries
+    for line in lines:
+        parts = line.split()
+        if len(parts) != 2:
+            continue
+        try:
+            entries.append((int(parts[0]), int(parts[1])))
+        except ValueError:
+            continue
+    return entries
+
+
+class ProgressionStore:
+    def __init__(self, path=PROGRESSION_PATH, journal_path=None, flush_interval=FLUSH_INTERVAL_SECONDS):
+        self.path = Path(path)
+        self.journal_path = Path(journal_path) if journal_path else self.path.with_suffix(".journal")
+        self.flush_interval = flush_interval
+        self.writes = 0
+
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+        except Exception:
+            raw = None
+        self.data = _sanitize_progression(raw)
+        try:
+            self.seq = max(0, int(raw.get("journal_seq", 0))) if isinstance(raw, dict) else 0
+        except Exception:
+            self.seq = 0
+        for seq, amount in _read_journal(self.journal_path):
+            if seq > self.seq:
+                add_xp(self.data, amount)
+                self.seq = seq
+
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._pending = []
+        self._snapshot_due = True
+        self._last_snapshot = time.monotonic()
+        self._thread = None
+        self._closed = False
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="progression-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+            self._wake.set()
+        return self
+
+    def add_xp(self, amount) -> dict:
+        amount = max(0, int(amount))
+        with self._lock:
+            result = add_xp(self.data, amount)
+            if amount:
+                self.seq += 1
+                self._pending.append((self.seq, amount))
+        if amount:
+            self._wake.set()
+        return result
+
+    def request_flush(self) -> None:
+        with self._lock:
+            self._snapshot_due = True
+        self._wake.set()
+
+    def flush(self, snapshot=True) -> None:
+        with self._io_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+                snapshot = snapshot or self._snapshot_due
+                self._snapshot_due = False
+                if snapshot:
+                    clean = _sanitize_progression(self.data)
+                    clean["journal_seq"] = self.seq
+            try:
+                if pending:
+                    with open(self.journal_path, "a", encoding="utf-8") as handle:
+                        handle.write("".join(f"{seq} {amount}\n" for seq, amount in pending))
+                        handle.flush()
+                        os.fsync(handle.fileno())
+                    self.writes += 1
+                    pending = []
+                if snapshot:
+                    _write_atomic(self.path, json.dumps(clean, indent=2))
+                    self.journal_path.unlink(missing_ok=True)
+                    self._last_snapshot = time.monotonic()
+                    self.writes += 1
+            except OSError:
+                with self._lock:
+                    self._pending[:0] = pending
+                    self._snapshot_due = self._snapshot_due or snapshot
+                raise
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush(snapshot=True)
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self._closed:
+                break
+            timed_out = time.monotonic() - self._last_snapshot >= self.flush_interval
+            try:
+                self.flush(snapshot=timed_out)
+            except OSError:
+                continue
@@ -1,15 +1,43 @@
 import math
 import pygame
 
+from spatial import QUERY_MARGIN
+
+CHAIN_RADIUS = 100
+BOUNCE_RADIUS = 150
+RAILSHOT_LENGTH = 320
+RAILSHOT_WIDTH = 26
+
 try:
-    from assets import get as get_asset
+    from assets import rotations as get_rotations
 except Exception:
-    get_asset = None
+    get_rotations = None
+
+PROJECTILE_SPRITE_SIZE = 12
+PROJECTILE_POOL_CAPACITY = 128
+
+
+def _sprite_frames(tower_type):
+    if get_rotations is None:
+        return None
+    name = 'arrow_proj' if tower_type in ('physical', 'executioner') else 'missile_proj'
+    return get_rotations(name, size=PROJECTILE_SPRITE_SIZE)
 
 
 class Projectile:
+    __slots__ = (
+        'pos', 'target', 'dmg', 'dmg_type', 'tower_type', 'tower', 'speed', 'size', 'color', 'angle',
+        'bounces_left', 'hit_enemies', 'executioner_mark', 'executioner_percent', 'executioner_pierce',
+        'is_chain',
+    )
+
     def __init__(self, start_pos, target_enemy, dmg, dmg_type, tower_type, tower=None):
-        self.pos = pygame.Vector2(start_pos)
+        self.pos = pygame.Vector2()
+        self.hit_enemies = set()
+        self.reset(start_pos, target_enemy, dmg, dmg_type, tower_type, tower)
+
+    def reset(self, start_pos, target_enemy, dmg, dmg_type, tower_type, tower=None):
+        self.pos.update(start_pos)
         self.target = target_enemy
         self.dmg = dmg
         self.dmg_type = dmg_type
@@ -19,28 +47,12 @@ class Projectile:
         self.size = 4
         self.color = (0, 100, 255) if tower_type in ('physical', 'executioner') else (148, 0, 211)
         self.angle = 0
-        self.bounces_left = 0
-        self.hit_enemies = set()
+        self.bounces_left = 1 if tower and getattr(tower, 'bounce_enabled', False) else 0
+        self.hit_enemies.clear()
         self.executioner_mark = False
         self.executioner_percent = False
         self.executioner_pierce = False
-
-        if tower and hasattr(tower, 'bounce_enabled') and tower.bounce_enabled:
-            self.bounces_left = 1
-
-        if tower and hasattr(tower, 'chain_enabled') and tower.chain_enabled:
-            self.is_chain = True
-        else:
-            self.is_chain = False
-
-        self.sprite = None
-        if get_asset:
-            if tower_type == 'physical':
-                self.sprite = get_asset('arrow_proj', size=12)
-            elif tower_type == 'executioner':
-                self.sprite = get_asset('arrow_proj', size=12)
-            else:
-                self.sprite = get_asset('missile_proj', size=12)
+        self.is_chain = bool(tower and getattr(tower, 'chain_enabled', False))
 
     def _apply_direct_damage(self, enemy, damage_value):
         if self.tower and getattr(self.tower, 'targeting_mode', None) == 'strongest':
@@ -63,7 +75,12 @@ class Projectile:
                 bonus *= 0.4
             enemy.take_damage(bonus, self.dmg_type, source='projectile')
 
-    def _apply_railshot(self, enemies, hit_target, direction):
+    def _nearby(self, enemies, spatial_index, center, radius):
+        if spatial_index is None:
+            return enemies
+        return spatial_index.query_radius(center, radius + QUERY_MARGIN)
+
+    def _apply_railshot(self, enemies, hit_target, direction, spatial_index=None):
         if not enemies:
             return
 
@@ -72,16 +89,20 @@ class Projectile:
             return
         base_dir = base_dir.normalize()
 
+        if spatial_index is not None:
+            end = self.pos + base_dir * RAILSHOT_LENGTH
+            enemies = spatial_index.query_segment(self.pos, end, RAILSHOT_WIDTH + QUERY_MARGIN)
+
         candidates = []
         for enemy in enemies:
             if enemy is hit_target or enemy.hp <= 0 or id(enemy) in self.hit_enemies:
                 continue
             rel = enemy.pos - self.pos
             forward = rel.dot(base_dir)
-            if forward <= 0 or forward > 320:
+            if forward <= 0 or forward > RAILSHOT_LENGTH:
                 continue
             lateral = abs(rel.x * base_dir.y - rel.y * base_dir.x)
-            if lateral <= 26:
+            if lateral <= RAILSHOT_WIDTH:
                 candidates.append((forward, enemy))
 
         candidates.sort(key=lambda item: item[0])
@@ -97,7 +118,7 @@ class Projectile:
             pierce_scale *= 0.7
             hits += 1
 
-    def update(self, dt, enemies=None):
+    def update(self, dt, enemies=None, spatial_index=None):
         if not self.target:
             return False
 
@@ -121,27 +142,30 @@ class Projectile:
                 if self.is_chain and self.tower and enemies:
                     chain_count = getattr(self.tower, 'chain_count', 0)
                     if chain_count > 0:
-                        self._chain_to_nearby(enemies, chain_count)
+                        self._chain_to_nearby(enemies, chain_count, spatial_index)
 
                 if self.tower and hasattr(self.tower, 'aoe_enabled') and self.tower.aoe_enabled and enemies:
                     aoe_radius = getattr(self.tower, 'aoe_radius', 80)
-                    for enemy in enemies:
+                    for enemy in self._nearby(enemies, spatial_index, self.target.pos, aoe_radius):
                         if enemy != self.target and self.target.pos.distance_to(enemy.pos) < aoe_radius:
                             enemy.take_damage(self.dmg * 0.5, self.dmg_type, source='projectile')
 
                 if self.executioner_pierce:
-                    self._apply_railshot(enemies, self.target, hit_direction)
+                    self._apply_railshot(enemies, self.target, hit_direction, spatial_index)
 
             if self.bounces_left > 0 and enemies:
                 self.bounces_left -= 1
                 nearest_new_target = None
-                min_dist = float('inf')
-                for enemy in enemies:
-                    if id(enemy) not in self.hit_enemies and enemy.hp > 0:
-                        dist = self.pos.distance_to(enemy.pos)
-                        if dist < 150 and dist < min_dist:
-                            min_dist = dist
-                            nearest_new_target = enemy
+                if spatial_index is not None:
+                    nearest_new_target = spatial_index.query_nearest(self.pos, BOUNCE_RADIUS, exclude=self.hit_enemies)
+                else:
+                    min_dist = float('inf')
+                    for enemy in enemies:
+                        if id(enemy) not in self.hit_enemies and enemy.hp > 0:
+                            dist = self.pos.distance_to(enemy.pos)
+                            if dist < BOUNCE_RADIUS and dist < min_dist:
+                                min_dist = dist
+                                nearest_new_target = enemy
                 
                 if nearest_new_target:
                     self.target = nearest_new_target
@@ -154,65 +178,72 @@ class Projectile:
         self.pos += direction * self.speed * dt
         return True
     
-    def _chain_to_nearby(self, enemies, count):
-        chained = 0
-        for enemy in enemies:
-            if enemy != self.target and self.target.pos.distance_to(enemy.pos) < 100 and chained < count:
-                enemy.take_damage(self.dmg * 0.7, self.dmg_type, source='projectile')
+    def _chain_to_nearby(self, enemies, count, spatial_index=None):
+        origin = self.target.pos
+        in_reach = [
+            enemy for enemy in self._nearby(enemies, spatial_index, origin, CHAIN_RADIUS)
+            if enemy != self.target and origin.distance_to(enemy.pos) < CHAIN_RADIUS
+        ]
+        in_reach.sort(key=lambda enemy: origin.distance_squared_to(enemy.pos))
 
-                if self.tower and hasattr(self.tower, 'status_spread') and self.tower.status_spread:
-                    if hasattr(self.target, 'slow_stacks') and self.target.slow_stacks > 0:
-                        enemy.add_slow(self.target.slow_stacks * 0.5)
-                
-                chained += 1
+        for enemy in in_reach[:count]:
+            enemy.take_damage(self.dmg * 0.7, self.dmg_type, source='projectile')
+
+            if self.tower and hasattr(self.tower, 'status_spread') and self.tower.status_spread:
+                if hasattr(self.target, 'slow_stacks') and self.target.slow_stacks > 0:
+                    enemy.add_slow(self.target.slow_stacks * 0.5)
 
     def draw(self, screen):
-        if self.sprite:
-            rotated_sprite = pygame.transform.rotate(self.sprite, -self.angle)
-            rect = rotated_sprite.get_rect(center=(int(self.pos.x), int(self.pos.y)))
-            screen.blit(rotated_sprite, rect.topleft)
+        frames = _sprite_frames(self.tower_type)
+        if frames:
+            sprite = frames[int(round(self.angle * len(frames) / 360.0)) % len(frames)]
+            rect = sprite.get_rect(center=(int(self.pos.x), int(self.pos.y)))
+            screen.blit(sprite, rect.topleft)
         else:
             pygame.draw.circle(screen, self.color, (int(self.pos.x), int(self.pos.y)), self.size)
 
 
 class ProjectilePool:
-    def __init__(self):
-        self._pool = []
+    def __init__(self, capacity=PROJECTILE_POOL_CAPACITY):
+        self._pool = [Projectile((0, 0), None, 0, 'physical', 'physical') for _ in range(max(0, int(capacity)))]
+        self.acquired = 0
+        self.reused = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.peak_size = len(self._pool)
 
     def acquire(self, start_pos, target_enemy, dmg, dmg_type, tower_type, tower=None):
+        self.acquired += 1
+        self.in_use += 1
+        if self.in_use > self.peak_in_use:
+            self.peak_in_use = self.in_use
         if self._pool:
+            self.reused += 1
             projectile = self._pool.pop()
-            projectile.pos = pygame.Vector2(start_pos)
-            projectile.target = target_enemy
-            projectile.dmg = dmg
-            projectile.dmg_type = dmg_type
-            projectile.tower_type = tower_type
-            projectile.tower = tower
-            projectile.speed = 300
-            projectile.size = 4
-            projectile.color = (0, 100, 255) if tower_type in ('physical', 'executioner') else (148, 0, 211)
-            projectile.angle = 0
-            projectile.bounces_left = 1 if tower and hasattr(tower, 'bounce_enabled') and tower.bounce_enabled else 0
-            projectile.hit_enemies = set()
-            projectile.is_chain = bool(tower and hasattr(tower, 'chain_enabled') and tower.chain_enabled)
-            projectile.executioner_mark = False
-            projectile.executioner_percent = False
-            projectile.executioner_pierce = False
-            projectile.sprite = None
-            if get_asset:
-                if tower_type == 'physical':
-                    projectile.sprite = get_asset('arrow_proj', size=12)
-                elif tower_type == 'executioner':
-                    projectile.sprite = get_asset('arrow_proj', size=12)
-                else:
-                    projectile.sprite = get_asset('missile_proj', size=12)
+            projectile.reset(start_pos, target_enemy, dmg, dmg_type, tower_type, tower)
             return projectile
 
         return Projectile(start_pos, target_enemy, dmg, dmg_type, tower_type, tower)
 
     def release(self, projectile):
         if projectile:
+            projectile.target = None
+            projectile.tower = None
             self._pool.append(projectile)
+            self.in_use = max(0, self.in_use - 1)
+            if len(self._pool) > self.peak_size:
+                self.peak_size = len(self._pool)
+
+    def stats(self):
+        return {
+            'acquired': self.acquired,
+            'reused': self.reused,
+            'hit_rate': self.reused / self.acquired if self.acquired else 0.0,
+            'free': len(self._pool),
+            'peak_size': self.peak_size,
+            'in_use': self.in_use,
+            'peak_in_use': self.peak_in_use,
+        }
 
 
 class IceLaser:
@@ -226,7 +257,7 @@ class IceLaser:
         self.color = (120, 220, 255)
         self.width = 3
 
-    def update(self, dt, enemies=None):
+    def update(self, dt, enemies=None, spatial_index=None):
         if not self.active:
             return False
 
@@ -0,0 +1,144 @@
+import json
+import sys
+import time
+from pathlib import Path
+
+from simulation import FIXED_DT, Simulation
+
+REPLAY_VERSION = 1
+REPLAY_DIR = Path(__file__).with_name("replays")
+SUMMARY_KEYS = ('tick', 'result', 'wave', 'lives', 'money', 'kills', 'leaks')
+
+
+def run_result(sim):
+    if sim.game_won:
+        return 'victory'
+    if sim.game_over:
+        return 'defeat'
+    return 'stopped'
+
+
+def summarize(sim):
+    return {
+        'tick': sim.tick,
+        'result': run_result(sim),
+        'wave': sim.wave,
+        'lives': sim.lives,
+        'money': sim.money,
+        'kills': sim.kills,
+        'leaks': sim.leaks,
+    }
+
+
+class ReplayRecorder:
+    def __init__(self, sim):
+        self.header = {
+            'version': REPLAY_VERSION,
+            'seed': sim.seed,
+            'target_wave': sim.target_wave,
+            'modifier_id': sim.active_modifier_id,
+            'array_store': sim.enemy_store is not None,
+            'batch_targeting': sim.batch_targeting,
+        }
+        self.commands = []
+        self.summary = None
+
+    def attach(self, sim):
+        sim.on_command = self.record
+        return self
+
+    def record(self, tick, op, args):
+        self.commands.append({'tick': tick, 'op': op, **args})
+
+    def finish(self, sim):
+        self.summary = summarize(sim)
+
+    def save(self, path=None):
+        if path is None:
+            REPLAY_DIR.mkdir(exist_ok=True)
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            path = REPLAY_DIR / f"{stamp}-{self.header['seed']}.jsonl"
+        path = Path(path)
+        lines = [json.dumps(self.header)]
+        lines.extend(json.dumps(entry, separators=(',', ':')) for entry in self.commands)
+        if self.summary is not None:
+            lines.append(json.dumps({'op': 'end', **self.summary}, separators=(',', ':')))
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return path
+
+
+def load_replay(path):
+    header = None
+    commands = []
+    summary = None
+    with open(path, encoding="utf-8") as replay_file:
+        for line in replay_file:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            if header is None:
+                header = entry
+            elif entry.get('op') == 'end':
+                summary = {key: entry.get(key) for key in SUMMARY_KEYS}
+            else:
+                commands.append(entry)
+    if header is None:
+        raise ValueError(f"Empty replay file: {path}")
+    if header.get('version') != REPLAY_VERSION:
+        raise ValueError(f"Unsupported replay version: {header.get('version')}")
+    return header, commands, summary
+
+
+def start_playback(header, commands, include_speed=True, **sim_kwargs):
+    options = {
+        'array_store': header.get('array_store', False),
+        'batch_targeting': header.get('batch_targeting', False),
+    }
+    options.update(sim_kwargs)
+    sim = Simulation(target_wave=header['target_wave'], seed=header['seed'], **options)
+    sim.start(header.get('modifier_id'))
+    for entry in commands:
+        if entry['op'] == 'speed' and not include_speed:
+            continue
+        args = {key: value for key, value in entry.items() if key not in ('tick', 'op')}
+        sim.queue_command(entry['tick'], entry['op'], args)
+    return sim
+
+
+def verify_replay(path, max_ticks=None):
+    header, commands, expected = load_replay(path)
+    sim = start_playback(header, commands, include_speed=False)
+    started = time.perf_counter()
+    while not sim.finished and (max_ticks is None or sim.tick < max_ticks):
+        sim.step(FIXED_DT)
+    elapsed = time.perf_counter() - started
+    actual = summarize(sim)
+    matches = None
+    if expected is not None and (sim.finished or actual['tick'] >= expected['tick']):
+        matches = actual == expected
+    return {
+        'replay': str(path),
+        'seed': header['seed'],
+        'commands': len(commands),
+        'actual': actual,
+        'expected': expected,
+        'matches': matches,
+        'wall_seconds': round(elapsed, 3),
+    }
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("usage: python replay.py REPLAY_FILE [MAX_TICKS]")
+        return 2
+    max_ticks = int(argv[1]) if len(argv) > 1 else None
+    report = verify_replay(argv[0], max_ticks=max_ticks)
+    for key, value in report.items():
+        print(f"{key}: {value}")
+    return 0 if report['matches'] is not False else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,607 @@
+import argparse
+import math
+import random
+import sys
+import time
+from collections import deque
+
+import pygame
+
+from constants import FPS, GRID_H, GRID_W, TILE, TOWER_COSTS, TRAP_COSTS
+from economy import calculate_interest, get_structure_sell_value
+from enemy import Enemy, invalidate_path_cache
+from enemy_store import EnemyStore, store_available
+from maze import create_maze, expand_paths
+from modifiers import compile_run_effects
+from placement_rules import can_place_tower, can_place_trap
+from profiler import FrameProfiler
+from entity_list import EntityList
+from projectiles import IceLaser, ProjectilePool
+from spatial import SpatialHash, StructureGrid, TileIndex
+from spawn_scaling import apply_spawn_scaling, compute_enemy_scale_increment
+from targeting import plan_targets, targeting_available
+from tower_scheduler import TowerScheduler
+from tower import Tower
+from traps import Trap
+from wave_progression import get_wave_enemy_count
+from wave_templates import choose_enemy_type, get_spawn_interval
+
+START_MONEY = 400
+START_LIVES = 25
+SWARM_GROUP_SIZE = 4
+SWARM_SPAWN_SPACING = 0.15
+TOWER_TYPES = ('physical', 'magic', 'ice', 'executioner')
+SPEEDS = (1, 2, 3)
+STRUCTURE_OPS = ('upgrade', 'sell', 'target')
+TRAP_TYPES = ('fire', 'spikes')
+FIXED_DT = 1.0 / FPS
+MAX_SUBSTEPS = 12
+RNG_STREAMS = ('maze', 'waves', 'spawns', 'enemies')
+
+
+def make_rng_streams(seed):
+    return {name: random.Random(f"{seed}:{name}") for name in RNG_STREAMS}
+
+
+class Simulation:
+    def __init__(self, target_wave=50, modifier_id=None, on_xp=None, on_tiles_carved=None, seed=None, on_command=None, on_wave_cleared=None, profiler=None, array_store=False, batch_targeting=False, schedule_towers=True):
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = make_rng_streams(self.seed)
+        self.tick = 0
+        self.accumulator = 0.0
+        self.speed = 1
+        self.grid, self.spawn_points, self.goal = create_maze(rng=self.rng['maze'])
+        invalidate_path_cache()
+        self.towers = []
+        self.enemies = EntityList()
+        self.traps = []
+        self.projectiles = EntityList()
+        self.money = START_MONEY
+        self.lives = START_LIVES
+        self.wave = 0
+        self.wave_enemies_left = 0
+        self.wave_timer = 0
+        self.boss_spawn_lane = None
+        self.enemy_scale = 1.0
+        self.target_wave = target_wave
+        self.boss_popup_counter = 0
+        self.game_won = False
+        self.game_over = False
+        self.projectile_pool = ProjectilePool()
+        self.spatial_index = SpatialHash()
+        self.tile_index = TileIndex()
+        self.structures = StructureGrid()
+        self.last_interest_wave = 0
+        self.last_wave_xp_awarded = 0
+        self.pending_spawns = []
+        self.spawn_clock = 0.0
+        self.wave_swarm_spawn_count = 0
+        self.rapid_deployment_wave_used = -1
+        self.active_modifier_id = modifier_id
+        self.run_effects = compile_run_effects(modifier_id)
+        self.on_xp = on_xp
+        self.on_tiles_carved = on_tiles_carved
+        self.on_command = on_command
+        self.on_wave_cleared = on_wave_cleared
+        self.command_queue = deque()
+        self.profiler = profiler if profiler is not None else FrameProfiler()
+        self.enemy_store = EnemyStore() if array_store and store_available() else None
+        self.batch_targeting = bool(batch_targeting and targeting_available())
+        self.tower_scheduler = TowerScheduler(self.spatial_index) if schedule_towers else None
+        self.kills = 0
+        self.leaks = 0
+
+    def start(self, modifier_id=None):
+        self.active_modifier_id = modifier_id
+        self.run_effects = compile_run_effects(modifier_id)
+        self.money += int(self.run_effects.get('start_gold_bonus', 0))
+        self.next_wave()
+
+    def next_wave(self):
+        self.wave += 1
+        self.rapid_deployment_wave_used = -1
+
+        self.wave_enemies_left = max(2, get_wave_enemy_count(self.wave, self.target_wave))
+
+        if self.wave % 5 == 0:
+            carved_tiles, towers_to_remove, spawn_point = expand_paths(self.grid, self.towers, self.spawn_points, rng=self.rng['maze'])
+            invalidate_path_cache(carved_tiles)
+            if self.on_tiles_carved:
+                self.on_tiles_carved(carved_tiles)
+            for tower in towers_to_remove:
+                self.remove_structure(tower)
+
+            if spawn_point and spawn_point not in self.spawn_points:
+                self.spawn_points.append(spawn_point)
+            self.boss_spawn_lane = self.rng['waves'].choice(self.spawn_points)
+        else:
+            self.boss_spawn_lane = None
+
+        self.boss_popup_counter = 0
+        self.pending_spawns = []
+        self.wave_swarm_spawn_count = 0
+
+        increment = compute_enemy_scale_increment(self.wave)
+        if increment > 0:
+            self.enemy_scale *= 1.0 + increment
+
+    def award_xp(self, amount):
+        if amount > 0 and self.on_xp:
+            self.on_xp(int(amount))
+
+    def apply_tower_modifier_effects(self, tower):
+        tower.dmg *= self.run_effects['tower_damage_mult']
+        if tower.type == 'physical':
+            tower.dmg *= self.run_effects['archer_damage_mult']
+        if tower.type == 'magic':
+            tower.attack_interval *= self.run_effects['magic_interval_mult']
+        tower.attack_interval *= self.run_effects['tower_attack_interval_mult']
+        tower.range *= self.run_effects['tower_range_mult']
+        tower.focused_targeting_bonus = self.run_effects['focused_targeting_bonus']
+
+    def apply_trap_modifier_effects(self, trap):
+        if trap.trap_type == 'spikes':
+            trap.damage *= self.run_effects['spike_damage_mult']
+
+    def apply_enemy_modifier_effects(self, enemy):
+        enemy.speed *= self.run_effects['enemy_speed_mult']
+        enemy.base_speed *= self.run_effects['enemy_speed_mult']
+        enemy.reward = int(enemy.reward * self.run_effects['enemy_reward_mult'])
+        enemy.slow_decay_rate *= self.run_effects['slow_decay_mult']
+        enemy.burn_dot_multiplier = self.run_effects['burn_dot_mult']
+
+    def tower_cost(self, tower_type):
+        cost = TOWER_COSTS[tower_type]
+        if self.run_effects['rapid_deployment'] and self.rapid_deployment_wave_used != self.wave:
+            cost = int(cost * 0.85)
+        return cost
+
+    def build_tower(self, gx, gy, tower_type):
+        if self.game_won or not can_place_tower(self.grid, gx, gy, self.towers, TILE, GRID_W, GRID_H, occupancy=self.structures):
+            return None
+        cost = self.tower_cost(tower_type)
+        if self.money < cost:
+            return None
+        tower = Tower(pygame.Vector2(gx * TILE + TILE // 2, gy * TILE + TILE // 2), tower_type)
+        self.apply_tower_modifier_effects(tower)
+        tower.upgrade_spent = 0
+        tower.build_cost = cost
+        self.add_tower(tower)
+        self.money -= cost
+        if self.run_effects['rapid_deployment'] and self.rapid_deployment_wave_used != self.wave:
+            self.rapid_deployment_wave_used = self.wave
+        return tower
+
+    def build_trap(self, gx, gy, trap_type):
+        if self.game_won or not can_place_trap(self.grid, gx, gy, self.towers, self.traps, GRID_W, GRID_H, TILE, occupancy=self.structures):
+            return None
+        cost = TRAP_COSTS.get(trap_type, 0)
+        if self.money < cost:
+            return None
+        trap = Trap((gx, gy), trap_type)
+        self.apply_trap_modifier_effects(trap)
+        trap.upgrade_spent = 0
+        trap.build_cost = cost
+        self.add_trap(trap)
+        self.money -= cost
+        return trap
+
+    def add_tower(self, tower):
+        tower.on_change = self._tower_changed
+        self.towers.append(tower)
+        self.structures.add_tower(tower)
+
+    def add_trap(self, trap):
+        self.traps.append(trap)
+        self.structures.add_trap(trap)
+
+    def remove_structure(self, structure):
+        if structure in self.towers:
+            self.towers.remove(structure)
+            structure.on_change = None
+        elif structure in self.traps:
+            self.traps.remove(structure)
+        self.structures.remove(structure)
+
+    def _tower_changed(self, tower):
+        self.structures.move(tower)
+        if self.tower_scheduler is not None:
+            self.tower_scheduler.wake(tower)
+
+    def can_build(self, gx, gy, structure_type):
+        if self.game_won:
+            return False
+        if structure_type in TOWER_TYPES:
+            return can_place_tower(self.grid, gx, gy, self.towers, TILE, GRID_W, GRID_H, occupancy=self.structures)
+        if structure_type in TRAP_TYPES:
+            return can_place_trap(self.grid, gx, gy, self.towers, self.traps, GRID_W, GRID_H, TILE, occupancy=self.structures)
+        return False
+
+    def build(self, gx, gy, structure_type):
+        if structure_type in TOWER_TYPES:
+            return self.build_tower(gx, gy, structure_type)
+        if structure_type in TRAP_TYPES:
+            return self.build_trap(gx, gy, structure_type)
+        return None
+
+    def upgrade_structure(self, structure, path):
+        upgrade_name, upgrade_cost = structure.get_upgrade_info(path)
+        if not upgrade_name or self.money < upgrade_cost or not structure.can_upgrade(path):
+            return False
+        if not structure.upgrade(path):
+            return False
+        if self.tower_scheduler is not None:
+            self.tower_scheduler.wake(structure)
+        self.money -= upgrade_cost
+        structure.upgrade_spent = getattr(structure, 'upgrade_spent', 0) + upgrade_cost
+        return True
+
+    def sell_value(self, structure):
+        return get_structure_sell_value(structure, refund_rate=self.run_effects['sell_refund_rate'])
+
+    def sell_structure(self, structure):
+        value = self.sell_value(structure)
+        self.money += value
+        self.remove_structure(structure)
+        return value
+
+    def structure_tile(self, structure):
+        tile = self.structures.tile_of(structure)
+        if tile is not None:
+            return tile
+        if structure in self.traps:
+            return tuple(structure.grid_pos)
+        return (int(structure.pos.x // TILE), int(structure.pos.y // TILE))
+
+    def structure_at_tile(self, gx, gy):
+        return self.structures.at((gx, gy))
+
+    def command(self, op, **args):
+        result = self._apply_command(op, args)
+        if result and self.on_command:
+            self.on_command(self.tick, op, args)
+        return result
+
+    def queue_command(self, tick, op, args):
+        self.command_queue.append((tick, op, args))
+
+    def _apply_queued_commands(self):
+        while self.command_queue and self.command_queue[0][0] <= self.tick:
+            _, op, args = self.command_queue.popleft()
+            self.command(op, **args)
+
+    def _apply_command(self, op, args):
+        if op == 'build':
+            return self.build(args['gx'], args['gy'], args['structure_type'])
+        if op == 'speed':
+            if args['speed'] not in SPEEDS:
+                return False
+            self.speed = args['speed']
+            return True
+        if op not in STRUCTURE_OPS:
+            raise ValueError(f"Unknown command: {op}")
+
+        structure = self.structure_at_tile(args['gx'], args['gy'])
+        if structure is None:
+            return None
+        if op == 'upgrade':
+            return self.upgrade_structure(structure, args['path'])
+        if op == 'sell':
+            self.sell_structure(structure)
+            return True
+        if op == 'target':
+            if not hasattr(structure, 'targeting_mode'):
+                return False
+            structure.targeting_mode = args['mode']
+            return True
+
+    def structure_at(self, x, y):
+        return self.structures.pick(x, y)
+
+    def _check_wave_complete(self):
+        if self.wave_enemies_left != 0 or self.enemies or self.game_won or self.pending_spawns:
+            return
+        if self.wave > 0 and self.last_wave_xp_awarded != self.wave:
+            self.award_xp(8 + self.wave * 2)
+            self.last_wave_xp_awarded = self.wave
+            if self.on_wave_cleared:
+                self.on_wave_cleared(self.wave)
+        if self.wave > 0 and self.last_interest_wave != self.wave:
+            interest_cap = 150 + int(self.run_effects.get('interest_cap_bonus', 0))
+            interest = calculate_interest(self.money, cap=interest_cap)
+            interest = int(interest * self.run_effects.get('interest_mult', 1.0))
+            self.money += max(0, interest)
+            self.last_interest_wave = self.wave
+
+        if self.wave < self.target_wave:
+            self.next_wave()
+        elif self.wave == self.target_wave:
+            self.game_won = True
+
+    def _spawn_enemy(self, enemy_type, spawn_tile, swarm=False):
+        enemy = Enemy(self.grid, spawn_tile, self.goal, enemy_type, scale=self.enemy_scale, rng=self.rng['enemies'])
+        self.apply_enemy_modifier_effects(enemy)
+        if swarm:
+            enemy.pos.x += self.rng['spawns'].uniform(-4.0, 4.0)
+            enemy.pos.y += self.rng['spawns'].uniform(-4.0, 4.0)
+            self.wave_swarm_spawn_count += 1
+            apply_spawn_scaling(enemy, self.wave, swarm_spawn_index=self.wave_swarm_spawn_count)
+        else:
+            apply_spawn_scaling(enemy, self.wave)
+        self.enemies.append(enemy)
+        return enemy
+
+    def _update_spawns(self, dt):
+        self.spawn_clock += dt
+
+        if self.pending_spawns:
+            ready_spawns = [entry for entry in self.pending_spawns if entry['spawn_time'] <= self.spawn_clock]
+            if ready_spawns:
+                self.pending_spawns = [entry for entry in self.pending_spawns if entry['spawn_time'] > self.spawn_clock]
+                for entry in ready_spawns:
+                    spawn_tile = entry['spawn_point'] if entry['spawn_point'] in self.spawn_points else self.rng['spawns'].choice(self.spawn_points)
+                    self._spawn_enemy(entry['enemy_type'], spawn_tile, swarm=entry['enemy_type'] == 'swarm')
+
+        spawn_interval = get_spawn_interval(self.wave)
+        self.wave_timer += dt
+        if self.wave_enemies_left > 0 and self.wave_timer >= spawn_interval:
+            if self.wave_enemies_left == 1 and self.wave % 5 == 0:
+                etype = 'demon_boss' if self.wave % 10 == 0 else 'minotaur_boss'
+                spawn = self.boss_spawn_lane
+                self.boss_popup_counter = 60
+            else:
+                regular_budget = self.wave_enemies_left - 1 if self.wave % 5 == 0 else self.wave_enemies_left
+                etype = choose_enemy_type(self.wave, self.enemies, wave_enemies_left=regular_budget, rng=self.rng['waves'])
+                spawn = self.rng['waves'].choice(self.spawn_points)
+
+            if etype == 'swarm':
+                burst_budget = self.wave_enemies_left - 1 if self.wave % 5 == 0 else self.wave_enemies_left
+                burst_count = max(0, min(SWARM_GROUP_SIZE, burst_budget))
+                if burst_count > 0:
+                    for i in range(burst_count):
+                        self.pending_spawns.append({
+                            'enemy_type': 'swarm',
+                            'spawn_point': spawn,
+                            'spawn_time': self.spawn_clock + (i * SWARM_SPAWN_SPACING),
+                        })
+                    self.wave_enemies_left -= burst_count
+            else:
+                self._spawn_enemy(etype, spawn)
+                self.wave_enemies_left -= 1
+            self.wave_timer = 0
+
+    def _resolve_enemies(self):
+        enemies = self.enemies
+        arrived = {id(e) for e in self.tile_index.at(self.goal)}
+        for e in enemies:
+            if id(e) in arrived:
+                self.lives -= 1
+                self.leaks += 1
+                e.hp = 0
+                enemies.mark_dead(e)
+                self.spatial_index.remove(e)
+            elif e.hp <= 0:
+                self.money += int(e.reward * 1.5 * self.run_effects.get('kill_reward_mult', 1.0))
+                kill_xp = int(e.reward * 0.6)
+                if getattr(e, 'is_boss', False):
+                    kill_xp += 40
+                self.award_xp(kill_xp)
+                self.kills += 1
+                enemies.mark_dead(e)
+                self.spatial_index.remove(e)
+        enemies.compact()
+
+        if self.lives <= 0:
+            self.game_over = True
+            self.game_won = False
+
+    def step(self, dt):
+        if self.game_over or self.game_won:
+            return
+        self._apply_queued_commands()
+        self._check_wave_complete()
+        if self.game_won:
+            return
+
+        self.tick += 1
+        span = self.profiler.span
+        with span('spawn'):
+            self._update_spawns(dt)
+        with span('enemy_logic'):
+            self._update_enemies(dt)
+        with span('spatial_rebuild'):
+            self._rebuild_spatial_index()
+        with span('tower_update'):
+            self._update_towers(dt)
+        with span('projectile_update'):
+            self._update_projectiles(dt)
+        with span('trap_update'):
+            self._update_traps(dt)
+        with span('death_resolution'):
+            self._resolve_enemies()
+
+    def _update_enemies(self, dt):
+        if self.enemy_store is not None:
+            self.enemy_store.update(self.enemies, dt, towers=self.towers, spawn_points=self.spawn_points, goal_grid=self.goal)
+            return
+        for e in self.enemies:
+            e.logic(self.enemies, dt, towers=self.towers, spawn_points=self.spawn_points, goal_grid=self.goal)
+
+    def _rebuild_spatial_index(self):
+        self.spatial_index.sync(self.enemies)
+        self.tile_index.rebuild(self.enemies)
+
+    def _update_towers(self, dt):
+        scheduler = self.tower_scheduler
+        towers = scheduler.due(self.towers, dt) if scheduler is not None else self.towers
+        plan = plan_targets(towers, self.enemies, dt) if self.batch_targeting else None
+        pulled = False
+        for idx, t in enumerate(towers):
+            if getattr(t, 'stun_timer', 0.0) > 0:
+                t.stun_timer = max(0.0, t.stun_timer - dt)
+                continue
+            if t.type == 'magic' and t.pull_enabled:
+                pulled = True
+            targets = plan[idx] if plan is not None else None
+            projectile = t.update(self.enemies, dt=dt, spatial_index=self.spatial_index, projectile_pool=self.projectile_pool, targets=targets)
+            if projectile:
+                if isinstance(projectile, list):
+                    self.projectiles.extend(projectile)
+                else:
+                    self.projectiles.append(projectile)
+        if scheduler is not None:
+            scheduler.settle()
+        if pulled:
+            self.tile_index.sync(self.enemies)
+
+    def _update_projectiles(self, dt):
+        projectiles = self.projectiles
+        for p in projectiles:
+            if not p.update(dt, self.enemies, spatial_index=self.spatial_index):
+                projectiles.mark_dead(p)
+                if not isinstance(p, IceLaser):
+                    self.projectile_pool.release(p)
+        projectiles.compact()
+
+    def _update_traps(self, dt):
+        for tr in self.traps:
+            tr.update(self.enemies, dt, spatial_index=self.spatial_index, tile_index=self.tile_index)
+
+    def advance(self, frame_dt):
+        self.accumulator += frame_dt * self.speed
+        steps = 0
+        while self.accumulator >= FIXED_DT and steps < MAX_SUBSTEPS:
+            self.step(FIXED_DT)
+            self.accumulator -= FIXED_DT
+            steps += 1
+        if steps == MAX_SUBSTEPS:
+            self.accumulator = min(self.accumulator, FIXED_DT)
+        return steps
+
+    def entity_counts(self):
+        return {
+            'enemies': len(self.enemies),
+            'towers': len(self.towers),
+            'traps': len(self.traps),
+            'projectiles': len(self.projectiles),
+            'pending_spawns': len(self.pending_spawns),
+        }
+
+    @property
+    def finished(self):
+        return self.game_over or self.game_won
+
+
+class AutoBuilder:
+    def __init__(self, build_order=('physical', 'magic', 'physical', 'ice'), upgrade_path=1):
+        self.build_order = list(build_order)
+        self.upgrade_path = upgrade_path
+        self.build_index = 0
+        self._scored_tiles = None
+        self._scored_spawn_count = 0
+
+    def _score_tiles(self, sim):
+        path_centers = [
+            (x * TILE + TILE // 2, y * TILE + TILE // 2)
+            for y in range(GRID_H) for x in range(GRID_W) if sim.grid[y][x] == 2
+        ]
+        scored = []
+        for y in range(GRID_H):
+            for x in range(GRID_W):
+                if sim.grid[y][x] != 0:
+                    continue
+                cx, cy = x * TILE + TILE // 2, y * TILE + TILE // 2
+                coverage = sum(1 for px, py in path_centers if math.hypot(px - cx, py - cy) < 130)
+                goal_bias = abs(x - sim.goal[0]) + abs(y - sim.goal[1])
+                scored.append((-coverage, goal_bias, x, y))
+        scored.sort()
+        return [(x, y) for _, _, x, y in scored]
+
+    def __call__(self, sim):
+        if self._scored_tiles is None or self._scored_spawn_count != len(sim.spawn_points):
+            self._scored_tiles = self._score_tiles(sim)
+            self._scored_spawn_count = len(sim.spawn_points)
+
+        tower_type = self.build_order[self.build_index % len(self.build_order)]
+        if sim.money < sim.tower_cost(tower_type):
+            return
+        for gx, gy in self._scored_tiles:
+            if sim.command('build', gx=gx, gy=gy, structure_type=tower_type):
+                self.build_index += 1
+                return
+        for tower in sim.towers:
+            gx, gy = sim.structure_tile(tower)
+            if sim.command('upgrade', gx=gx, gy=gy, path=self.upgrade_path):
+                return
+
+
+def run_headless(target_wave=50, modifier_id=None, seed=None, max_ticks=None, autoplay=True, record_path=None, array_store=False, batch_targeting=False):
+    sim = Simulation(target_wave=target_wave, seed=seed, array_store=array_store, batch_targeting=batch_targeting)
+    sim.start(modifier_id)
+    recorder = None
+    if record_path:
+        from replay import ReplayRecorder
+        recorder = ReplayRecorder(sim).attach(sim)
+    policy = AutoBuilder() if autoplay else None
+    started = time.perf_counter()
+    while not sim.finished and (max_ticks is None or sim.tick < max_ticks):
+        if policy:
+            policy(sim)
+        sim.step(FIXED_DT)
+    elapsed = time.perf_counter() - started
+    if recorder:
+        recorder.finish(sim)
+        recorder.save(record_path)
+    return {
+        'seed': sim.seed,
+        'result': 'victory' if sim.game_won else ('defeat' if sim.game_over else 'stopped'),
+        'wave': sim.wave,
+        'lives': sim.lives,
+        'money': sim.money,
+        'kills': sim.kills,
+        'leaks': sim.leaks,
+        'towers': len(sim.towers),
+        'ticks': sim.tick,
+        'sim_seconds': round(sim.tick * FIXED_DT, 2),
+        'wall_seconds': round(elapsed, 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run Maze Treasure Defense without a display.")
+    parser.add_argument('--headless', action='store_true', help="accepted for parity with main.py")
+    parser.add_argument('--waves', type=int, default=50, help="target wave")
+    parser.add_argument('--modifier', type=int, default=None, help="run modifier id")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--max-ticks', type=int, default=None)
+    parser.add_argument('--no-autoplay', action='store_true', help="do not build towers")
+    parser.add_argument('--record', default=None, help="write a replay of the run to this file")
+    parser.add_argument('--replay', default=None, help="re-run a replay file and check its recorded result")
+    parser.add_argument('--array-store', action='store_true', help="batch enemy movement and damage-over-time with numpy")
+    parser.add_argument('--batch-targeting', action='store_true', help="pick tower targets for the whole tick with numpy")
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        from replay import verify_replay
+        report = verify_replay(args.replay, max_ticks=args.max_ticks)
+        for key, value in report.items():
+            print(f"{key}: {value}")
+        return 0 if report['matches'] is not False else 1
+
+    summary = run_headless(
+        target_wave=args.waves,
+        modifier_id=args.modifier,
+        seed=args.seed,
+        max_ticks=args.max_ticks,
+        autoplay=not args.no_autoplay,
+        record_path=args.record,
+        array_store=args.array_store,
+        batch_targeting=args.batch_targeting,
+    )
+    for key, value in summary.items():
+        print(f"{key}: {value}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,5 +1,18 @@
+import heapq
+import math
+
 from constants import TILE
 
+QUERY_MARGIN = TILE // 4
+
+
+def _insert_ordered(bucket, entity):
+    order = entity.spatial_order
+    index = len(bucket)
+    while index and bucket[index - 1].spatial_order > order:
+        index -= 1
+    bucket.insert(index, entity)
+
 
 class SpatialHash:
     def __init__(self, cell_size=TILE * 2):
@@ -15,8 +28,43 @@ class SpatialHash:
     def rebuild(self, entities):
         self.clear()
         for entity in entities:
-            key = self._key(entity.pos)
-            self.buckets.setdefault(key, []).append(entity)
+            self.insert(entity)
+
+    def insert(self, entity):
+        key = self._key(entity.pos)
+        entity.spatial_key = key
+        self.buckets.setdefault(key, []).append(entity)
+
+    def remove(self, entity):
+        key = getattr(entity, 'spatial_key', None)
+        bucket = self.buckets.get(key)
+        if bucket is not None and entity in bucket:
+            bucket.remove(entity)
+            if not bucket:
+                del self.buckets[key]
+        entity.spatial_key = None
+
+    def sync(self, entities):
+        cell = self.cell_size
+        buckets = self.buckets
+        moved = 0
+        for order, entity in enumerate(entities):
+            entity.spatial_order = order
+            pos = entity.pos
+            key = (int(pos.x // cell), int(pos.y // cell))
+            old_key = getattr(entity, 'spatial_key', None)
+            if key == old_key:
+                continue
+            if old_key is not None:
+                bucket = buckets.get(old_key)
+                if bucket is not None and entity in bucket:
+                    bucket.remove(entity)
+                    if not bucket:
+                        del buckets[old_key]
+            entity.spatial_key = key
+            _insert_ordered(buckets.setdefault(key, []), entity)
+            moved += 1
+        return moved
 
     def query_radius(self, center, radius):
         min_x = int((center.x - radius) // self.cell_size)
@@ -29,3 +77,216 @@ class SpatialHash:
             for by in range(min_y, max_y + 1):
                 results.extend(self.buckets.get((bx, by), []))
         return results
+
+    def cells_within(self, center, radius):
+        span = radius + QUERY_MARGIN
+        min_x = int((center.x - span) // self.cell_size)
+        max_x = int((center.x + span) // self.cell_size)
+        min_y = int((center.y - span) // self.cell_size)
+        max_y = int((center.y + span) // self.cell_size)
+        return [(bx, by) for bx in range(min_x, max_x + 1) for by in range(min_y, max_y + 1)]
+
+    def iter_within(self, center, radius, alive_only=True):
+        cx = center.x
+        cy = center.y
+        radius_sq = radius * radius
+        span = radius + QUERY_MARGIN
+        min_x = int((cx - span) // self.cell_size)
+        max_x = int((cx + span) // self.cell_size)
+        min_y = int((cy - span) // self.cell_size)
+        max_y = int((cy + span) // self.cell_size)
+
+        for bx in range(min_x, max_x + 1):
+            for by in range(min_y, max_y + 1):
+                bucket = self.buckets.get((bx, by))
+                if not bucket:
+                    continue
+                for entity in bucket:
+                    if alive_only and entity.hp <= 0:
+                        continue
+                    dx = entity.pos.x - cx
+                    dy = entity.pos.y - cy
+                    if dx * dx + dy * dy < radius_sq:
+                        yield entity
+
+    def query_within(self, center, radius, out=None, alive_only=True):
+        if out is None:
+            out = []
+        else:
+            out.clear()
+        out.extend(self.iter_within(center, radius, alive_only))
+        return out
+
+    def query_nearest(self, center, radius, exclude=()):
+        nearest = None
+        best_sq = radius * radius
+        for entity in self.iter_within(center, radius):
+            if id(entity) in exclude:
+                continue
+            dx = entity.pos.x - center.x
+            dy = entity.pos.y - center.y
+            dist_sq = dx * dx + dy * dy
+            if dist_sq < best_sq:
+                best_sq = dist_sq
+                nearest = entity
+        return nearest
+
+    def query_k_best(self, center, radius, key, k=1):
+        candidates = self.iter_within(center, radius)
+        if k == 1:
+            best = max(candidates, key=key, default=None)
+            return [best] if best is not None else []
+        return heapq.nlargest(k, candidates, key=key)
+
+    def query_segment(self, start, end, radius):
+        min_x = int((min(start.x, end.x) - radius) // self.cell_size)
+        max_x = int((max(start.x, end.x) + radius) // self.cell_size)
+        min_y = int((min(start.y, end.y) - radius) // self.cell_size)
+        max_y = int((max(start.y, end.y) + radius) // self.cell_size)
+
+        seg_x = end.x - start.x
+        seg_y = end.y - start.y
+        seg_len_sq = seg_x * seg_x + seg_y * seg_y
+        half = self.cell_size / 2
+        reach = radius + half * math.sqrt(2)
+        reach_sq = reach * reach
+
+        results = []
+        for bx in range(min_x, max_x + 1):
+            for by in range(min_y, max_y + 1):
+                bucket = self.buckets.get((bx, by))
+                if not bucket:
+                    continue
+                cx = bx * self.cell_size + half - start.x
+                cy = by * self.cell_size + half - start.y
+                t = 0.0
+                if seg_len_sq > 0:
+                    t = max(0.0, min(1.0, (cx * seg_x + cy * seg_y) / seg_len_sq))
+                dx = cx - seg_x * t
+                dy = cy - seg_y * t
+                if dx * dx + dy * dy <= reach_sq:
+                    results.extend(bucket)
+        return results
+
+
+class TileIndex:
+    def __init__(self):
+        self.buckets = {}
+
+    def clear(self):
+        self.buckets.clear()
+
+    def rebuild(self, entities):
+        self.clear()
+        for entity in entities:
+            tile = (int(entity.pos.x // TILE), int(entity.pos.y // TILE))
+            entity.tile = tile
+            self.buckets.setdefault(tile, []).append(entity)
+
+    def sync(self, entities):
+        buckets = self.buckets
+        moved = 0
+        for order, entity in enumerate(entities):
+            entity.spatial_order = order
+            tile = (int(entity.pos.x // TILE), int(entity.pos.y // TILE))
+            old_tile = entity.tile
+            if tile == old_tile:
+                continue
+            bucket = buckets.get(old_tile)
+            if bucket is not None and entity in bucket:
+                bucket.remove(entity)
+                if not bucket:
+                    del buckets[old_tile]
+            entity.tile = tile
+            _insert_ordered(buckets.setdefault(tile, []), entity)
+            moved += 1
+        return moved
+
+    def at(self, tile):
+        return self.buckets.get(tile, ())
+
+
+def structure_tile(structure):
+    grid_pos = getattr(structure, 'grid_pos', None)
+    if grid_pos is not None:
+        return tuple(grid_pos)
+    return (int(structure.pos.x // TILE), int(structure.pos.y // TILE))
+
+
+class StructureGrid:
+    def __init__(self):
+        self.towers = {}
+        self.traps = {}
+        self.tiles = {}
+        self.order = {}
+        self.serial = 0
+
+    def clear(self):
+        self.towers.clear()
+        self.traps.clear()
+        self.tiles.clear()
+        self.order.clear()
+
+    def _add(self, cells, structure):
+        tile = structure_tile(structure)
+        cells[tile] = structure
+        self.tiles[structure] = tile
+        self.order[structure] = self.serial
+        self.serial += 1
+        return tile
+
+    def add_tower(self, tower):
+        return self._add(self.towers, tower)
+
+    def add_trap(self, trap):
+        return self._add(self.traps, trap)
+
+    def remove(self, structure):
+        tile = self.tiles.pop(structure, None)
+        self.order.pop(structure, None)
+        if tile is None:
+            return
+        for cells in (self.towers, self.traps):
+            if cells.get(tile) is structure:
+                del cells[tile]
+
+    def move(self, tower):
+        old_tile = self.tiles.get(tower)
+        if old_tile is None:
+            return
+        tile = structure_tile(tower)
+        if tile == old_tile:
+            return
+        if self.towers.get(old_tile) is tower:
+            del self.towers[old_tile]
+        self.towers[tile] = tower
+        self.tiles[tower] = tile
+
+    def tile_of(self, structure):
+        return self.tiles.get(structure)
+
+    def tower_at(self, tile):
+        return self.towers.get(tile)
+
+    def trap_at(self, tile):
+        return self.traps.get(tile)
+
+    def at(self, tile):
+        tower = self.towers.get(tile)
+        return tower if tower is not None else self.traps.get(tile)
+
+    def pick(self, x, y):
+        gx = int(x // TILE)
+        gy = int(y // TILE)
+        tower = self.towers.get((gx, gy))
+        if tower is not None and math.hypot(tower.pos.x - x, tower.pos.y - y) < tower.size * 1.2:
+            return tower
+        best = None
+        for tx in (gx - 1, gx, gx + 1):
+            for ty in (gy - 1, gy, gy + 1):
+                trap = self.traps.get((tx, ty))
+                if trap is None or math.hypot(trap.pos.x - x, trap.pos.y - y) >= TILE:
+                    continue
+                if best is None or self.order[trap] < self.order[best]:
+                    best = trap
+        return best
@@ -1,3 +1,6 @@
+from constants import ENEMY_SCALE_INCREMENT, ENEMY_SCALE_WAVE_INTERVAL
+
+
 def compute_freeze_resist(wave: int) -> float:
     if wave <= 5:
         return 0.0
@@ -14,6 +17,27 @@ def compute_swarm_reward(base_reward: int, swarm_spawn_index: int) -> int:
     return max(1, int(base_reward * multiplier))
 
 
+def compute_enemy_scale_increment(wave: int) -> float:
+    if ENEMY_SCALE_WAVE_INTERVAL <= 0 or wave % ENEMY_SCALE_WAVE_INTERVAL != 0:
+        return 0.0
+    if wave <= 10:
+        return max(0.04, ENEMY_SCALE_INCREMENT - 0.02)
+    if wave <= 15:
+        return ENEMY_SCALE_INCREMENT
+    return ENEMY_SCALE_INCREMENT + 0.02
+
+
+def project_enemy_scales(target_wave: int, start_scale: float = 1.0) -> list[float]:
+    scales = [start_scale]
+    scale = start_scale
+    for wave in range(1, max(1, int(target_wave)) + 1):
+        increment = compute_enemy_scale_increment(wave)
+        if increment > 0:
+            scale *= 1.0 + increment
+            scales.append(scale)
+    return scales
+
+
 def apply_spawn_scaling(enemy, wave_number: int, swarm_spawn_index: int | None = None):
     freeze_resist = compute_freeze_resist(wave_number)
     if getattr(enemy, 'is_boss', False):
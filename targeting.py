@@ -0,0 +1,77 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def targeting_available():
+    return np is not None
+
+
+def targets_wanted(tower, dt):
+    if tower.type == 'ice':
+        return None if tower.slow_aoe else 1
+    if max(0.0, tower.cooldown - dt) > 0:
+        return 0
+    if tower.type == 'magic' and tower.pull_enabled:
+        return None
+    if tower.type == 'magic' and tower.aoe_enabled:
+        return 1
+    return tower.projectile_count
+
+
+def _mode_scores(mode, enemies, hp):
+    if mode == 'strongest':
+        return np.fromiter((e.max_hp for e in enemies), dtype=float, count=len(enemies))
+    if mode == 'weakest':
+        return -hp
+    if mode == 'closest_goal':
+        return np.fromiter((-e.goal_distance() for e in enemies), dtype=float, count=len(enemies))
+    progress = np.fromiter(
+        (e.path_idx / max(1, len(e.path)) for e in enemies), dtype=float, count=len(enemies)
+    )
+    return -progress if mode == 'last' else progress
+
+
+def plan_targets(towers, enemies, dt):
+    plan = [None] * len(towers)
+    if not enemies:
+        return plan
+
+    ready = []
+    for idx, tower in enumerate(towers):
+        if getattr(tower, 'stun_timer', 0.0) > 0:
+            continue
+        wanted = targets_wanted(tower, dt)
+        if wanted != 0:
+            ready.append((idx, tower, wanted))
+    if not ready:
+        return plan
+
+    count = len(enemies)
+    ex = np.fromiter((e.pos.x for e in enemies), dtype=float, count=count)
+    ey = np.fromiter((e.pos.y for e in enemies), dtype=float, count=count)
+    hp = np.fromiter((e.hp for e in enemies), dtype=float, count=count)
+    alive = hp > 0
+
+    tx = np.array([tower.pos.x for _, tower, _ in ready])
+    ty = np.array([tower.pos.y for _, tower, _ in ready])
+    reach = np.array([tower.range for _, tower, _ in ready])
+    dx = ex[None, :] - tx[:, None]
+    dy = ey[None, :] - ty[:, None]
+    in_range = ((dx * dx + dy * dy) < (reach * reach)[:, None]) & alive[None, :]
+
+    scores = {}
+    for row, (idx, tower, wanted) in enumerate(ready):
+        candidates = np.flatnonzero(in_range[row])
+        if not candidates.size:
+            plan[idx] = []
+            continue
+        mode = tower.targeting_mode
+        if mode not in scores:
+            scores[mode] = _mode_scores(mode, enemies, hp)
+        order = np.argsort(-scores[mode][candidates], kind='stable')
+        if wanted is not None:
+            order = order[:wanted]
+        plan[idx] = [enemies[i] for i in candidates[order].tolist()]
+    return plan
@@ -34,6 +34,7 @@ class Tower:
         self.cooldown = 0
         self.size = 8
         self.stun_timer = 0.0
+        self.on_change = None
         self.lasers = {}
 
         self.path1_level = 0
@@ -56,6 +57,7 @@ class Tower:
         self.executioner_mark = False
         self.executioner_percent = False
         self.executioner_pierce = False
+        self._in_range = []
 
     def _targeting_key(self, enemy):
         if self.targeting_mode == 'strongest':
@@ -63,8 +65,7 @@ class Tower:
         if self.targeting_mode == 'weakest':
             return -enemy.hp
         if self.targeting_mode == 'closest_goal':
-            goal_distance = abs(enemy.grid_pos()[0] - enemy.goal[0]) + abs(enemy.grid_pos()[1] - enemy.goal[1])
-            return -goal_distance
+            return -enemy.goal_distance()
 
         path_length = max(1, len(getattr(enemy, 'path', [])))
         progress = getattr(enemy, 'path_idx', 0) / path_length
@@ -77,6 +78,21 @@ class Tower:
             return None
         return max(enemies, key=self._targeting_key)
 
+    def _enemies_in_range(self, enemies, spatial_index=None, targets=None):
+        if targets is not None:
+            return targets
+        if spatial_index:
+            return spatial_index.query_within(self.pos, self.range, out=self._in_range)
+        return [e for e in enemies if self.in_range(e) and e.hp > 0]
+
+    def _best_targets(self, enemies, spatial_index=None, count=1, targets=None):
+        if targets is not None:
+            return targets[:count]
+        if spatial_index:
+            return spatial_index.query_k_best(self.pos, self.range, self._targeting_key, count)
+        in_range = [e for e in enemies if self.in_range(e) and e.hp > 0]
+        return sorted(in_range, key=self._targeting_key, reverse=True)[:count]
+
     def get_upgrade_info(self, path):
         if path == 1:
             if self.type == 'physical':
@@ -188,10 +204,18 @@ class Tower:
                     self.executioner_pierce = True
         return True
 
+    def stun(self, duration):
+        self.stun_timer = max(self.stun_timer, duration)
+        self.notify_changed()
+
+    def notify_changed(self):
+        if self.on_change:
+            self.on_change(self)
+
     def in_range(self, enemy):
         return self.pos.distance_to(enemy.pos) < self.range
 
-    def update(self, enemies, dt=1.0 / 60.0, spatial_index=None, projectile_pool=None):
+    def update(self, enemies, dt=1.0 / 60.0, spatial_index=None, projectile_pool=None, targets=None):
         self.cooldown = max(0.0, self.cooldown - dt)
         if self.type != 'ice' and self.cooldown > 0:
             return None
@@ -203,23 +227,22 @@ class Tower:
             return None
         
         if self.type == 'ice':
-            if spatial_index:
-                in_range_enemies = [e for e in spatial_index.query_radius(self.pos, self.range) if self.in_range(e) and e.hp > 0]
+            if self.slow_aoe:
+                in_range_enemies = self._enemies_in_range(enemies, spatial_index, targets)
+                for enemy in in_range_enemies:
+                    enemy.add_slow(0.5)
+                if targets is None:
+                    target_enemies = sorted(in_range_enemies, key=self._targeting_key, reverse=True)
+                else:
+                    target_enemies = in_range_enemies
             else:
-                in_range_enemies = [e for e in enemies if self.in_range(e) and e.hp > 0]
-            if not in_range_enemies:
+                target_enemies = self._best_targets(enemies, spatial_index, targets=targets)
+            if not target_enemies:
                 for laser in self.lasers.values():
                     laser.active = False
                 self.lasers.clear()
                 return None
 
-            if self.slow_aoe:
-                for enemy in in_range_enemies:
-                    enemy.add_slow(0.5)
-
-            max_targets = len(in_range_enemies) if self.slow_aoe else 1
-            target_enemies = sorted(in_range_enemies, key=self._targeting_key, reverse=True)[:max_targets]
-
             if self.absolute_zero:
                 for enemy in target_enemies:
                     enemy.add_slow(10)
@@ -242,23 +265,16 @@ class Tower:
             return new_lasers if new_lasers else None
 
         if self.type == 'magic' and self.pull_enabled:
-            if spatial_index:
-                in_range_enemies = [e for e in spatial_index.query_radius(self.pos, self.range) if self.in_range(e) and e.hp > 0]
-            else:
-                in_range_enemies = [e for e in enemies if self.in_range(e) and e.hp > 0]
-            for enemy in in_range_enemies:
+            for enemy in self._enemies_in_range(enemies, spatial_index, targets):
                 direction = self.pos - enemy.pos
                 if direction.length() > 20:
                     direction.normalize_ip()
                     enemy.pos += direction * 0.5
 
         if self.type == 'magic' and self.aoe_enabled:
-            if spatial_index:
-                in_range = [e for e in spatial_index.query_radius(self.pos, self.range) if self.in_range(e) and e.hp > 0]
-            else:
-                in_range = [e for e in enemies if self.in_range(e) and e.hp > 0]
-            target_enemy = self._select_target(in_range)
-            if target_enemy:
+            chosen = self._best_targets(enemies, spatial_index, targets=targets)
+            if chosen:
+                target_enemy = chosen[0]
                 if projectile_pool:
                     projectile = projectile_pool.acquire(self.pos, target_enemy, self.dmg, self.dmg_type, self.type, self)
                 else:
@@ -270,19 +286,14 @@ class Tower:
                 return projectile
             return None
 
-        if spatial_index:
-            in_range = [e for e in spatial_index.query_radius(self.pos, self.range) if self.in_range(e) and e.hp > 0]
-        else:
-            in_range = [e for e in enemies if self.in_range(e) and e.hp > 0]
-
-        nearest_enemy = self._select_target(in_range)
-        if not nearest_enemy:
+        chosen = self._best_targets(enemies, spatial_index, self.projectile_count, targets)
+        if not chosen:
             return None
+        nearest_enemy = chosen[0]
 
         if self.projectile_count > 1:
             projectiles = []
-            targets = sorted(in_range, key=self._targeting_key, reverse=True)[:self.projectile_count]
-            for target in targets:
+            for target in chosen:
                 if projectile_pool:
                     projectile = projectile_pool.acquire(self.pos, target, self.dmg, self.dmg_type, self.type, self)
                 else:
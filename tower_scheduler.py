@@ -0,0 +1,172 @@
+import heapq
+
+
+class _Entry:
+    __slots__ = ('seq', 'cells', 'synced', 'ready_tick')
+
+    def __init__(self, seq, cells, synced):
+        self.seq = seq
+        self.cells = cells
+        self.synced = synced
+        self.ready_tick = None
+
+
+def _ticks_until_ready(cooldown, dt):
+    ticks = 0
+    while cooldown > 0:
+        cooldown = max(0.0, cooldown - dt)
+        ticks += 1
+    return ticks
+
+
+class TowerScheduler:
+    def __init__(self, spatial_index):
+        self.spatial_index = spatial_index
+        self.tick = 0
+        self.dt = 0.0
+        self.entries = {}
+        self.cover = {}
+        self.occupied = set()
+        self.nearby_cells = {}
+        self.nearby = set()
+        self.ready = set()
+        self.stunned = set()
+        self.lasing = set()
+        self.heap = []
+        self.order = {}
+        self._towers = []
+        self._due = []
+
+    def _cells(self, tower):
+        return self.spatial_index.cells_within(tower.pos, tower.range)
+
+    def _add_cover(self, tower, cells):
+        occupied = 0
+        for key in cells:
+            self.cover.setdefault(key, set()).add(tower)
+            if key in self.occupied:
+                occupied += 1
+        self.nearby_cells[tower] = occupied
+        if occupied:
+            self.nearby.add(tower)
+
+    def _drop_cover(self, tower, cells):
+        for key in cells:
+            towers = self.cover.get(key)
+            if towers is not None:
+                towers.discard(tower)
+                if not towers:
+                    del self.cover[key]
+        self.nearby_cells.pop(tower, None)
+        self.nearby.discard(tower)
+
+    def _track_occupancy(self):
+        occupied = set(self.spatial_index.buckets)
+        cover = self.cover
+        counts = self.nearby_cells
+        for key in occupied - self.occupied:
+            for tower in cover.get(key, ()):
+                counts[tower] += 1
+                if counts[tower] == 1:
+                    self.nearby.add(tower)
+        for key in self.occupied - occupied:
+            for tower in cover.get(key, ()):
+                counts[tower] -= 1
+                if not counts[tower]:
+                    self.nearby.discard(tower)
+        self.occupied = occupied
+
+    def _refresh(self, towers):
+        current = set(towers)
+        for tower in list(self.entries):
+            if tower not in current:
+                self._drop_cover(tower, self.entries.pop(tower).cells)
+                self.ready.discard(tower)
+                self.stunned.discard(tower)
+                self.lasing.discard(tower)
+        for seq, tower in enumerate(towers):
+            entry = self.entries.get(tower)
+            if entry is None:
+                entry = _Entry(seq, self._cells(tower), self.tick - 1)
+                self.entries[tower] = entry
+                self._add_cover(tower, entry.cells)
+                self._settle(tower, entry, self.tick - 1)
+            entry.seq = seq
+        self.order = {tower: seq for seq, tower in enumerate(towers)}
+        self._towers = list(towers)
+
+    def _catch_up(self, tower, entry, through_tick):
+        skipped = through_tick - entry.synced
+        cooldown = tower.cooldown
+        while cooldown > 0 and skipped > 0:
+            cooldown = max(0.0, cooldown - self.dt)
+            skipped -= 1
+        tower.cooldown = cooldown
+        entry.synced = through_tick
+
+    def _settle(self, tower, entry, tick):
+        entry.synced = tick
+        entry.ready_tick = None
+        if tower.stun_timer > 0:
+            self.stunned.add(tower)
+            self.ready.discard(tower)
+            return
+        self.stunned.discard(tower)
+        if tower.lasers:
+            self.lasing.add(tower)
+        else:
+            self.lasing.discard(tower)
+        if tower.cooldown > 0:
+            self.ready.discard(tower)
+            entry.ready_tick = tick + _ticks_until_ready(tower.cooldown, self.dt)
+            heapq.heappush(self.heap, (entry.ready_tick, entry.seq, id(tower), tower))
+        else:
+            self.ready.add(tower)
+
+    def wake(self, tower):
+        entry = self.entries.get(tower)
+        if entry is None:
+            return
+        self._drop_cover(tower, entry.cells)
+        entry.cells = self._cells(tower)
+        self._add_cover(tower, entry.cells)
+        if tower.stun_timer > 0 and tower not in self.stunned:
+            self._catch_up(tower, entry, self.tick)
+            entry.ready_tick = None
+            self.ready.discard(tower)
+            self.stunned.add(tower)
+
+    def due(self, towers, dt):
+        self.tick += 1
+        self.dt = dt
+        tick = self.tick
+        if towers != self._towers:
+            self._refresh(towers)
+
+        heap = self.heap
+        while heap and heap[0][0] <= tick:
+            ready_tick, _, _, tower = heapq.heappop(heap)
+            entry = self.entries.get(tower)
+            if entry is not None and entry.ready_tick == ready_tick:
+                entry.ready_tick = None
+                self.ready.add(tower)
+
+        self._track_occupancy()
+        awake = (self.nearby & self.ready).union(self.stunned, self.lasing)
+
+        entries = self.entries
+        due = sorted(awake, key=self.order.__getitem__)
+        for tower in due:
+            if tower.cooldown > 0 and tower not in self.stunned:
+                self._catch_up(tower, entries[tower], tick - 1)
+        self._due = due
+        return due
+
+    def settle(self):
+        entries = self.entries
+        for tower in self._due:
+            if tower.cooldown > 0 or tower.stun_timer > 0 or tower.lasers or tower in self.stunned or tower in self.lasing:
+                entry = entries.get(tower)
+                if entry is not None:
+                    self._settle(tower, entry, self.tick)
+        self._due = []
@@ -1,6 +1,17 @@
 import pygame
 from constants import TILE, FPS, TRAP_STATS
 from colors import BLACK
+from spatial import QUERY_MARGIN
+
+BURN_SPREAD_RADIUS = 40
+EXPLOSION_RADIUS = 60
+
+
+def _enemy_tile(enemy, tile_index):
+    if tile_index is None:
+        return enemy.grid_pos()
+    return enemy.tile
+
 
 class Trap:
     def __init__(self, grid_pos, trap_type):
@@ -99,13 +110,24 @@ class Trap:
                 remaining -= absorbed
             enemy.hp -= remaining
 
-    def _update_fire(self, enemies, dt):
+    def _nearby(self, enemies, spatial_index, radius, center=None):
+        if spatial_index is None:
+            return enemies
+        return spatial_index.query_radius(self.pos if center is None else center, radius + QUERY_MARGIN)
+
+    def _tile_reach(self, tiles):
+        return tiles * TILE + TILE // 2
+
+    def _update_fire(self, enemies, dt, spatial_index=None, tile_index=None):
         trap_x, trap_y = self.grid_pos
         per_tick = self.dps * dt
+        reach = max(2, self.aura_radius)
 
-        for enemy in enemies:
-            ex, ey = enemy.grid_pos()
+        for enemy in self._nearby(enemies, spatial_index, self._tile_reach(reach)):
+            ex, ey = _enemy_tile(enemy, tile_index)
             distance = max(abs(ex - trap_x), abs(ey - trap_y))
+            if distance > reach:
+                continue
 
             if distance == 0:
                 self._apply_damage(enemy, per_tick, 'magic', 'trap')
@@ -121,13 +143,13 @@ class Trap:
                 self._apply_damage(enemy, per_tick * 0.15, 'magic', 'trap')
 
             if self.burn_spread and getattr(enemy, 'burning', False):
-                for other in enemies:
-                    if other != enemy and enemy.pos.distance_to(other.pos) < 40:
+                for other in self._nearby(enemies, spatial_index, BURN_SPREAD_RADIUS, enemy.pos):
+                    if other != enemy and enemy.pos.distance_to(other.pos) < BURN_SPREAD_RADIUS:
                         self._apply_damage(other, per_tick * 0.2, 'magic', 'trap')
                         if hasattr(other, 'apply_burn'):
                             other.apply_burn(1.5, 0.5)
 
-    def _update_spikes_trigger(self, enemies, affected):
+    def _update_spikes_trigger(self, enemies, affected, spatial_index=None, tile_index=None):
         for enemy in affected:
             initial_hp = enemy.hp
             self._apply_damage(enemy, self.damage, 'physical', 'trap')
@@ -143,40 +165,43 @@ class Trap:
                     enemy.impaled_time = 2.0
 
             if enemy.hp <= 0 and initial_hp > 0 and self.explode_on_kill:
-                for other in enemies:
-                    if other != enemy and enemy.pos.distance_to(other.pos) < 60:
+                for other in self._nearby(enemies, spatial_index, EXPLOSION_RADIUS, enemy.pos):
+                    if other != enemy and enemy.pos.distance_to(other.pos) < EXPLOSION_RADIUS:
                         self._apply_damage(other, 40, 'magic', 'trap')
 
         if self.quake_enabled:
             trap_x, trap_y = self.grid_pos
-            for enemy in enemies:
-                ex, ey = enemy.grid_pos()
+            for enemy in self._nearby(enemies, spatial_index, self._tile_reach(2)):
+                ex, ey = _enemy_tile(enemy, tile_index)
                 distance = max(abs(ex - trap_x), abs(ey - trap_y))
                 if distance <= 2 and enemy not in affected:
                     self._apply_damage(enemy, self.damage * 0.5, 'physical', 'trap')
 
         if self.cluster_enabled:
             trap_x, trap_y = self.grid_pos
-            for enemy in enemies:
-                ex, ey = enemy.grid_pos()
+            for enemy in self._nearby(enemies, spatial_index, self._tile_reach(1)):
+                ex, ey = _enemy_tile(enemy, tile_index)
                 distance = max(abs(ex - trap_x), abs(ey - trap_y))
                 if distance == 1:
                     self._apply_damage(enemy, self.damage * 0.3, 'physical', 'trap')
 
-    def update(self, enemies, dt=1.0 / FPS):
+    def update(self, enemies, dt=1.0 / FPS, spatial_index=None, tile_index=None):
         self.timer += dt
 
         if self.trap_type == 'fire':
-            self._update_fire(enemies, dt)
+            self._update_fire(enemies, dt, spatial_index, tile_index)
         
         elif self.trap_type == 'spikes':
-            affected = [enemy for enemy in enemies if enemy.grid_pos() == self.grid_pos]
+            if tile_index is not None:
+                affected = list(tile_index.at(tuple(self.grid_pos)))
+            else:
+                affected = [enemy for enemy in enemies if enemy.grid_pos() == self.grid_pos]
 
             if not affected:
                 return
 
             if self.timer >= self.interval:
-                self._update_spikes_trigger(enemies, affected)
+                self._update_spikes_trigger(enemies, affected, spatial_index, tile_index)
                 self.timer = 0.0
 
     def draw(self, screen):
@@ -1,9 +1,53 @@
+import time
+
 import pygame
 
+from game_settings import DEFAULT_SCALE_MODE, SCALE_MODES
+
+LETTERBOX_COLOR = (0, 0, 0)
+
+_present = {
+    'scale_mode': DEFAULT_SCALE_MODE,
+    'window': None,
+    'window_size': None,
+    'viewport': None,
+    'target': None,
+    'scaled': None,
+    'frames': 0,
+    'full_repaints': 0,
+    'partial_updates': 0,
+    'last_ms': 0.0,
+    'total_ms': 0.0,
+    'max_ms': 0.0,
+}
+
+
+def set_scale_mode(mode):
+    if mode not in SCALE_MODES:
+        mode = DEFAULT_SCALE_MODE
+    if mode != _present['scale_mode']:
+        _present['scale_mode'] = mode
+        invalidate_present()
+    return mode
+
+
+def get_scale_mode():
+    return _present['scale_mode']
 
-def get_viewport_rect(surface, base_width, base_height):
+
+def invalidate_present():
+    _present['window'] = None
+    _present['window_size'] = None
+    _present['viewport'] = None
+    _present['target'] = None
+    _present['scaled'] = None
+
+
+def get_viewport_rect(surface, base_width, base_height, scale_mode=None):
     window_w, window_h = surface.get_size()
     scale = min(window_w / base_width, window_h / base_height)
+    if (scale_mode or _present['scale_mode']) == 'integer' and scale >= 1:
+        scale = int(scale)
     viewport_w = max(1, int(base_width * scale))
     viewport_h = max(1, int(base_height * scale))
     viewport_x = (window_w - viewport_w) // 2
@@ -11,18 +55,115 @@ def get_viewport_rect(surface, base_width, base_height):
     return pygame.Rect(viewport_x, viewport_y, viewport_w, viewport_h)
 
 
-def present_frame(window, screen, base_width, base_height):
+def _prepare_window(window, screen, base_width, base_height):
     viewport = get_viewport_rect(window, base_width, base_height)
-    window.fill((0, 0, 0))
-    if viewport.size == (base_width, base_height):
-        window.blit(screen, viewport.topleft)
+    window.fill(LETTERBOX_COLOR)
+    target = None
+    if viewport.size != (base_width, base_height):
+        try:
+            target = window.subsurface(viewport)
+            if _present['scale_mode'] == 'smooth' and target.get_bitsize() != screen.get_bitsize():
+                target = None
+        except (ValueError, pygame.error):
+            target = None
+    _present['window'] = window
+    _present['window_size'] = window.get_size()
+    _present['viewport'] = viewport
+    _present['target'] = target
+    _present['scaled'] = None
+    return viewport
+
+
+def _scale_full(window, screen, viewport):
+    mode = _present['scale_mode']
+    target = _present['target']
+    scale = pygame.transform.smoothscale if mode == 'smooth' else pygame.transform.scale
+    if target is not None:
+        scale(screen, viewport.size, target)
+        return
+    scaled = _present['scaled']
+    if scaled is None or scaled.get_size() != viewport.size:
+        scaled = scale(screen, viewport.size)
+        _present['scaled'] = scaled
     else:
-        scaled = pygame.transform.smoothscale(screen, viewport.size)
-        window.blit(scaled, viewport.topleft)
-    pygame.display.flip()
+        scale(screen, viewport.size, scaled)
+    window.blit(scaled, viewport.topleft)
+
+
+def _to_window_rect(rect, viewport, base_width, base_height):
+    left = viewport.x + rect.left * viewport.width // base_width
+    top = viewport.y + rect.top * viewport.height // base_height
+    right = viewport.x + -(-rect.right * viewport.width // base_width)
+    bottom = viewport.y + -(-rect.bottom * viewport.height // base_height)
+    return pygame.Rect(left, top, right - left, bottom - top)
+
+
+def _present_dirty(window, screen, viewport, base_width, base_height, dirty_rects):
+    bounds = screen.get_rect()
+    rects = [bounds.clip(pygame.Rect(rect)) for rect in dirty_rects]
+    rects = [rect for rect in rects if rect.width and rect.height]
+    if not rects:
+        return []
+    factor = viewport.width // base_width
+    exact = viewport.width == base_width * factor and viewport.height == base_height * factor
+    if not exact or (factor > 1 and _present['scale_mode'] == 'smooth'):
+        _scale_full(window, screen, viewport)
+        return [_to_window_rect(rect, viewport, base_width, base_height) for rect in rects]
+
+    updates = []
+    for rect in rects:
+        dest = pygame.Rect(viewport.x + rect.x * factor, viewport.y + rect.y * factor, rect.width * factor, rect.height * factor)
+        if factor == 1:
+            window.blit(screen, dest.topleft, rect)
+        else:
+            window.blit(pygame.transform.scale(screen.subsurface(rect), dest.size), dest.topleft)
+        updates.append(dest)
+    return updates
+
+
+def present_frame(window, screen, base_width, base_height, dirty_rects=None):
+    started = time.perf_counter()
+    repaint = window is not _present['window'] or window.get_size() != _present['window_size']
+    if repaint:
+        viewport = _prepare_window(window, screen, base_width, base_height)
+        _present['full_repaints'] += 1
+    else:
+        viewport = _present['viewport']
+
+    if dirty_rects is not None and not repaint:
+        updates = _present_dirty(window, screen, viewport, base_width, base_height, dirty_rects)
+        if updates:
+            pygame.display.update(updates)
+        _present['partial_updates'] += 1
+    else:
+        if viewport.size == (base_width, base_height):
+            window.blit(screen, viewport.topleft)
+        else:
+            _scale_full(window, screen, viewport)
+        pygame.display.flip()
+
+    elapsed_ms = (time.perf_counter() - started) * 1000.0
+    _present['frames'] += 1
+    _present['last_ms'] = elapsed_ms
+    _present['total_ms'] += elapsed_ms
+    if elapsed_ms > _present['max_ms']:
+        _present['max_ms'] = elapsed_ms
     return viewport
 
 
+def present_stats():
+    frames = _present['frames']
+    return {
+        'scale_mode': _present['scale_mode'],
+        'frames': frames,
+        'full_repaints': _present['full_repaints'],
+        'partial_updates': _present['partial_updates'],
+        'last_ms': _present['last_ms'],
+        'avg_ms': _present['total_ms'] / frames if frames else 0.0,
+        'max_ms': _present['max_ms'],
+    }
+
+
 def window_to_game_pos(pos, viewport, base_width, base_height):
     x, y = pos
     if not viewport.collidepoint(x, y):
@@ -33,11 +33,13 @@ def get_wave_template(wave: int):
     }
 
 
-def choose_enemy_type(wave: int, enemies_alive, wave_enemies_left=None):
+def choose_enemy_type(wave: int, enemies_alive, wave_enemies_left=None, rng=None):
+    if rng is None:
+        rng = random
     template = get_wave_template(wave)
     can_spawn_swarm = wave_enemies_left is None or wave_enemies_left >= 10
 
-    if can_spawn_swarm and random.random() < template['swarm_chance']:
+    if can_spawn_swarm and rng.random() < template['swarm_chance']:
         return 'swarm'
 
     pool = [enemy_type for enemy_type in template['pool'] if enemy_type not in _BOSS_TYPES]
@@ -46,10 +48,10 @@ def choose_enemy_type(wave: int, enemies_alive, wave_enemies_left=None):
     if not pool:
         return _FALLBACK_TYPE
 
-    choice = random.choice(pool)
+    choice = rng.choice(pool)
     if choice == 'healer' and not enemies_alive:
         non_healer = [enemy_type for enemy_type in pool if enemy_type != 'healer']
-        return random.choice(non_healer) if non_healer else _FALLBACK_TYPE
+        return rng.choice(non_healer) if non_healer else _FALLBACK_TYPE
 
     return choice
 